@@ -5,16 +5,13 @@ This package contains the implementation of a text-based RPG game where the play
 navigates through different locations, collects items, and completes objectives.
 
 To start the game, run the main.py script in the rpg_game directory.
+
+The classes below are imported the first time they are used, so short-lived
+processes (such as replay workers) only pay for the modules they need.
 """
 
-# Import key components to make them available at the package level
-from .game.game_controller import GameController
-from .game.player import Player
-from .game.location import Location
-from .game.station_item import StationItem
-from .game.diagnostic_tool import DiagnosticTool
-from .game.energy_crystal import EnergyCrystal
-from .game.droid import DamagedMaintenanceDroid
+from importlib import import_module
+from typing import TYPE_CHECKING
 
 # Define __all__ for explicit exports
 __all__ = [
@@ -24,5 +21,31 @@ __all__ = [
     'StationItem',
     'DiagnosticTool',
     'EnergyCrystal',
-    'DamagedMaintenanceDroid'
+    'DamagedMaintenanceDroid',
+    'CommandResult'
 ]
+
+if TYPE_CHECKING:
+    # Let editors and type checkers see the classes without importing them
+    from .game.game_controller import GameController
+    from .game.player import Player
+    from .game.location import Location
+    from .game.station_item import StationItem
+    from .game.diagnostic_tool import DiagnosticTool
+    from .game.energy_crystal import EnergyCrystal
+    from .game.droid import DamagedMaintenanceDroid
+    from .game.command_result import CommandResult
+
+
+def __getattr__(name: str):
+    """Import a class from the game package the first time it is asked for."""
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module('.game', __name__), name)
+    # Keep it, so later lookups do not come back here
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the game engine.
+
+Run from the project root and results are printed as JSON:
+
+    python -m rpg_game.bench
+    python -m rpg_game.bench --quick --output results.json
+
+Timings are given in microseconds as percentiles (p50, p90, p99) along with
+the min, max and mean, so results from two builds can be compared line by
+line. The suite covers:
+
+    commands      process_input latency for every verb
+    engine        Player.move and Location.describe on their own
+    golden_path   whole winning games, as latency and games per second
+    construction  creating a new GameController
+    memory        bytes per game object and per live session
+    large_world   generating, starting and crossing a generated world
+    npcs          NpcScheduler ticks with many patrolling droids
+    imports       importing the package and its modules in a new process
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterable, List, Sequence
+
+from .game.autonomous_droid import AutonomousDroid
+from .game.diagnostic_tool import DiagnosticTool
+from .game.droid import DamagedMaintenanceDroid
+from .game.energy_crystal import EnergyCrystal
+from .game.game_controller import GameController
+from .game.location import Location
+from .game.npc_scheduler import NpcScheduler
+from .game.output_sink import NullSink
+from .game.player import Player
+from .game.station_item import StationItem
+from .game.world_generator import generate_world, spine_commands
+from .game.world_state import WorldState
+
+# The commands that win the game, in order
+GOLDEN_PATH = ["get tool", "use tool", "go east", "get crystal", "win"]
+
+# Modules timed by the import benchmark, from cheapest to most expensive
+IMPORT_TARGETS = (
+    "rpg_game",
+    "rpg_game.game.player",
+    "rpg_game.game.game_controller",
+    "rpg_game.replay",
+)
+
+# For each verb: the commands that set the game up, then the command timed
+VERB_CASES = {
+    "help": ([], "help"),
+    "look": ([], "look"),
+    "inventory": (["get tool"], "inventory"),
+    "status": ([], "status"),
+    "go": (["get tool", "use tool"], "go east"),
+    "get": ([], "get tool"),
+    "use": (["get tool"], "use tool"),
+    "win": (GOLDEN_PATH[:-1], "win"),
+}
+
+
+def percentiles(samples: Sequence[float]) -> Dict[str, float]:
+    """
+    Summarise timing samples.
+
+    Args:
+        samples: Timings in nanoseconds
+
+    Returns:
+        dict: min, p50, p90, p99, max and mean, in microseconds
+    """
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+
+    def micros(nanoseconds):
+        return round(nanoseconds / 1000, 3)
+
+    return {
+        "min": micros(ordered[0]),
+        "p50": micros(ordered[round(0.50 * last)]),
+        "p90": micros(ordered[round(0.90 * last)]),
+        "p99": micros(ordered[round(0.99 * last)]),
+        "max": micros(ordered[-1]),
+        "mean": micros(sum(ordered) / len(ordered)),
+    }
+
+
+def _time_each(calls: Iterable[Callable]) -> List[int]:
+    """Time each call on its own, in nanoseconds."""
+    clock = time.perf_counter_ns
+    samples = []
+    for call in calls:
+        start = clock()
+        call()
+        samples.append(clock() - start)
+    return samples
+
+
+def _time_batches(call: Callable, batches: int, batch_size: int) -> List[float]:
+    """
+    Time a call that is too quick to time on its own.
+
+    The call is repeated batch_size times per sample and each sample is the
+    average, so the clock's own overhead is spread across the batch.
+    """
+    clock = time.perf_counter_ns
+    samples = []
+    for _ in range(batches):
+        start = clock()
+        for _ in range(batch_size):
+            call()
+        samples.append((clock() - start) / batch_size)
+    return samples
+
+
+def command_latency(repeat: int = 1000) -> Dict[str, dict]:
+    """
+    Measure how long process_input takes for each verb.
+
+    Every sample runs the command in a fresh game that has been set up
+    beforehand, so only the command itself is timed.
+
+    Args:
+        repeat: Samples per verb
+
+    Returns:
+        dict: Verb -> percentiles
+    """
+    results = {}
+    for verb, (setup, command) in VERB_CASES.items():
+        games = []
+        for _ in range(repeat):
+            game = GameController(headless=True)
+            game.run_commands(setup)
+            games.append(game)
+        samples = _time_each(
+            lambda game=game: game.process_input(command) for game in games
+        )
+        results[verb] = percentiles(samples)
+    return results
+
+
+def engine_latency(batches: int = 200, batch_size: int = 100) -> Dict[str, dict]:
+    """
+    Measure Player.move and Location.describe without the controller.
+
+    Args:
+        batches: Samples per operation
+        batch_size: Calls averaged in each sample
+
+    Returns:
+        dict: Operation -> percentiles
+    """
+    west = Location("West Room", "The west room.")
+    east = Location("East Room", "The east room.")
+    west.add_exit("east", east)
+    east.add_exit("west", west)
+    west.set_droid_present(True, DamagedMaintenanceDroid())
+    player = Player(east)
+    player.output = NullSink()
+
+    def move_back_and_forth():
+        player.move("west")
+        player.move("east")
+
+    def move_blocked():
+        player.current_location = west
+        player.move("east")
+
+    return {
+        "move": percentiles([
+            sample / 2 for sample in
+            _time_batches(move_back_and_forth, batches, batch_size)
+        ]),
+        "move_blocked": percentiles(
+            _time_batches(move_blocked, batches, batch_size)
+        ),
+        "describe": percentiles(
+            _time_batches(west.describe, batches, batch_size)
+        ),
+    }
+
+
+def golden_path(sessions: int = 1000) -> dict:
+    """
+    Play the winning command list in many fresh games.
+
+    Args:
+        sessions: How many games to play
+
+    Returns:
+        dict: Per-game latency percentiles and games per second
+    """
+    games = [GameController(headless=True) for _ in range(sessions)]
+    samples = _time_each(
+        lambda game=game: game.run_commands(GOLDEN_PATH) for game in games
+    )
+    return {
+        "latency": percentiles(samples),
+        "games_per_second": round(sessions / (sum(samples) / 1e9), 1),
+    }
+
+
+def construction_time(repeat: int = 1000) -> dict:
+    """
+    Measure how long a new headless GameController takes to create.
+
+    Args:
+        repeat: How many controllers to create
+
+    Returns:
+        dict: Percentiles
+    """
+    GameController(headless=True)  # load and cache the world first
+    return percentiles(
+        _time_each(lambda: GameController(headless=True) for _ in range(repeat))
+    )
+
+
+def large_world(rooms: int = 50000, sessions: int = 100,
+                exit_degree: int = 4, droids: int = 10) -> dict:
+    """
+    Measure the engine on a generated world with many rooms.
+
+    Args:
+        rooms: How many rooms the world has
+        sessions: How many sessions to start for the construction timing
+        exit_degree: Exits per room in the generated world
+        droids: Droids guarding the way to the goal
+
+    Returns:
+        dict: Generation time in ms, construction percentiles, per-command
+        percentiles for walking the whole world and bytes per session
+    """
+    droids = min(droids, rooms - 1)
+    start = time.perf_counter_ns()
+    world = generate_world(rooms, exit_degree=exit_degree, droids=droids)
+    generate_ms = round((time.perf_counter_ns() - start) / 1e6, 3)
+
+    construction = percentiles(_time_each(
+        lambda: GameController(headless=True, world=world)
+        for _ in range(sessions)
+    ))
+
+    game = GameController(headless=True, world=world)
+    results = []
+    walk = _time_each(
+        lambda command=command: results.append(game.process_input(command))
+        for command in spine_commands(world)
+    )
+    if not results[-1].won:
+        raise RuntimeError("Walking the generated world did not win")
+
+    return {
+        "rooms": rooms,
+        "exit_degree": exit_degree,
+        "droids": droids,
+        "generate_ms": generate_ms,
+        "construction": construction,
+        "commands": percentiles(walk),
+        "session_bytes": _traced_bytes(
+            lambda: GameController(headless=True, world=world), sessions
+        ),
+    }
+
+
+def npc_ticks(npcs: int = 100000, sessions: int = 1000, ticks: int = 100,
+              patrol_every: int = 10) -> dict:
+    """
+    Measure an NpcScheduler driving many patrolling droids.
+
+    Each session gets npcs // sessions droids, each patrolling between two
+    rooms of its own. Their intervals are spread from 1 to patrol_every
+    ticks, so a different set of droids is due on each tick.
+
+    Args:
+        npcs: Droids in total
+        sessions: Sessions the droids are spread over
+        ticks: Ticks to time
+        patrol_every: Ticks between each droid's moves
+
+    Returns:
+        dict: Set-up time in ms, per-tick percentiles and turns per tick
+    """
+    per_session = max(npcs // sessions, 1)
+    world = generate_world(per_session * 2 + 1, droids=0)
+    scheduler = NpcScheduler()
+    start = time.perf_counter_ns()
+    for session in range(sessions):
+        state = WorldState(world)
+        for droid in range(per_session):
+            AutonomousDroid(state, scheduler, (droid * 2 + 1, droid * 2 + 2),
+                            patrol_every=1 + (session + droid) % patrol_every)
+    setup_ms = round((time.perf_counter_ns() - start) / 1e6, 3)
+
+    turns = []
+    samples = _time_each(
+        lambda: turns.append(scheduler.advance()) for _ in range(ticks)
+    )
+    return {
+        "npcs": per_session * sessions,
+        "sessions": sessions,
+        "setup_ms": setup_ms,
+        "tick": percentiles(samples),
+        "turns_per_tick": sum(turns) / len(turns),
+    }
+
+
+def _traced_bytes(factory: Callable, count: int) -> float:
+    """
+    Measure the average memory held by objects made by a factory.
+
+    Args:
+        factory: A function that creates one object
+        count: How many objects to create and keep alive
+
+    Returns:
+        float: Bytes per object
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = [factory() for _ in range(count)]
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    # The list holding the objects is not part of their cost
+    used -= sys.getsizeof(kept)
+    return used / count
+
+
+def object_sizes(count: int = 10000) -> dict:
+    """
+    Measure the memory held by one instance of each game class.
+
+    Args:
+        count: How many instances of each class to average over
+
+    Returns:
+        dict: Class name -> bytes per instance
+    """
+    location = Location("Room", "A room.")
+    factories = [
+        lambda: Location("Room", "A room."),
+        lambda: Player(location),
+        lambda: StationItem("Item", "An item."),
+        DiagnosticTool,
+        EnergyCrystal,
+        DamagedMaintenanceDroid,
+    ]
+    return {
+        type(factory()).__name__: _traced_bytes(factory, count)
+        for factory in factories
+    }
+
+
+def session_memory(sessions: int = 10000,
+                   commands: Iterable[str] = ()) -> float:
+    """
+    Measure the average memory held by one live game session.
+
+    Args:
+        sessions: How many sessions to create and keep alive
+        commands: Commands to run in each session before measuring
+
+    Returns:
+        float: Bytes per session
+    """
+    commands = list(commands)
+    GameController(headless=True)  # load and cache the world first
+
+    def new_session():
+        game = GameController(headless=True)
+        game.run_commands(commands)
+        return game
+
+    return _traced_bytes(new_session, sessions)
+
+
+def import_time(modules: Iterable[str] = IMPORT_TARGETS,
+                repeat: int = 20) -> Dict[str, dict]:
+    """
+    Measure how long importing each module takes in a fresh interpreter.
+
+    Each sample starts a new Python process, as a replay worker would, and
+    times only the import statement.
+
+    Args:
+        modules: The modules to import
+        repeat: Processes to start per module
+
+    Returns:
+        dict: Module -> percentiles
+    """
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = {}
+    for module in modules:
+        code = ("import time; start = time.perf_counter_ns(); "
+                f"import {module}; print(time.perf_counter_ns() - start)")
+        samples = [
+            int(subprocess.run([sys.executable, "-c", code], cwd=project_root,
+                               check=True, capture_output=True,
+                               text=True).stdout)
+            for _ in range(repeat)
+        ]
+        results[module] = percentiles(samples)
+    return results
+
+
+def main(argv=None) -> None:
+    """
+    Run the benchmarks and print the results as JSON.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the game engine.")
+    parser.add_argument("--sessions", type=int, default=10000,
+                        help="sessions to create for the memory benchmark")
+    parser.add_argument("--repeat", type=int, default=1000,
+                        help="samples per timing benchmark")
+    parser.add_argument("--rooms", type=int, default=50000,
+                        help="rooms in the generated large world")
+    parser.add_argument("--npcs", type=int, default=100000,
+                        help="droids in the NPC scheduler benchmark")
+    parser.add_argument("--quick", action="store_true",
+                        help="use small counts for a fast smoke run")
+    parser.add_argument("--output", metavar="FILE",
+                        help="write the JSON here instead of printing it")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.sessions, args.repeat, args.rooms, args.npcs = 200, 50, 1000, 2000
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "commands": command_latency(args.repeat),
+        "engine": engine_latency(batches=max(args.repeat // 5, 1)),
+        "golden_path": golden_path(args.repeat),
+        "construction": construction_time(args.repeat),
+        "memory": {
+            "object_bytes": object_sizes(),
+            "session_bytes": {
+                "new": session_memory(args.sessions),
+                "golden_path": session_memory(args.sessions, GOLDEN_PATH[:-1]),
+            },
+        },
+        "large_world": large_world(args.rooms),
+        "npcs": npc_ticks(args.npcs),
+        "imports": import_time(repeat=max(args.repeat // 50, 3)),
+    }
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,25 @@
 """
 Game package containing all game classes and logic.
+
+Classes are imported the first time they are used rather than when the
+package is imported, so importing one class (for example Player) does not
+also load GameController and everything behind it.
 """
 
-# Import all game classes to make them available when importing from the game package
-from .station_item import StationItem
-from .diagnostic_tool import DiagnosticTool
-from .energy_crystal import EnergyCrystal
-from .location import Location
-from .droid import DamagedMaintenanceDroid
-from .player import Player
-from .game_controller import GameController
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# Where each class lives, relative to this package
+_MODULES = {
+    'StationItem': '.station_item',
+    'DiagnosticTool': '.diagnostic_tool',
+    'EnergyCrystal': '.energy_crystal',
+    'Location': '.location',
+    'DamagedMaintenanceDroid': '.droid',
+    'Player': '.player',
+    'GameController': '.game_controller',
+    'CommandResult': '.command_result',
+}
 
 # Define __all__ for explicit exports
 __all__ = [
@@ -19,5 +29,32 @@ __all__ = [
     'Location',
     'DamagedMaintenanceDroid',
     'Player',
-    'GameController'
+    'GameController',
+    'CommandResult'
 ]
+
+if TYPE_CHECKING:
+    # Let editors and type checkers see the classes without importing them
+    from .station_item import StationItem
+    from .diagnostic_tool import DiagnosticTool
+    from .energy_crystal import EnergyCrystal
+    from .location import Location
+    from .droid import DamagedMaintenanceDroid
+    from .player import Player
+    from .game_controller import GameController
+    from .command_result import CommandResult
+
+
+def __getattr__(name: str):
+    """Import a class from its module the first time it is asked for."""
+    module_name = _MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    # Keep it, so later lookups do not come back here
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
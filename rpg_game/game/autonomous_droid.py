@@ -0,0 +1,119 @@
+"""
+Module containing the AutonomousDroid class, a droid that acts on its own.
+"""
+
+from typing import Optional, Sequence
+from .droid import DEFAULT_GUARDS, DamagedMaintenanceDroid
+from .npc_scheduler import NpcScheduler
+from .world_state import WorldState
+from .world_template import WorldTemplate
+
+
+class AutonomousDroid(DamagedMaintenanceDroid):
+    """
+    A droid that takes turns from an NpcScheduler.
+
+    It can patrol a route of rooms, moving one room along every few ticks
+    (waiting if the next room already has a droid), and it can break down
+    again some ticks after it has been repaired. A repaired droid stops
+    patrolling until it breaks again.
+
+    Autonomous droids live in one session's WorldState. They are not kept
+    in snapshots and are not put back by WorldState.reset(), so they need
+    adding again after either.
+    """
+    __slots__ = ('_world', '_scheduler', '_route', '_stop', '_patrol_every',
+                 '_patrols', '_rebreak_after', '_due')
+
+    def __init__(self, world: WorldState, scheduler: NpcScheduler,
+                 route: Sequence[int], guards: str = DEFAULT_GUARDS,
+                 patrol_every: Optional[int] = None,
+                 rebreak_after: Optional[int] = None):
+        """
+        Place the droid in the first room of its route, blocking.
+
+        Args:
+            world: The session the droid lives in
+            scheduler: Gives the droid its turns
+            route: Room numbers the droid patrols in order, looping back
+                to the first; one room means the droid stays put
+            guards: The lowercase direction of the exit the droid blocks
+            patrol_every: Ticks between moves along the route, or None to
+                stay put
+            rebreak_after: Ticks after a repair until the droid breaks
+                again, or None to stay repaired
+
+        Raises:
+            ValueError: If the route is empty or a number of ticks is below 1
+        """
+        super().__init__(guards)
+        if not route:
+            raise ValueError("A droid's route needs at least one room")
+        for ticks in (patrol_every, rebreak_after):
+            if ticks is not None and ticks < 1:
+                raise ValueError("Droid timings must be at least 1 tick")
+        self._world = world
+        self._scheduler = scheduler
+        self._route = tuple(route)
+        self._stop = 0
+        self._patrol_every = patrol_every
+        self._patrols = patrol_every is not None and len(self._route) > 1
+        self._rebreak_after = rebreak_after
+        self._due = None
+        world.place_droid(self._route[0], self)
+        if self._patrols:
+            self._due = scheduler.add(self, patrol_every)
+
+    @property
+    def room(self) -> int:
+        """The room number the droid is in."""
+        return self._route[self._stop]
+
+    @property
+    def due(self) -> Optional[int]:
+        """The tick of the droid's next turn, or None if it has none."""
+        return self._due
+
+    def repair(self) -> None:
+        """Repair the droid, and plan when it breaks again if it does."""
+        super().repair()
+        if self._rebreak_after is None:
+            self._due = None
+        else:
+            self._due = self._scheduler.add(self, self._rebreak_after)
+
+    def act(self, now: int) -> Optional[int]:
+        """
+        Take a turn: break down again if repaired, otherwise patrol.
+
+        Args:
+            now: The scheduler's current tick
+
+        Returns:
+            How many ticks until the droid's next turn, or None for none
+        """
+        if now != self._due:
+            # A turn planned before the droid was repaired; drop it
+            return None
+        world = self._world
+        route = self._route
+        room = route[self._stop]
+        if not self.blocking:
+            if world.flags(room) & WorldTemplate.DROID:
+                # Another droid has moved in; try again next tick
+                self._due = now + 1
+                return 1
+            self.blocking = True
+            world.place_droid(room, self)
+        elif self._patrols:
+            next_stop = self._stop + 1
+            if next_stop == len(route):
+                next_stop = 0
+            if world.droid(room) is self and world.move_droid(room, route[next_stop]):
+                self._stop = next_stop
+
+        if not self._patrols:
+            self._due = None
+            return None
+        self._due = now + self._patrol_every
+        return self._patrol_every
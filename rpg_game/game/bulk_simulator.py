@@ -0,0 +1,320 @@
+"""
+Module containing the BulkSimulator class, which plays many games at once.
+
+Game state is held as NumPy arrays with one entry per session (location,
+tool, crystal, droids still blocking, score, hazards and whether the game
+is won), and each step applies one command to every session using array
+masks instead of a Python loop. The rules are the same as Player and
+GameController.check_win_condition:
+
+    get tool      +10 if the room has the tool and the player has none
+    use tool      +20 if the player has the tool and the room's droid blocks
+    get crystal   +50 if the room has the crystal and the player has none
+    go <dir>      one hazard if the room's droid blocks and guards the exit
+    win           +30 in the goal room with the crystal; the session ends
+
+As with GameController.run_commands, a session ignores every command after
+the one that wins. Commands that change nothing (look, help, unknown
+commands and so on) are accepted and do nothing.
+
+NumPy is optional for the rest of the game; install it to use this module:
+
+    pip install numpy
+"""
+
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+from .droid import DEFAULT_GUARDS
+from .game_controller import GameController
+from .item_registry import CRYSTAL, ITEMS, TOOL
+from .world_template import WorldTemplate
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+# What a command does, once it has been parsed
+NOTHING = 0
+GO = 1
+GET_TOOL = 2
+GET_CRYSTAL = 3
+USE_TOOL = 4
+WIN = 5
+
+# Points, as awarded by Player and GameController
+TOOL_POINTS = 10
+REPAIR_POINTS = 20
+CRYSTAL_POINTS = 50
+WIN_POINTS = 30
+
+# Verbs whose handlers only show text
+_TEXT_VERBS = ("help", "look", "inventory", "status")
+
+
+class BulkSimulator:
+    """
+    Plays the same world in many sessions at once, one command per step.
+    """
+
+    def __init__(self, template: WorldTemplate, sessions: int):
+        """
+        Start every session at the beginning of the world.
+
+        Args:
+            template: The world to play in
+            sessions: How many sessions to simulate
+
+        Raises:
+            ImportError: If NumPy is not installed
+            ValueError: If the world has exit gates, which the simulator
+                has no rules for
+        """
+        if np is None:
+            raise ImportError("BulkSimulator needs NumPy: pip install numpy")
+        if template.has_gates:
+            raise ValueError("BulkSimulator does not support worlds with exit gates")
+        self._template = template
+        rooms = len(template)
+        # Only the built-in items have rules, so only their bits are kept
+        builtin = WorldTemplate.TOOL | WorldTemplate.CRYSTAL | WorldTemplate.DROID
+        flags = np.fromiter((template.flags(room) & builtin for room in range(rooms)),
+                            dtype=np.uint8, count=rooms)
+        self._room_tool = (flags & WorldTemplate.TOOL) != 0
+        self._room_crystal = (flags & WorldTemplate.CRYSTAL) != 0
+
+        # Each room with a droid gets a column in the droid_blocking array
+        droid_rooms = np.flatnonzero(flags & WorldTemplate.DROID)
+        self._droid_column = np.full(rooms, -1, dtype=np.int32)
+        self._droid_column[droid_rooms] = np.arange(len(droid_rooms))
+
+        self._location = np.full(sessions, template.start, dtype=np.int32)
+        self._has_tool = np.zeros(sessions, dtype=bool)
+        self._has_crystal = np.zeros(sessions, dtype=bool)
+        self._droid_blocking = np.ones((sessions, len(droid_rooms)), dtype=bool)
+        self._score = np.zeros(sessions, dtype=np.int32)
+        self._hazards = np.zeros(sessions, dtype=np.int32)
+        self._won = np.zeros(sessions, dtype=bool)
+
+        self._commands: List[str] = []            # code -> command text
+        self._codes: Dict[str, int] = {}          # command text -> code
+        self._actions: List[Tuple[int, object]] = []  # code -> (action, exits)
+
+    @property
+    def template(self) -> WorldTemplate:
+        return self._template
+
+    @property
+    def sessions(self) -> int:
+        return len(self._location)
+
+    @property
+    def location(self) -> 'np.ndarray':
+        return self._location
+
+    @property
+    def has_tool(self) -> 'np.ndarray':
+        return self._has_tool
+
+    @property
+    def has_crystal(self) -> 'np.ndarray':
+        return self._has_crystal
+
+    @property
+    def droid_blocking(self) -> 'np.ndarray':
+        """One row per session, one column per droid room in room order."""
+        return self._droid_blocking
+
+    @property
+    def score(self) -> 'np.ndarray':
+        return self._score
+
+    @property
+    def hazards(self) -> 'np.ndarray':
+        return self._hazards
+
+    @property
+    def won(self) -> 'np.ndarray':
+        return self._won
+
+    @property
+    def commands(self) -> List[str]:
+        """The commands seen so far; a command's code is its position."""
+        return self._commands
+
+    def code(self, command: str) -> int:
+        """
+        Get the number used for a command in step().
+
+        The command is normalised and parsed the way run_commands() would,
+        so aliases such as 'e' mean the same as 'go east'.
+
+        Args:
+            command: The command text
+
+        Returns:
+            int: The command's code
+
+        Raises:
+            ValueError: If the command uses a verb the simulator does not
+                know the rules for
+        """
+        command = command.strip().lower()
+        code = self._codes.get(command)
+        if code is None:
+            code = len(self._commands)
+            self._actions.append(self._compile(command))
+            self._commands.append(command)
+            self._codes[command] = code
+        return code
+
+    def encode(self, commands: Iterable[str]) -> 'np.ndarray':
+        """
+        Turn command texts into an array of codes for step().
+
+        Args:
+            commands: One command per session
+
+        Returns:
+            np.ndarray: The codes
+        """
+        return np.array([self.code(command) for command in commands], dtype=np.int32)
+
+    def _compile(self, command: str) -> Tuple[int, object]:
+        """Work out what a command does, and for 'go' where each room leads."""
+        handler, argument = GameController.commands.parse(command)
+        if handler is None:
+            return NOTHING, None
+        verb = GameController.commands.verb_for(handler)
+        if verb in _TEXT_VERBS:
+            return NOTHING, None
+        if verb in ("get", "use"):
+            return self._compile_item(verb, ITEMS.lookup(argument)), None
+        if verb == "win":
+            return WIN, None
+        if verb == "go":
+            return GO, self._compile_exits(argument)
+        raise ValueError(f"No simulation rules for the '{verb}' command")
+
+    @staticmethod
+    def _compile_item(verb: str, item_id) -> int:
+        """Work out what 'get' or 'use' does with an item."""
+        if verb == "get":
+            if item_id == TOOL:
+                return GET_TOOL
+            if item_id == CRYSTAL:
+                return GET_CRYSTAL
+            if item_id is None or not ITEMS.takeable(item_id):
+                return NOTHING
+        else:
+            if item_id == TOOL:
+                return USE_TOOL
+            if item_id is None or ITEMS.use_action(item_id) is None:
+                return NOTHING
+        raise ValueError(f"No simulation rules for '{verb} {ITEMS.key(item_id)}'")
+
+    def _compile_exits(self, direction: str) -> Tuple['np.ndarray', 'np.ndarray']:
+        """
+        For one typed direction, find each room's target and whether the
+        exit is the one the room's droid guards (DEFAULT_GUARDS).
+        """
+        normalized = direction.strip().lower()
+        rooms = len(self._template)
+        targets = np.full(rooms, -1, dtype=np.int32)
+        guarded = np.zeros(rooms, dtype=bool)
+        for room in range(rooms):
+            matching = self._template.find_exit(room, normalized)
+            if matching is None:
+                continue
+            for exit_direction, target in self._template.exits(room):
+                if exit_direction == matching:
+                    targets[room] = target
+                    break
+            guarded[room] = (matching.lower() == DEFAULT_GUARDS and
+                             self._droid_column[room] >= 0)
+        return targets, guarded
+
+    def step(self, commands: Union[str, int, Sequence[int], 'np.ndarray']) -> None:
+        """
+        Apply one command to every session that has not won yet.
+
+        Args:
+            commands: A command text or code for every session, or an array
+                holding one code per session
+        """
+        if isinstance(commands, str):
+            commands = self.code(commands)
+        playing = ~self._won
+        if np.isscalar(commands):
+            self._apply(int(commands), np.flatnonzero(playing))
+            return
+
+        commands = np.asarray(commands)
+        for code in np.unique(commands[playing]):
+            self._apply(int(code), np.flatnonzero(playing & (commands == code)))
+
+    def run(self, codes: 'np.ndarray') -> None:
+        """
+        Apply a whole table of commands.
+
+        Args:
+            codes: One row per step, one column per session
+        """
+        for row in codes:
+            self.step(row)
+
+    def _apply(self, code: int, sessions: 'np.ndarray') -> None:
+        """Apply one command to the given session numbers."""
+        action, exits = self._actions[code]
+        if action == NOTHING or len(sessions) == 0:
+            return
+        location = self._location[sessions]
+
+        if action == GO:
+            targets, guarded = exits
+            target = targets[location]
+            column = self._droid_column[location]
+            blocked = guarded[location]
+            blocked[blocked] = self._droid_blocking[sessions[blocked], column[blocked]]
+            self._hazards[sessions[blocked]] += 1
+            moving = (target >= 0) & ~blocked
+            self._location[sessions[moving]] = target[moving]
+
+        elif action == GET_TOOL:
+            taking = self._room_tool[location] & ~self._has_tool[sessions]
+            self._has_tool[sessions[taking]] = True
+            self._score[sessions[taking]] += TOOL_POINTS
+
+        elif action == GET_CRYSTAL:
+            taking = self._room_crystal[location] & ~self._has_crystal[sessions]
+            self._has_crystal[sessions[taking]] = True
+            self._score[sessions[taking]] += CRYSTAL_POINTS
+
+        elif action == USE_TOOL:
+            column = self._droid_column[location]
+            repairing = self._has_tool[sessions] & (column >= 0)
+            repairing[repairing] = self._droid_blocking[sessions[repairing],
+                                                        column[repairing]]
+            self._droid_blocking[sessions[repairing], column[repairing]] = False
+            self._score[sessions[repairing]] += REPAIR_POINTS
+
+        elif action == WIN:
+            winning = (location == self._template.goal) & self._has_crystal[sessions]
+            self._won[sessions[winning]] = True
+            self._score[sessions[winning]] += WIN_POINTS
+
+    def summary(self) -> dict:
+        """
+        Summarise every session's outcome so far.
+
+        Returns:
+            dict: Session count, win rate, and the mean and maximum score
+            and hazards
+        """
+        return {
+            "sessions": self.sessions,
+            "win_rate": float(self._won.mean()),
+            "mean_score": float(self._score.mean()),
+            "max_score": int(self._score.max()),
+            "mean_hazards": float(self._hazards.mean()),
+            "max_hazards": int(self._hazards.max()),
+        }
@@ -0,0 +1,32 @@
+"""
+Module containing the CommandResult class describing the outcome of a command.
+"""
+
+
+class CommandResult:
+    """
+    The structured result of one command processed by the GameController.
+    """
+
+    def __init__(self, command: str, message: str, score_delta: int = 0,
+                 hazard_delta: int = 0, won: bool = False):
+        """
+        Initialize a new command result.
+
+        Args:
+            command: The command that was processed
+            message: All text the command produced, one line per message
+            score_delta: How much the player's score changed
+            hazard_delta: How much the player's hazard count changed
+            won: Whether this command completed the mission
+        """
+        self.command = command
+        self.message = message
+        self.score_delta = score_delta
+        self.hazard_delta = hazard_delta
+        self.won = won
+
+    def __repr__(self) -> str:
+        return (f"CommandResult(command={self.command!r}, "
+                f"score_delta={self.score_delta}, "
+                f"hazard_delta={self.hazard_delta}, won={self.won})")
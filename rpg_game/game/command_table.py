@@ -0,0 +1,105 @@
+"""
+Module containing the CommandTable class that maps typed commands to handlers.
+"""
+
+from typing import Callable, Optional, Tuple
+
+
+class CommandTable:
+    """
+    A table of command verbs, their handlers and their shortcut aliases.
+
+    A command is split into a verb (the first word) and an argument (the
+    rest), and the verb is looked up in a dictionary, so finding a handler
+    costs the same however many verbs are registered.
+    """
+
+    # How many parsed commands to remember before starting over
+    MAX_CACHED_COMMANDS = 1024
+
+    def __init__(self):
+        """Initialize an empty command table."""
+        self._verbs = {}    # verb -> (handler, takes_argument)
+        self._handler_verbs = {}  # handler -> verb
+        self._aliases = {}  # alias -> full command, e.g. 'n' -> 'go north'
+        self._parsed = {}   # command text -> (handler, argument)
+
+    def register(self, verb: str, handler: Callable,
+                 takes_argument: bool = False) -> None:
+        """
+        Register a handler for a verb, replacing any existing one.
+
+        The handler is called as handler(game, argument), where game is the
+        GameController. It may return True when the command wins the game.
+
+        Args:
+            verb: The first word of the command (e.g. 'go')
+            handler: The function to call for this verb
+            takes_argument: Whether the verb needs an argument ('go east')
+                or must be typed on its own ('look')
+        """
+        self._verbs[verb.lower()] = (handler, takes_argument)
+        self._handler_verbs[handler] = verb.lower()
+        self._parsed.clear()
+
+    def add_alias(self, alias: str, command: str) -> None:
+        """
+        Add a shortcut that stands for a full command.
+
+        Args:
+            alias: The shortcut (e.g. 'n')
+            command: The command it stands for (e.g. 'go north')
+        """
+        self._aliases[alias.lower()] = command.lower()
+        self._parsed.clear()
+
+    def parse(self, command: str) -> Tuple[Optional[Callable], str]:
+        """
+        Find the handler and argument for a command.
+
+        Commands that have been seen before are answered straight from a
+        cache without splitting the text again.
+
+        Args:
+            command: The command entered by the player
+
+        Returns:
+            tuple: (handler, argument), or (None, '') if the command is
+            not recognised
+        """
+        parsed = self._parsed.get(command)
+        if parsed is None:
+            parsed = self._tokenize(command)
+            if len(self._parsed) >= self.MAX_CACHED_COMMANDS:
+                self._parsed.clear()
+            self._parsed[command] = parsed
+        return parsed
+
+    def _tokenize(self, command: str) -> Tuple[Optional[Callable], str]:
+        """Split a command into its verb and argument and find the handler."""
+        command = self._aliases.get(command, command)
+        verb, _, argument = command.partition(" ")
+        argument = argument.strip()
+
+        entry = self._verbs.get(verb)
+        if entry is None:
+            return None, ""
+        handler, takes_argument = entry
+        if takes_argument != bool(argument):
+            return None, ""
+        return handler, argument
+
+    def verb_for(self, handler: Callable) -> Optional[str]:
+        """
+        Find the verb a handler was registered for.
+
+        Args:
+            handler: A handler returned by parse()
+
+        Returns:
+            str or None: The verb, or None if the handler is not registered
+        """
+        return self._handler_verbs.get(handler)
+
+    def __contains__(self, verb: str) -> bool:
+        return verb.lower() in self._verbs
@@ -9,19 +9,13 @@ class DiagnosticTool(StationItem):
     """
     A diagnostic tool used to repair the maintenance droid.
     """
+    __slots__ = ()
 
     def __init__(self):
         """Initialize the diagnostic tool with default values."""
         super().__init__(
             name="Diagnostic Tool",
-            description="A handheld device with various connectors and readouts."
+            description="A handheld device with various connectors and readouts.",
+            examine_text=("A handheld device with various connectors and readouts. "
+                          "It might be useful for repairing maintenance droids.")
         )
-    
-    def examine(self) -> str:
-        """
-        Return a hint about the tool's purpose.
-        
-        Returns:
-            A string containing a hint about the tool
-        """
-        return f"{self._description} It might be useful for repairing maintenance droids."
@@ -2,15 +2,25 @@
 Module containing the DamagedMaintenanceDroid class for the game.
 """
 
+# The exit a droid blocks unless told otherwise
+DEFAULT_GUARDS = "east"
+
 
 class DamagedMaintenanceDroid:
     """
     Represents a damaged maintenance droid that blocks the player's path until repaired.
     """
+    __slots__ = ('blocking', 'guards')
 
-    def __init__(self):
-        """Initialize the droid in a blocking state."""
+    def __init__(self, guards: str = DEFAULT_GUARDS):
+        """
+        Initialize the droid in a blocking state.
+        
+        Args:
+            guards: The lowercase direction of the exit the droid blocks
+        """
         self.blocking = True
+        self.guards = guards
     
     def repair(self) -> None:
         """
@@ -26,3 +36,18 @@ class DamagedMaintenanceDroid:
             bool: True if the droid is blocking, False otherwise
         """
         return self.blocking
+
+    def act(self, now: int):
+        """
+        Take a turn when an NpcScheduler says the droid is due.
+        
+        A plain droid is never scheduled and does nothing.
+        
+        Args:
+            now: The scheduler's current tick
+        
+        Returns:
+            How many ticks until the droid's next turn, or None for no
+            further turns
+        """
+        return None
@@ -9,19 +9,13 @@ class EnergyCrystal(StationItem):
     """
     A volatile energy crystal that the player must collect.
     """
+    __slots__ = ()
 
     def __init__(self):
         """Initialize the energy crystal with default values."""
         super().__init__(
             name="Energy Crystal",
-            description="A glowing crystal that pulses with energy."
+            description="A glowing crystal that pulses with energy.",
+            examine_text=("A glowing crystal that pulses with energy. "
+                          "It looks unstable and dangerous.")
         )
-    
-    def examine(self) -> str:
-        """
-        Return a description of the crystal.
-        
-        Returns:
-            A string describing the crystal's appearance
-        """
-        return f"{self._description} It looks unstable and dangerous."
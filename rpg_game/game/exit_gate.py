@@ -0,0 +1,100 @@
+"""
+Classes for rules that can stop the player taking an exit.
+
+A gate is attached to one exit of a location. When the player tries that
+exit, Player.move calls the gate's check() directly; if it returns True the
+move fails with the gate's message. Gates are built once, when the world is
+loaded, and shared by every session:
+
+    location.set_exit_gate("north", ItemGate(keycard))
+    location.set_exit_gate("up", ScoreGate(50))
+    location.set_exit_gate("down", ExitGate("Rubble blocks the way."))
+
+A droid's own exit is checked by Location.closed_by() as well, so a gate is
+only needed for other rules.
+"""
+
+from typing import Optional
+from .item_registry import ITEMS
+from .response_catalog import RESPONSES
+
+
+class ExitGate:
+    """
+    A gate that is always closed, e.g. a jammed door.
+    """
+    __slots__ = ('message', 'hazard')
+
+    def __init__(self, message: str = "The way is blocked.", hazard: bool = False):
+        """
+        Initialize a gate.
+
+        Args:
+            message: What the player is told when the gate stops them
+            hazard: Whether being stopped counts as a hazard
+        """
+        self.message = message
+        self.hazard = hazard
+
+    def check(self, player, location) -> bool:
+        """
+        Decide whether the gate stops the player.
+
+        Args:
+            player: The Player trying the exit
+            location: The Location the exit leads from
+
+        Returns:
+            bool: True if the player cannot go this way
+        """
+        return True
+
+
+class ItemGate(ExitGate):
+    """
+    A gate that only lets through a player carrying an item.
+    """
+    __slots__ = ('item_id',)
+
+    def __init__(self, item_id: int, message: Optional[str] = None):
+        """
+        Initialize an item gate.
+
+        Args:
+            item_id: The id in ITEMS of the item the player needs
+            message: What the player is told without it
+        """
+        if message is None:
+            message = f"You need the {ITEMS.display_name(item_id)} to go that way."
+        super().__init__(message)
+        self.item_id = item_id
+
+    def check(self, player, location) -> bool:
+        return self.item_id not in player.inventory
+
+
+class ScoreGate(ExitGate):
+    """
+    A gate that only lets through a player with a high enough score.
+    """
+    __slots__ = ('minimum',)
+
+    def __init__(self, minimum: int, message: Optional[str] = None):
+        """
+        Initialize a score gate.
+
+        Args:
+            minimum: The lowest score allowed through
+            message: What the player is told if their score is lower
+        """
+        if message is None:
+            message = f"You need a score of {minimum} to go that way."
+        super().__init__(message)
+        self.minimum = minimum
+
+    def check(self, player, location) -> bool:
+        return player.score < self.minimum
+
+
+# Returned by Location.closed_by() when a droid blocks the exit
+DROID_GATE = ExitGate(RESPONSES.droid_blocks, hazard=True)
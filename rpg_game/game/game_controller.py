@@ -2,20 +2,64 @@
 Module containing the GameController class for managing game state and flow.
 """
 
-from typing import Optional, Tuple
-from .location import Location
+import time
+from typing import Iterable, List, Optional, Tuple
+from .command_result import CommandResult
+from .command_table import CommandTable
 from .player import Player
-from .droid import DamagedMaintenanceDroid
-from .diagnostic_tool import DiagnosticTool
-from .energy_crystal import EnergyCrystal
+from .item_registry import CRYSTAL, ITEMS, TOOL
+from .metrics import UNKNOWN_VERB, Metrics
+from .npc_scheduler import NpcScheduler
+from .output_sink import CallbackSink, NullSink, OutputSink, StdoutSink
+from .response_catalog import RESPONSES, ResponseCatalog
+from .snapshot import restore_snapshot, take_snapshot
+from .world_loader import default_world
+from .world_state import WorldState
+from .world_template import WorldTemplate
 
 
 class GameController:
     """
     Controls the main game loop and manages game state.
     """
-    def __init__(self):
-        """Initialize the game world and player."""
+    # Shared table of commands; plugins can register new verbs on it
+    commands = CommandTable()
+    UNKNOWN_COMMAND = RESPONSES.unknown_command
+    
+    def __init__(self, headless: bool = False,
+                 world: Optional[WorldTemplate] = None,
+                 output: Optional[OutputSink] = None,
+                 metrics: Optional[Metrics] = None,
+                 scheduler: Optional[NpcScheduler] = None,
+                 responses: Optional[ResponseCatalog] = None):
+        """
+        Initialize the game world and player.
+
+        Args:
+            headless: If True, messages are only collected into the
+                CommandResult returned by process_input and never printed
+            world: The compiled world to play in (defaults to the space
+                station in rpg_game/worlds/space_station.json)
+            output: Where messages are written (defaults to the terminal,
+                or nowhere when headless)
+            metrics: Where command counts and timings are recorded; when
+                None (the default) nothing is timed
+            scheduler: If given, moved on one tick after every command so
+                NPCs such as AutonomousDroid take their turns
+            responses: The texts of the game's messages (defaults to
+                English)
+        """
+        self.headless = headless
+        if output is None:
+            output = NullSink() if headless else StdoutSink()
+        self.output = output
+        self.metrics = metrics
+        self.scheduler = scheduler
+        self.responses = responses if responses is not None else RESPONSES
+        self._in_command = False
+        self.world = world if world is not None else default_world()
+        self._messages = []
+        self.world_state = None
         self.maintenance_tunnels = None
         self.docking_bay = None
         self.droid = None
@@ -24,95 +68,239 @@ class GameController:
         self.energy_crystal = None
         self.last_command_was_win = False
         self.setup_world()
+        if metrics is not None:
+            metrics.record_game_started()
     
     def setup_world(self) -> None:
         """Set up the game world with locations, items, and the player."""
-        # Create locations
-        self.maintenance_tunnels = Location(
-            "Maintenance Tunnels",
-            "You are in the maintenance tunnels under the space station. "
-            "The walls are lined with pipes and conduits. "
-            "To the east is the Docking Bay."
-        )
+        # Start a fresh session on the shared, compiled world
+        self.world_state = WorldState(self.world)
+        self.maintenance_tunnels = self.world_state.location(self.world.start)
+        self.docking_bay = self.world_state.location(self.world.goal)
         
-        self.docking_bay = Location(
-            "Docking Bay",
-            "You are in the Docking Bay. "
-            "This is where ships come and go from the station. "
-            "To the west are the Maintenance Tunnels."
-        )
+        # The droid is the one guarding the start; items are shared by
+        # every game through the item registry
+        self.droid = self.maintenance_tunnels.droid
+        self.diagnostic_tool = ITEMS.item(TOOL)
+        self.energy_crystal = ITEMS.item(CRYSTAL)
         
-        # Connect locations
-        self.maintenance_tunnels.add_exit("east", self.docking_bay)
-        self.docking_bay.add_exit("west", self.maintenance_tunnels)
+        # Create player and send its messages through the controller
+        self.player = Player(self.maintenance_tunnels)
+        self.player.output = CallbackSink(self._say)
+        self.player.responses = self.responses
+        if self.metrics is not None:
+            self.metrics.instrument(self.player)
+
+    def reset(self) -> None:
+        """
+        Start a new game in the same world, reusing this controller.
+
+        Unlike setup_world(), the existing player, locations and droids are
+        put back to their starting state instead of being made again.
+        """
+        self._restart()
+        if self.metrics is not None:
+            self.metrics.record_game_started()
+
+    def _restart(self) -> None:
+        """Put the world and player back to the start without counting a game."""
+        self.world_state.reset()
+        self.droid = self.maintenance_tunnels.droid
+        self.player.reset(self.maintenance_tunnels)
+        self._messages = []
+        self.last_command_was_win = False
+        if hasattr(self, '_win_bonus_added'):
+            del self._win_bonus_added
+
+    def _say(self, message: str) -> None:
+        """
+        Record a message for the current command.
+
+        During process_input the messages are sent to the output together
+        when the command ends; at other times each is sent straight away.
+
+        Args:
+            message: The text to show the player
+        """
+        self._messages.append(message)
+        if not self._in_command:
+            self.output.write(message)
+            self.output.flush()
+    
+    def snapshot(self) -> bytes:
+        """
+        Save the game's state as compact bytes.
         
-        # Set up items and droid
-        self.maintenance_tunnels.has_tool = True
-        self.docking_bay.has_crystal = True
+        Returns:
+            bytes: A snapshot that restore() can load
+        """
+        return take_snapshot(self)
+    
+    def restore(self, data: bytes) -> None:
+        """
+        Load a state saved by snapshot(), replacing the current one.
         
-        # Create game objects
-        self.droid = DamagedMaintenanceDroid()
-        self.diagnostic_tool = DiagnosticTool()
-        self.energy_crystal = EnergyCrystal()
+        Args:
+            data: A snapshot taken from a game in the same world
+        """
+        restore_snapshot(self, data)
+    
+    def intro_text(self) -> str:
+        """
+        Build the text shown when a game starts.
         
-        # Place droid in the maintenance tunnels
-        self.maintenance_tunnels.set_droid_present(True, self.droid)
+        Returns:
+            str: The welcome message and the starting location
+        """
+        return self.responses.intro + self.player.current_location.describe()
+    
+    def final_text(self) -> str:
+        """
+        Build the text shown when the mission is complete.
         
-        # Create player
-        self.player = Player(self.maintenance_tunnels)
+        Returns:
+            str: The congratulations message and final score
+        """
+        score, hazards = self.player.get_status()
+        return self.responses.final.format(score=score, hazards=hazards)
     
     def start_game(self) -> None:
         """Start the main game loop."""
-        print("Welcome to Space Station Repair!")
-        print("Type 'help' for a list of commands.\n")
-        
-        # Initial location description
-        print(self.player.current_location.describe())
+        self.output.write(self.intro_text())
+        self.output.flush()
         
         # Main game loop
         while True:
             command = input("\nWhat would you like to do? ").strip().lower()
-            self.process_input(command)
+            result = self.process_input(command)
             
-            # Check win condition after each command
-            if self.check_win_condition():
-                print("\nCongratulations! You've completed your mission!")
-                score, hazards = self.player.get_status()
-                print(f"Final Score: {score} (Hazards: {hazards})")
+            # Stop once a command has completed the mission
+            if result.won:
+                self.output.write(self.final_text())
+                self.output.flush()
                 break
     
-    def process_input(self, command: str) -> None:
+    def process_input(self, command: str) -> CommandResult:
         """
         Process a player's command.
         
         Args:
             command: The command entered by the player
+            
+        Returns:
+            CommandResult: The messages, score and hazard changes and win
+            flag produced by the command
         """
         self.last_command_was_win = False
+        self._messages = []
+        won = False
+        score_before, hazards_before = self.player.get_status()
+        metrics = self.metrics
+        if metrics is not None:
+            started = time.perf_counter_ns()
+            won_before = hasattr(self, '_win_bonus_added')
         
-        if command == "help":
-            self.show_help()
-        elif command == "look":
-            print(self.player.current_location.describe())
-        elif command == "inventory":
-            self.show_inventory()
-        elif command.startswith("go "):
-            direction = command[3:].strip()
-            self.player.move(direction)
-        elif command == "get tool":
-            self.player.pick_up_tool()
-        elif command == "use tool":
-            self.player.use_tool_on_droid()
-        elif command == "get crystal":
-            self.player.pick_up_crystal()
-        elif command == "status":
-            self.show_status()
-        elif command == "win":
-            self.last_command_was_win = True
-            if not self.check_win_condition():
-                print("You haven't completed all the mission objectives yet!")
+        self._in_command = True
+        try:
+            handler, argument = self.commands.parse(command)
+            if handler is None:
+                self._say(self.responses.unknown_command)
+            else:
+                won = bool(handler(self, argument))
+        finally:
+            self._in_command = False
+        if self.scheduler is not None:
+            self.scheduler.advance()
+        
+        # Send everything the command said to the output in one write
+        message = "\n".join(self._messages)
+        if message:
+            self.output.write(message)
+        self.output.flush()
+        
+        score, hazards = self.player.get_status()
+        if metrics is not None:
+            verb = UNKNOWN_VERB if handler is None else self.commands.verb_for(handler)
+            # Saying 'win' again after winning does not win another game
+            metrics.record_command(verb, time.perf_counter_ns() - started,
+                                   hazards - hazards_before, won and not won_before)
+        return CommandResult(
+            command,
+            message,
+            score_delta=score - score_before,
+            hazard_delta=hazards - hazards_before,
+            won=won
+        )
+    
+    def _cmd_help(self, argument: str) -> None:
+        """Handle 'help'."""
+        self.show_help()
+    
+    def _cmd_look(self, argument: str) -> None:
+        """Handle 'look'."""
+        self._say(self.player.current_location.describe())
+    
+    def _cmd_inventory(self, argument: str) -> None:
+        """Handle 'inventory'."""
+        self.show_inventory()
+    
+    def _cmd_status(self, argument: str) -> None:
+        """Handle 'status'."""
+        self.show_status()
+    
+    def _cmd_go(self, direction: str) -> None:
+        """Handle 'go <direction>'."""
+        self.player.move(direction)
+    
+    def _cmd_get(self, item: str) -> None:
+        """Handle 'get <item>', e.g. 'get tool' or 'get energy crystal'."""
+        item_id = ITEMS.lookup(item)
+        if item_id is None or not ITEMS.takeable(item_id):
+            self._say(self.responses.unknown_command)
+            return
+        action = ITEMS.get_action(item_id)
+        if action is None:
+            self.player.pick_up(item_id)
+        else:
+            getattr(self.player, action)()
+    
+    def _cmd_use(self, item: str) -> None:
+        """Handle 'use <item>', e.g. 'use tool'."""
+        item_id = ITEMS.lookup(item)
+        action = ITEMS.use_action(item_id) if item_id is not None else None
+        if action is None:
+            self._say(self.responses.unknown_command)
         else:
-            print("I don't understand that command. Type 'help' for a list of commands.")
+            getattr(self.player, action)()
+    
+    def _cmd_win(self, argument: str) -> bool:
+        """Handle 'win', returning True if the mission is complete."""
+        self.last_command_was_win = True
+        won = self.check_win_condition()
+        if not won:
+            self._say(self.responses.not_complete)
+        return won
+    
+    def run_commands(self, commands: Iterable[str]) -> List[CommandResult]:
+        """
+        Run a list of commands, as a recorded session, without any prompts.
+        
+        Commands are normalised the same way start_game does, and the
+        session stops after the command that wins the game.
+        
+        Args:
+            commands: The commands to run, in order
+            
+        Returns:
+            list: One CommandResult for each command that was run
+        """
+        results = []
+        for command in commands:
+            result = self.process_input(command.strip().lower())
+            results.append(result)
+            if result.won:
+                break
+        return results
     
     def check_win_condition(self) -> bool:
         """
@@ -126,11 +314,11 @@ class GameController:
             return False
             
         if self.player.current_location != self.docking_bay:
-            print("You need to be in the Docking Bay to complete your mission!")
+            self._say(self.responses.wrong_room.format(room=self.docking_bay.name))
             return False
             
         if not self.player.has_crystal:
-            print("You need to retrieve the energy crystal first!")
+            self._say(self.responses.need_crystal)
             return False
             
         # All conditions met - player wins!
@@ -142,29 +330,27 @@ class GameController:
     
     def show_help(self) -> None:
         """Display the help message with available commands."""
-        print("\nAvailable commands:")
-        print("  help           - Show this help message")
-        print("  look           - Look around the current location")
-        print("  inventory      - Check your inventory")
-        print("  go <direction> - Move in the specified direction (e.g., 'go east')")
-        print("  get tool       - Pick up the diagnostic tool")
-        print("  use tool       - Use the diagnostic tool on the droid")
-        print("  get crystal    - Pick up the energy crystal")
-        print("  status         - Check your score and hazard count")
-        print("  win            - Complete the mission (if all objectives are met)")
+        self._say(self.responses.help)
     
     def show_inventory(self) -> None:
         """Show the player's current inventory."""
-        print("\nInventory:")
-        if self.player.has_tool:
-            print("- Diagnostic Tool")
-        if self.player.has_crystal:
-            print("- Energy Crystal")
-        if not (self.player.has_tool or self.player.has_crystal):
-            print("You're not carrying anything.")
+        self._say(self.responses.inventory_text(self.player.inventory.bits))
     
     def show_status(self) -> None:
         """Show the player's current status."""
         score, hazards = self.player.get_status()
-        print(f"\nScore: {score}")
-        print(f"Hazards encountered: {hazards}")
+        self._say(self.responses.status_text(score, hazards))
+
+
+# Register the built-in commands and their shortcuts
+GameController.commands.register("help", GameController._cmd_help)
+GameController.commands.register("look", GameController._cmd_look)
+GameController.commands.register("inventory", GameController._cmd_inventory)
+GameController.commands.register("status", GameController._cmd_status)
+GameController.commands.register("win", GameController._cmd_win)
+GameController.commands.register("go", GameController._cmd_go, takes_argument=True)
+GameController.commands.register("get", GameController._cmd_get, takes_argument=True)
+GameController.commands.register("use", GameController._cmd_use, takes_argument=True)
+for _alias, _command in [("n", "go north"), ("e", "go east"), ("s", "go south"),
+                         ("w", "go west"), ("l", "look"), ("i", "inventory")]:
+    GameController.commands.add_alias(_alias, _command)
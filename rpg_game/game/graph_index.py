@@ -0,0 +1,294 @@
+"""
+Module containing the GraphIndex class for route finding over a world's exits.
+"""
+
+from array import array
+from collections import OrderedDict, deque
+from typing import Iterable, List, Optional, Set, Tuple
+from .droid import DEFAULT_GUARDS
+from .world_template import WorldTemplate
+
+# Marks a room that cannot reach the target at all
+UNREACHABLE = -1
+
+
+def droid_gates(template: WorldTemplate,
+                guards: str = DEFAULT_GUARDS) -> Set[Tuple[int, str]]:
+    """
+    Find the exits a droid blocks when the world starts.
+
+    As in Location.closed_by, a droid blocks the exit of its room named by
+    its guards direction.
+
+    Args:
+        template: The world to look in
+        guards: The direction the world's droids guard
+
+    Returns:
+        set: (room number, direction) for every blocked exit
+    """
+    gates = set()
+    for room in range(len(template)):
+        if template.flags(room) & WorldTemplate.DROID:
+            for direction, _ in template.exits(room):
+                if direction.lower() == guards:
+                    gates.add((room, direction))
+    return gates
+
+
+def gated_exits(template: WorldTemplate) -> Set[Tuple[int, str]]:
+    """
+    Find the exits that have an ExitGate in the world file.
+
+    Args:
+        template: The world to look in
+
+    Returns:
+        set: (room number, direction) for every gated exit
+    """
+    gates = set()
+    if template.has_gates:
+        for room in range(len(template)):
+            for direction, _ in template.exits(room):
+                if template.exit_gate(room, direction) is not None:
+                    gates.add((room, direction))
+    return gates
+
+
+class GraphIndex:
+    """
+    Answers shortest-route and reachability questions about a world.
+
+    For each target room asked about, one breadth-first search is run
+    backwards from the target, recording every room's distance to it and
+    the first exit to take. Later questions about that target are answered
+    by looking these up. Results for the goal room are built straight away;
+    others are built on first use and the least recently used are dropped
+    once MAX_TARGETS are held.
+
+    Blocked exits (a droid's exit, and any exit with a gate) are left out
+    of the routes. Whether an item or score gate opens depends on the
+    player, so callers unblock() such an exit once its gate lets them by.
+    Unblocking an exit updates the stored results in place, only touching
+    the rooms whose distance actually improves.
+    """
+
+    # How many targets to keep route results for
+    MAX_TARGETS = 64
+
+    def __init__(self, template: WorldTemplate,
+                 blocked: Optional[Iterable[Tuple[int, str]]] = None):
+        """
+        Index a world.
+
+        Args:
+            template: The world to index
+            blocked: (room number, direction) exits that cannot be used.
+                Defaults to the droid gates and gated exits of the world.
+        """
+        self._template = template
+        if blocked is None:
+            blocked = droid_gates(template) | gated_exits(template)
+        self._blocked = set()  # (room number, exit position)
+        for room, direction in blocked:
+            self._blocked.add((room, self._exit_position(room, direction)))
+
+        # For each room, the (room, exit position) pairs that lead into it
+        self._entrances = [[] for _ in range(len(template))]
+        for room in range(len(template)):
+            for position, (_, target) in enumerate(template.exits(room)):
+                self._entrances[target].append((room, position))
+
+        self._routes = OrderedDict()  # target -> (distances, first exits)
+        self._routes_to(template.goal)
+
+    @property
+    def template(self) -> WorldTemplate:
+        return self._template
+
+    def _exit_position(self, room: int, direction: str) -> int:
+        """Find where a direction is in a room's list of exits."""
+        for position, (exit_direction, _) in enumerate(self._template.exits(room)):
+            if exit_direction == direction:
+                return position
+        raise KeyError(f"Room {room} has no exit '{direction}'")
+
+    def _routes_to(self, target: int) -> Tuple[array, array]:
+        """Get, building if needed, every room's distance and first exit to a target."""
+        routes = self._routes.get(target)
+        if routes is not None:
+            self._routes.move_to_end(target)
+            return routes
+
+        distances = array("i", [UNREACHABLE]) * len(self._template)
+        first_exits = array("i", [UNREACHABLE]) * len(self._template)
+        distances[target] = 0
+        queue = deque([target])
+        while queue:
+            room = queue.popleft()
+            for source, position in self._entrances[room]:
+                if (distances[source] == UNREACHABLE and
+                        (source, position) not in self._blocked):
+                    distances[source] = distances[room] + 1
+                    first_exits[source] = position
+                    queue.append(source)
+
+        routes = (distances, first_exits)
+        self._routes[target] = routes
+        if len(self._routes) > self.MAX_TARGETS:
+            self._routes.popitem(last=False)
+        return routes
+
+    def is_blocked(self, room: int, direction: str) -> bool:
+        """
+        Check whether an exit is currently blocked.
+
+        Args:
+            room: The room number
+            direction: The exit's direction
+
+        Returns:
+            bool: True if the exit cannot be used
+        """
+        return (room, self._exit_position(room, direction)) in self._blocked
+
+    def distance(self, source: int, target: int) -> Optional[int]:
+        """
+        Count the moves on the shortest route between two rooms.
+
+        Args:
+            source: The room to start from
+            target: The room to reach
+
+        Returns:
+            int or None: The number of moves, or None if there is no route
+        """
+        distance = self._routes_to(target)[0][source]
+        return None if distance == UNREACHABLE else distance
+
+    def can_reach(self, source: int, target: int) -> bool:
+        """Check whether there is any route between two rooms."""
+        return self._routes_to(target)[0][source] != UNREACHABLE
+
+    def next_step(self, source: int, target: int) -> Optional[str]:
+        """
+        Find the first direction to take on a shortest route.
+
+        Args:
+            source: The room to start from
+            target: The room to reach
+
+        Returns:
+            str or None: The direction, or None if already there or there
+            is no route
+        """
+        position = self._routes_to(target)[1][source]
+        if position == UNREACHABLE:
+            return None
+        return self._template.exits(source)[position][0]
+
+    def path(self, source: int, target: int) -> Optional[List[str]]:
+        """
+        List the directions of a shortest route between two rooms.
+
+        Args:
+            source: The room to start from
+            target: The room to reach
+
+        Returns:
+            list or None: The directions in order, or None if there is no route
+        """
+        distances, first_exits = self._routes_to(target)
+        if distances[source] == UNREACHABLE:
+            return None
+        directions = []
+        room = source
+        while room != target:
+            direction, room = self._template.exits(room)[first_exits[room]]
+            directions.append(direction)
+        return directions
+
+    def can_win(self, source: int, has_crystal: bool,
+                crystal_rooms: Optional[Iterable[int]] = None) -> bool:
+        """
+        Check whether the goal can still be reached with the crystal.
+
+        Only the exits open right now are used, so this answers "can the
+        player win without repairing anything else".
+
+        Args:
+            source: The player's room
+            has_crystal: Whether the player already carries the crystal
+            crystal_rooms: Rooms holding a crystal; defaults to where the
+                world starts with one
+
+        Returns:
+            bool: True if a winning route exists
+        """
+        goal = self._template.goal
+        if has_crystal:
+            return self.can_reach(source, goal)
+        if crystal_rooms is None:
+            crystal_rooms = [
+                room for room in range(len(self._template))
+                if self._template.flags(room) & WorldTemplate.CRYSTAL
+            ]
+        return any(
+            self.can_reach(source, room) and self.can_reach(room, goal)
+            for room in crystal_rooms
+        )
+
+    def unblock(self, room: int, direction: str) -> None:
+        """
+        Open a blocked exit, e.g. after its droid has been repaired.
+
+        Stored routes are updated in place: only rooms that get closer to
+        a target through the new exit are visited.
+
+        Args:
+            room: The room number
+            direction: The exit's direction
+        """
+        position = self._exit_position(room, direction)
+        if (room, position) not in self._blocked:
+            return
+        self._blocked.discard((room, position))
+        target_room = self._template.exits(room)[position][1]
+
+        for distances, first_exits in self._routes.values():
+            if distances[target_room] == UNREACHABLE:
+                continue
+            new_distance = distances[target_room] + 1
+            if distances[room] != UNREACHABLE and distances[room] <= new_distance:
+                continue
+            distances[room] = new_distance
+            first_exits[room] = position
+            queue = deque([room])
+            while queue:
+                improved = queue.popleft()
+                for source, source_position in self._entrances[improved]:
+                    if (source, source_position) in self._blocked:
+                        continue
+                    closer = distances[improved] + 1
+                    if distances[source] == UNREACHABLE or closer < distances[source]:
+                        distances[source] = closer
+                        first_exits[source] = source_position
+                        queue.append(source)
+
+    def block(self, room: int, direction: str) -> None:
+        """
+        Close an exit, e.g. when a droid breaks down again.
+
+        Closing an exit can lengthen many routes, so stored routes are
+        dropped and rebuilt on the next question.
+
+        Args:
+            room: The room number
+            direction: The exit's direction
+        """
+        position = self._exit_position(room, direction)
+        if (room, position) in self._blocked:
+            return
+        self._blocked.add((room, position))
+        self._routes.clear()
+        self._routes_to(self._template.goal)
@@ -0,0 +1,95 @@
+"""
+Module containing the Inventory class, a set of item ids stored as bits.
+"""
+
+from typing import Iterator
+
+
+class Inventory:
+    """
+    The items a player is carrying, as the bits of one integer.
+
+    Item id n is held when bit 1 << n is set, so checking, adding and
+    removing an item are single integer operations, and a whole inventory
+    can be saved or compared as one number however many item types the
+    world has.
+    """
+    __slots__ = ('_bits',)
+
+    def __init__(self, bits: int = 0):
+        """
+        Initialize an inventory.
+
+        Args:
+            bits: The items held to start with, as a bitmap
+        """
+        self._bits = bits
+
+    @property
+    def bits(self) -> int:
+        return self._bits
+
+    @bits.setter
+    def bits(self, value: int) -> None:
+        self._bits = value
+
+    def __contains__(self, item_id: int) -> bool:
+        return self._bits >> item_id & 1 == 1
+
+    def __len__(self) -> int:
+        return bin(self._bits).count("1")
+
+    def __bool__(self) -> bool:
+        return self._bits != 0
+
+    def __iter__(self) -> Iterator[int]:
+        """Yield the ids of the items held, lowest first."""
+        bits = self._bits
+        while bits:
+            lowest = bits & -bits
+            yield lowest.bit_length() - 1
+            bits ^= lowest
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Inventory):
+            return NotImplemented
+        return self._bits == other._bits
+
+    def __repr__(self) -> str:
+        return f"Inventory({list(self)})"
+
+    def add(self, item_id: int) -> bool:
+        """
+        Add an item.
+
+        Args:
+            item_id: The item's id
+
+        Returns:
+            bool: True if it was added, False if it was already held
+        """
+        bit = 1 << item_id
+        if self._bits & bit:
+            return False
+        self._bits |= bit
+        return True
+
+    def remove(self, item_id: int) -> bool:
+        """
+        Remove an item.
+
+        Args:
+            item_id: The item's id
+
+        Returns:
+            bool: True if it was removed, False if it was not held
+        """
+        bit = 1 << item_id
+        if not self._bits & bit:
+            return False
+        self._bits ^= bit
+        return True
+
+    def clear(self) -> None:
+        """Remove every item."""
+        self._bits = 0
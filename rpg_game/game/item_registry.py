@@ -0,0 +1,154 @@
+"""
+Module containing the ItemRegistry class, which numbers every item type.
+
+Each kind of item is registered once under a short key (e.g. 'tool') and
+given the next free id, starting from 0. Inventories and room contents
+then only hold ids, packed as the bits of an integer: item id n is bit
+1 << n. The built-in items are registered first, so their bits are the
+TOOL, CRYSTAL and DROID flags of WorldTemplate:
+
+    ITEMS.id("tool")                 # TOOL == 0, bit 1
+    ITEMS.lookup("energy crystal")   # CRYSTAL == 1, bit 2
+"""
+
+from typing import Dict, List, Optional
+from .diagnostic_tool import DiagnosticTool
+from .energy_crystal import EnergyCrystal
+from .station_item import StationItem
+from .text_catalog import TEXT
+
+
+class ItemRegistry:
+    """
+    Interns item keys as small ids, with a name index for typed commands.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._keys: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._names: Dict[str, int] = {}  # lowercase key or name -> id
+        self._items: List[Optional[StationItem]] = []
+        self._display_names: List[str] = []
+        self._points: List[int] = []
+        self._takeable: List[bool] = []
+        self._get_actions: List[Optional[str]] = []
+        self._use_actions: List[Optional[str]] = []
+        self._room_texts: List[Optional[int]] = []  # ids in TEXT
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._ids
+
+    def register(self, key: str, item: Optional[StationItem] = None,
+                 points: int = 0, takeable: bool = True,
+                 get_action: Optional[str] = None,
+                 use_action: Optional[str] = None,
+                 room_text: Optional[str] = None) -> int:
+        """
+        Add an item type and give it the next id.
+
+        The item can be typed by its key or, if it has an item object, by
+        its name in lowercase (e.g. 'get diagnostic tool').
+
+        Args:
+            key: Short name of the item, as used in world files
+            item: The item object shared by every copy of the item, if any
+            points: Score for picking the item up
+            takeable: Whether 'get' can pick the item up
+            get_action: Name of a Player method to call for 'get' instead
+                of Player.pick_up(), e.g. 'pick_up_tool'
+            use_action: Name of a Player method called for 'use'; items
+                without one cannot be used
+            room_text: The line 'look' shows while the item is in a room.
+                Defaults to 'You see a <name> here.'; an empty string
+                shows nothing
+
+        Returns:
+            int: The item's id
+
+        Raises:
+            ValueError: If the key or the item's name is already registered
+        """
+        key = key.lower()
+        display_name = TEXT.share(item.name.lower() if item is not None else key)
+        if key in self._names or display_name in self._names:
+            raise ValueError(f"Item '{key}' is already registered")
+        item_id = len(self._keys)
+        self._keys.append(key)
+        self._ids[key] = item_id
+        self._names[key] = item_id
+        self._names[display_name] = item_id
+        self._items.append(item)
+        self._display_names.append(display_name)
+        self._points.append(points)
+        self._takeable.append(takeable)
+        self._get_actions.append(get_action)
+        self._use_actions.append(use_action)
+        if room_text is None:
+            room_text = f"You see a {display_name} here."
+        self._room_texts.append(TEXT.intern(room_text) if room_text else None)
+        return item_id
+
+    def id(self, key: str) -> int:
+        """
+        Get the id of an item from its key.
+
+        Raises:
+            KeyError: If no item has that key
+        """
+        return self._ids[key]
+
+    def lookup(self, name: str) -> Optional[int]:
+        """
+        Find the item a player typed.
+
+        Args:
+            name: The typed name in lowercase, either the key ('tool') or
+                the item's name ('diagnostic tool')
+
+        Returns:
+            The item's id, or None if no item has that name
+        """
+        return self._names.get(name)
+
+    def key(self, item_id: int) -> str:
+        return self._keys[item_id]
+
+    def item(self, item_id: int) -> Optional[StationItem]:
+        return self._items[item_id]
+
+    def display_name(self, item_id: int) -> str:
+        """The name used in messages, e.g. 'diagnostic tool'."""
+        return self._display_names[item_id]
+
+    def points(self, item_id: int) -> int:
+        return self._points[item_id]
+
+    def takeable(self, item_id: int) -> bool:
+        return self._takeable[item_id]
+
+    def get_action(self, item_id: int) -> Optional[str]:
+        return self._get_actions[item_id]
+
+    def use_action(self, item_id: int) -> Optional[str]:
+        return self._use_actions[item_id]
+
+    def room_text(self, item_id: int) -> Optional[int]:
+        """The TEXT id of the item's line in room descriptions, if any."""
+        return self._room_texts[item_id]
+
+
+# The items every world can use. Their ids must stay in this order, as
+# their bits are the WorldTemplate flags saved in snapshots.
+ITEMS = ItemRegistry()
+TOOL = ITEMS.register("tool", DiagnosticTool(), points=10,
+                      get_action="pick_up_tool", use_action="use_tool_on_droid",
+                      room_text="You see a diagnostic tool on the ground.")
+CRYSTAL = ITEMS.register("crystal", EnergyCrystal(), points=50,
+                         get_action="pick_up_crystal",
+                         room_text="A glowing energy crystal is placed on a pedestal.")
+# The droid's line depends on whether it is blocking, so describe() adds it
+DROID = ITEMS.register("droid", takeable=False, room_text="")
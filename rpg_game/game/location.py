@@ -2,11 +2,90 @@
 Module containing the Location class for the game's locations.
 """
 
+from typing import Dict, Iterable, Optional
+from .exit_gate import DROID_GATE, ExitGate
+from .item_registry import CRYSTAL, DROID, ITEMS, TOOL
+from .text_catalog import TEXT
+
+# Short forms the player can type instead of a full direction
+DIRECTION_ALIASES = {
+    "north": "n",
+    "east": "e",
+    "south": "s",
+    "west": "w",
+    "up": "u",
+    "down": "d",
+}
+
+
+def index_direction(directions: Dict[str, str], direction: str) -> None:
+    """
+    Add a direction to a lookup of typed text -> exit direction.
+
+    The lowercase direction always maps to the exit. Its short form (e.g.
+    'e' for 'east') is only added if no real exit already uses it.
+
+    Args:
+        directions: The lookup to add to
+        direction: The exit direction as it was added (e.g. 'East')
+    """
+    normalized = direction.lower()
+    directions[normalized] = direction
+    alias = DIRECTION_ALIASES.get(normalized)
+    if alias is not None:
+        directions.setdefault(alias, direction)
+
+
+def droid_line(direction: str) -> str:
+    """Get the line describing a droid that blocks an exit."""
+    return TEXT.share(f"A damaged maintenance droid is blocking the {direction} exit.")
+
+
+def describe_room(name: str, description: str, items: int,
+                  blocked_exit: Optional[str], exits: Iterable[str]) -> str:
+    """
+    Build the text 'look' shows for a room.
+
+    Args:
+        name: The room's name
+        description: The room's description
+        items: The ids of the items in the room, as bits
+        blocked_exit: The exit the room's droid is blocking, if any
+        exits: The directions of the room's exits
+
+    Returns:
+        The room's name, description, item and droid lines, and exits
+    """
+    parts = [f"{name}\n{'-' * len(name)}\n{description}"]
+    item_id = 0
+    while items:
+        if items & 1:
+            line = ITEMS.room_text(item_id)
+            if line is not None:
+                parts.append(TEXT[line])
+        items >>= 1
+        item_id += 1
+    if blocked_exit is not None:
+        parts.append(droid_line(blocked_exit))
+    exit_list = ", ".join(exits)
+    if exit_list:
+        parts.append(f"Exits: {exit_list}")
+    return "\n\n".join(parts)
+
 
 class Location:
     """
     Represents a location in the game world that can contain items and connect to other locations.
+    
+    Attributes are stored in __slots__ rather than a per-instance dict to
+    keep each location small.
     """
+    __slots__ = (
+        '_name', '_description', '_exits', '_directions',
+        '_items', '_droid', '_gates',
+        '_version', '_described_version', '_described_blocked_exit',
+        '_described_text',
+    )
 
     def __init__(self, name: str, description: str):
         """
@@ -16,13 +95,14 @@ class Location:
             name: The name of the location
             description: A description of the location
         """
-        self._name = name
-        self._description = description
+        self._name = TEXT.share(name)
+        self._description = TEXT.share(description)
         self._exits = {}  # direction -> Location
-        self._has_tool = False
-        self._has_crystal = False
-        self._droid_present = False
+        self._directions = {}  # lowercase direction or alias -> direction
+        self._items = 0  # item ids in the room, as bits (see ItemRegistry)
         self._droid = None
+        self._gates = None  # exit direction -> ExitGate, once one is set
+        self._reset_describe_cache()
         
     @property
     def name(self) -> str:
@@ -36,29 +116,51 @@ class Location:
     def exits(self) -> dict:
         return self._exits
         
+    @property
+    def items(self) -> int:
+        """The ids of the items in the room, as bits (item id n is 1 << n)."""
+        return self._items
+
+    def has_item(self, item_id: int) -> bool:
+        return self._items >> item_id & 1 == 1
+
+    def set_item(self, item_id: int, present: bool) -> None:
+        """
+        Put an item in the room or take it out.
+
+        Args:
+            item_id: The item's id in ITEMS
+            present: Whether the item should be in the room
+        """
+        if present:
+            self._items |= 1 << item_id
+        else:
+            self._items &= ~(1 << item_id)
+        self._version += 1
+
     @property
     def has_tool(self) -> bool:
-        return self._has_tool
+        return self.has_item(TOOL)
         
     @has_tool.setter
     def has_tool(self, value: bool) -> None:
-        self._has_tool = value
+        self.set_item(TOOL, value)
         
     @property
     def has_crystal(self) -> bool:
-        return self._has_crystal
+        return self.has_item(CRYSTAL)
         
     @has_crystal.setter
     def has_crystal(self, value: bool) -> None:
-        self._has_crystal = value
+        self.set_item(CRYSTAL, value)
         
     @property
     def droid_present(self) -> bool:
-        return self._droid_present
+        return self.has_item(DROID)
         
     @droid_present.setter
     def droid_present(self, value: bool) -> None:
-        self._droid_present = value
+        self.set_item(DROID, value)
         
     @property
     def droid(self):
@@ -67,6 +169,20 @@ class Location:
     @droid.setter
     def droid(self, value):
         self._droid = value
+        self._version += 1
+
+    def _reset_describe_cache(self) -> None:
+        """
+        Start counting changes from zero and forget any cached description.
+
+        The version goes up every time the location changes, and describe()
+        only rebuilds its text when the version has moved on. Exits should
+        therefore be added with add_exit() rather than by editing exits.
+        """
+        self._version = 0
+        self._described_version = -1
+        self._described_blocked_exit = None
+        self._described_text = ""
     
     def add_exit(self, direction: str, other_location: 'Location') -> None:
         """
@@ -76,32 +192,127 @@ class Location:
             direction: The direction of the exit (e.g., 'north', 'east')
             other_location: The Location object this exit leads to
         """
-        self._exits[direction] = other_location
+        self.exits[direction] = other_location
+        index_direction(self._directions, direction)
+        self._version += 1
+    
+    def find_exit(self, direction: str) -> Optional[str]:
+        """
+        Find the exit matching a typed direction.
+        
+        Args:
+            direction: The direction in lowercase with no surrounding
+                spaces, either in full ('east') or short ('e')
+        
+        Returns:
+            The direction as stored in exits, or None if there is no exit
+        """
+        return self._directions.get(direction)
+    
+    def exit_gate(self, direction: str) -> Optional[ExitGate]:
+        """
+        Get the gate set on an exit, if any.
+        
+        Args:
+            direction: The exit's direction as stored in exits
+        
+        Returns:
+            The ExitGate, or None if the exit has none
+        """
+        gates = self._gates
+        if gates is None:
+            return None
+        return gates.get(direction)
+    
+    def set_exit_gate(self, direction: str, gate: Optional[ExitGate]) -> None:
+        """
+        Set or remove the gate on an exit.
+        
+        Args:
+            direction: The exit's direction as stored in exits
+            gate: The new gate, or None to remove it
+        """
+        if self._gates is None:
+            self._gates = {}
+        if gate is None:
+            self._gates.pop(direction, None)
+        else:
+            self._gates[direction] = gate
+    
+    def closed_by(self, player, direction: str) -> Optional[ExitGate]:
+        """
+        Find what stops a player taking an exit.
+        
+        The exit's own gate is checked first, then whether the location's
+        droid is blocking that exit.
+        
+        Args:
+            player: The Player trying the exit
+            direction: The exit's direction as stored in exits
+        
+        Returns:
+            The gate that stops the player (DROID_GATE for a droid), or
+            None if they can go
+        """
+        gate = self.exit_gate(direction)
+        if gate is not None and gate.check(player, self):
+            return gate
+        blocked_exit = self.blocked_exit()
+        if blocked_exit is not None and blocked_exit == direction.lower():
+            return DROID_GATE
+        return None
+    
+    def blocked_exit(self) -> Optional[str]:
+        """
+        Find the exit the location's droid is blocking.
+        
+        Returns:
+            The direction the droid guards (e.g. 'east'), or None if there
+            is no droid here or it has been repaired
+        """
+        droid = self.droid
+        if self.droid_present and droid is not None and droid.is_blocking():
+            return droid.guards
+        return None
     
     def describe(self) -> str:
         """
         Generate a description of the location and its contents.
         
+        The text is cached and only rebuilt after the location changes or
+        its droid is repaired.
+        
         Returns:
             A formatted string describing the location
         """
-        description = f"{self.name}\n{'-' * len(self.name)}\n{self.description}"
+        blocked_exit = self.blocked_exit()
+        if (self._described_version == self._version and
+                self._described_blocked_exit == blocked_exit):
+            return self._described_text
         
-        # Add information about items in the location
-        if self._has_tool:
-            description += "\n\nYou see a diagnostic tool on the ground."
-        if self._has_crystal:
-            description += "\n\nA glowing energy crystal is placed on a pedestal."
-        if self._droid_present and self._droid and self._droid.is_blocking():
-            description += "\n\nA damaged maintenance droid is blocking the east exit."
-        
-        # List available exits
-        if self._exits:
-            exits = ", ".join(self._exits.keys())
-            description += f"\n\nExits: {exits}"
+        description = describe_room(self.name, self.description, self.items,
+                                    blocked_exit, self.exits)
         
+        self._described_version = self._version
+        self._described_blocked_exit = blocked_exit
+        self._described_text = description
         return description
     
+    def remove_item(self, item_id: int) -> bool:
+        """
+        Remove an item from this location if present.
+        
+        Args:
+            item_id: The item's id in ITEMS
+        
+        Returns:
+            bool: True if the item was removed, False otherwise
+        """
+        if self.has_item(item_id):
+            self.set_item(item_id, False)
+            return True
+        return False
+    
     def remove_tool(self) -> bool:
         """
         Remove the tool from this location if present.
@@ -109,10 +320,7 @@ class Location:
         Returns:
             bool: True if a tool was removed, False otherwise
         """
-        if self._has_tool:
-            self._has_tool = False
-            return True
-        return False
+        return self.remove_item(TOOL)
     
     def remove_crystal(self) -> bool:
         """
@@ -121,10 +329,7 @@ class Location:
         Returns:
             bool: True if a crystal was removed, False otherwise
         """
-        if self._has_crystal:
-            self._has_crystal = False
-            return True
-        return False
+        return self.remove_item(CRYSTAL)
     
     def set_droid_present(self, is_present: bool, droid=None) -> None:
         """
@@ -134,6 +339,6 @@ class Location:
             is_present: Whether the droid should be present
             droid: The droid object (if any)
         """
-        self._droid_present = is_present
+        self.droid_present = is_present
         if is_present and droid:
-            self._droid = droid
+            self.droid = droid
@@ -0,0 +1,257 @@
+"""
+Module containing the Metrics class, which counts and times game commands.
+
+Metrics are optional. A GameController only records them when it is given
+a Metrics object, and otherwise skips the timing code altogether:
+
+    metrics = Metrics()
+    game = GameController(headless=True, metrics=metrics)
+    game.process_input("look")
+    metrics.snapshot()                      # as a dict
+    metrics.write_prometheus("game.prom")   # for a Prometheus scraper
+
+One Metrics object can be shared by many games, e.g. every session on a
+server.
+"""
+
+import os
+import time
+from bisect import bisect_left
+from typing import Dict, List
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (
+    0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005,
+    0.0001, 0.00025, 0.0005, 0.001, 0.01,
+)
+
+# The Player methods timed by instrument(). pick_up_tool and
+# pick_up_crystal call pick_up, so pick_up counts every item taken.
+PLAYER_ACTIONS = ("move", "pick_up", "pick_up_tool", "use_tool_on_droid",
+                  "pick_up_crystal")
+
+# The verb recorded for commands that are not recognised
+UNKNOWN_VERB = "unknown"
+
+_BUCKET_NANOSECONDS = [round(bound * 1e9) for bound in LATENCY_BUCKETS]
+
+
+class _Timings:
+    """A call count, total time and latency histogram for one name."""
+    __slots__ = ('count', 'total_ns', 'buckets', 'hazards', 'wins')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        # One count per bucket, plus one for anything slower than the last
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.hazards = 0
+        self.wins = 0
+
+    def add(self, elapsed_ns: int) -> None:
+        self.count += 1
+        self.total_ns += elapsed_ns
+        self.buckets[bisect_left(_BUCKET_NANOSECONDS, elapsed_ns)] += 1
+
+    def cumulative(self) -> List[int]:
+        """Running totals of the buckets, as Prometheus histograms use."""
+        totals = []
+        running = 0
+        for count in self.buckets:
+            running += count
+            totals.append(running)
+        return totals
+
+
+class Metrics:
+    """
+    Per-verb counts, latency histograms, hazards and wins for game commands.
+    """
+
+    def __init__(self):
+        """Initialize empty metrics."""
+        self._commands: Dict[str, _Timings] = {}
+        self._actions: Dict[str, _Timings] = {}
+        self._games_started = 0
+        self._games_won = 0
+
+    @property
+    def games_started(self) -> int:
+        return self._games_started
+
+    @property
+    def games_won(self) -> int:
+        return self._games_won
+
+    @property
+    def win_rate(self) -> float:
+        if not self._games_started:
+            return 0.0
+        return self._games_won / self._games_started
+
+    def record_game_started(self) -> None:
+        """Count a new game."""
+        self._games_started += 1
+
+    def record_command(self, verb: str, elapsed_ns: int,
+                       hazard_delta: int = 0, won: bool = False) -> None:
+        """
+        Record one processed command.
+
+        Args:
+            verb: The command's verb, or UNKNOWN_VERB
+            elapsed_ns: How long the command took, in nanoseconds
+            hazard_delta: How much the command raised the hazard count
+            won: Whether the command won the game; only the first
+                winning command of a game should pass True
+        """
+        timings = self._commands.get(verb)
+        if timings is None:
+            timings = self._commands[verb] = _Timings()
+        timings.add(elapsed_ns)
+        if hazard_delta > 0:
+            timings.hazards += hazard_delta
+        if won:
+            timings.wins += 1
+            self._games_won += 1
+
+    def record_action(self, action: str, elapsed_ns: int) -> None:
+        """
+        Record one call of a Player action method.
+
+        Args:
+            action: The method's name, e.g. 'move'
+            elapsed_ns: How long the call took, in nanoseconds
+        """
+        timings = self._actions.get(action)
+        if timings is None:
+            timings = self._actions[action] = _Timings()
+        timings.add(elapsed_ns)
+
+    def instrument(self, player) -> None:
+        """
+        Time a player's action methods.
+
+        Timed wrappers are stored on the player object itself, so players
+        that are not instrumented keep calling the plain methods.
+
+        Args:
+            player: The Player to instrument
+        """
+        for action in PLAYER_ACTIONS:
+            setattr(player, action, self._timed(action, getattr(player, action)))
+
+    def _timed(self, action: str, method):
+        """Wrap a bound method so each call is recorded under action."""
+        clock = time.perf_counter_ns
+        record = self.record_action
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                record(action, clock() - start)
+
+        return timed
+
+    def snapshot(self) -> dict:
+        """
+        Get every metric as plain data.
+
+        Returns:
+            dict: Commands and player actions by name (count, total
+            seconds, cumulative bucket counts by upper bound), plus hazards
+            and wins per verb and the overall win rate
+        """
+        def describe(timings: _Timings) -> dict:
+            bounds = [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+            return {
+                "count": timings.count,
+                "total_seconds": timings.total_ns / 1e9,
+                "buckets": dict(zip(bounds, timings.cumulative())),
+            }
+
+        commands = {}
+        for verb, timings in sorted(self._commands.items()):
+            commands[verb] = describe(timings)
+            commands[verb]["hazards"] = timings.hazards
+            commands[verb]["wins"] = timings.wins
+
+        return {
+            "commands": commands,
+            "actions": {
+                action: describe(timings)
+                for action, timings in sorted(self._actions.items())
+            },
+            "games_started": self._games_started,
+            "games_won": self._games_won,
+            "win_rate": self.win_rate,
+        }
+
+    def prometheus_text(self) -> str:
+        """
+        Format every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics, one sample per line
+        """
+        lines = []
+
+        def header(name, kind, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def histogram(name, label, timings_by_name):
+            for value, timings in sorted(timings_by_name.items()):
+                bounds = [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+                for bound, total in zip(bounds, timings.cumulative()):
+                    lines.append(
+                        f'{name}_bucket{{{label}="{value}",le="{bound}"}} {total}'
+                    )
+                lines.append(f'{name}_sum{{{label}="{value}"}} {timings.total_ns / 1e9!r}')
+                lines.append(f'{name}_count{{{label}="{value}"}} {timings.count}')
+
+        header("rpg_command_latency_seconds", "histogram",
+               "Time taken by process_input, by verb.")
+        histogram("rpg_command_latency_seconds", "verb", self._commands)
+
+        header("rpg_command_hazards_total", "counter",
+               "Hazard count increases caused by commands, by verb.")
+        for verb, timings in sorted(self._commands.items()):
+            lines.append(f'rpg_command_hazards_total{{verb="{verb}"}} {timings.hazards}')
+
+        header("rpg_player_action_latency_seconds", "histogram",
+               "Time taken by Player action methods, by action.")
+        histogram("rpg_player_action_latency_seconds", "action", self._actions)
+
+        header("rpg_games_started_total", "counter", "Games started.")
+        lines.append(f"rpg_games_started_total {self._games_started}")
+        header("rpg_games_won_total", "counter", "Games won.")
+        lines.append(f"rpg_games_won_total {self._games_won}")
+        header("rpg_win_rate", "gauge", "Fraction of started games that were won.")
+        lines.append(f"rpg_win_rate {self.win_rate!r}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """
+        Write the Prometheus text to a file, replacing it atomically so a
+        scraper never reads half a file.
+
+        Args:
+            path: The file to write, e.g. for node_exporter's textfile
+                collector
+        """
+        # Imported here as it is slow to import and only needed for writing
+        import tempfile
+
+        directory = os.path.dirname(os.path.abspath(path))
+        handle, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "w") as metrics_file:
+                metrics_file.write(self.prometheus_text())
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
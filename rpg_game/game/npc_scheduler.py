@@ -0,0 +1,87 @@
+"""
+Module containing the NpcScheduler class, which decides when NPCs act.
+
+Time is counted in ticks. Each NPC is kept in a heap ordered by the tick of
+its next turn, and advance() only pops the NPCs whose turn has come, so a
+tick costs time for the NPCs that act in it rather than for every NPC in
+the world. An NPC is anything with an act(now) method that returns the
+number of ticks until its next turn, or None to stop being scheduled:
+
+    scheduler = NpcScheduler()
+    scheduler.add(droid, 5)    # droid.act(5) is called at tick 5
+    scheduler.advance(10)      # run every turn due in the next 10 ticks
+
+One scheduler can hold the NPCs of many sessions; they then share its
+clock.
+"""
+
+import heapq
+from itertools import count
+from typing import List, Tuple
+
+
+class NpcScheduler:
+    """
+    A priority queue of NPC turns, keyed by the tick they are due.
+    """
+
+    def __init__(self):
+        """Initialize a scheduler at tick 0 with nothing scheduled."""
+        self._now = 0
+        # (due tick, order added, npc); the order keeps equal ticks first
+        # come, first served and means NPCs are never compared
+        self._queue: List[Tuple[int, int, object]] = []
+        self._order = count()
+
+    @property
+    def now(self) -> int:
+        return self._now
+
+    def __len__(self) -> int:
+        """The number of turns waiting to happen."""
+        return len(self._queue)
+
+    def add(self, npc, delay: int = 1) -> int:
+        """
+        Give an NPC a turn some ticks from now.
+
+        Args:
+            npc: The NPC, with an act(now) method
+            delay: How many ticks from now the turn happens (at least 1)
+
+        Returns:
+            int: The tick the turn is due
+        """
+        due = self._now + max(delay, 1)
+        heapq.heappush(self._queue, (due, next(self._order), npc))
+        return due
+
+    def advance(self, ticks: int = 1) -> int:
+        """
+        Move the clock on, letting every NPC act whose turn comes up.
+
+        Turns happen in order of their due tick. A turn can schedule
+        another turn inside the same advance(), which also happens if it
+        is due in time.
+
+        Args:
+            ticks: How many ticks to move on
+
+        Returns:
+            int: How many turns were taken
+        """
+        end = self._now + ticks
+        queue = self._queue
+        pop = heapq.heappop
+        push = heapq.heappush
+        order = self._order
+        turns = 0
+        while queue and queue[0][0] <= end:
+            due, _, npc = pop(queue)
+            self._now = due
+            delay = npc.act(due)
+            turns += 1
+            if delay is not None:
+                push(queue, (due + max(delay, 1), next(order), npc))
+        self._now = end
+        return turns
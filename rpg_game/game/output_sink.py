@@ -0,0 +1,143 @@
+"""
+Output sinks: the places game messages are written to.
+
+Every message the game shows goes to a sink's write() method. A sink may
+pass it on straight away or hold it until flush(), which the
+GameController calls once at the end of every command.
+"""
+
+from typing import Callable, Dict, List, Optional
+
+
+class OutputSink:
+    """
+    Base class for output sinks. It accepts messages and does nothing.
+    """
+    __slots__ = ()
+
+    def write(self, message: str) -> None:
+        """
+        Accept one message.
+
+        Args:
+            message: The text to show, without a trailing newline
+        """
+
+    def flush(self) -> None:
+        """Send on anything that is being held back."""
+
+
+class StdoutSink(OutputSink):
+    """
+    Prints each message to the terminal as soon as it is written.
+    """
+    __slots__ = ()
+
+    def write(self, message: str) -> None:
+        print(message)
+
+
+class NullSink(OutputSink):
+    """
+    Throws every message away, for games nobody is watching.
+    """
+    __slots__ = ()
+
+
+class BufferedSink(OutputSink):
+    """
+    Keeps every message in memory until it is read or cleared.
+    """
+    __slots__ = ('_messages',)
+
+    def __init__(self):
+        """Initialize an empty buffer."""
+        self._messages = []
+
+    @property
+    def messages(self) -> List[str]:
+        return self._messages
+
+    def write(self, message: str) -> None:
+        self._messages.append(message)
+
+    def getvalue(self) -> str:
+        """
+        Get everything written so far.
+
+        Returns:
+            str: The messages, one per line
+        """
+        return "\n".join(self._messages)
+
+    def clear(self) -> None:
+        """Forget every message written so far."""
+        self._messages = []
+
+
+class CallbackSink(OutputSink):
+    """
+    Passes each message to a function.
+    """
+    __slots__ = ('_callback',)
+
+    def __init__(self, callback: Callable[[str], None]):
+        """
+        Initialize the sink.
+
+        Args:
+            callback: The function to call with each message
+        """
+        self._callback = callback
+
+    def write(self, message: str) -> None:
+        self._callback(message)
+
+
+class SocketSink(OutputSink):
+    """
+    Collects messages and sends them over a connection in one go on flush().
+
+    Works with a socket (using sendall) or with anything that has a
+    write(bytes) method, such as an asyncio StreamWriter.
+
+    Given a table from ResponseCatalog.encoded(), a flush of one message in
+    the table (help, status and the like) sends its bytes as they are,
+    without joining or encoding anything.
+    """
+    __slots__ = ('_send', '_pending', '_terminator', '_encoding', '_encoded')
+
+    def __init__(self, connection, terminator: str = "\n",
+                 encoding: str = "utf-8",
+                 encoded: Optional[Dict[str, bytes]] = None):
+        """
+        Initialize the sink.
+
+        Args:
+            connection: A socket, or an object with a write(bytes) method
+            terminator: Text sent after each flushed group of messages
+            encoding: How text is turned into bytes
+            encoded: Messages already turned into bytes, terminator
+                included, made with the same terminator and encoding
+        """
+        send = getattr(connection, "sendall", None)
+        self._send = send if send is not None else connection.write
+        self._pending = []
+        self._terminator = terminator
+        self._encoding = encoding
+        self._encoded = encoded if encoded is not None else {}
+
+    def write(self, message: str) -> None:
+        self._pending.append(message)
+
+    def flush(self) -> None:
+        pending = self._pending
+        if pending:
+            self._pending = []
+            if len(pending) == 1:
+                data = self._encoded.get(pending[0])
+                if data is not None:
+                    self._send(data)
+                    return
+            text = "\n".join(pending) + self._terminator
+            self._send(text.encode(self._encoding))
@@ -5,12 +5,30 @@ Module containing the Player class for the game's player character.
 from typing import Tuple
 from .location import Location
 from .droid import DamagedMaintenanceDroid
+from .inventory import Inventory
+from .item_registry import CRYSTAL, ITEMS, TOOL
+from .output_sink import OutputSink, StdoutSink
+from .exit_gate import DROID_GATE
+from .response_catalog import RESPONSES, ResponseCatalog
+
+# Players print to the terminal until given another sink; StdoutSink holds
+# no state, so they all share this one
+_STDOUT = StdoutSink()
 
 
 class Player:
     """
     Represents the player in the game, tracking their state, inventory, and score.
+    
+    Attributes are stored in __slots__ to keep each player small. A
+    __dict__ slot is kept so single methods can still be replaced on one
+    player (as the tests do); it is only allocated if that happens.
     """
+    __slots__ = (
+        '_current_location', '_inventory', '_score',
+        '_hazard_count', '_output', '_responses', '__dict__',
+    )
+
     def __init__(self, starting_location: 'Location'):
         """
         Initialize a new player.
@@ -19,10 +37,11 @@ class Player:
             starting_location: The initial location of the player
         """
         self._current_location = starting_location
-        self._has_tool = False
-        self._has_crystal = False
+        self._inventory = Inventory()
         self._score = 0
         self._hazard_count = 0
+        self._output = _STDOUT
+        self._responses = RESPONSES
         
     @property
     def current_location(self) -> 'Location':
@@ -32,21 +51,31 @@ class Player:
     def current_location(self, value: 'Location') -> None:
         self._current_location = value
         
+    @property
+    def inventory(self) -> Inventory:
+        return self._inventory
+        
     @property
     def has_tool(self) -> bool:
-        return self._has_tool
+        return TOOL in self._inventory
         
     @has_tool.setter
     def has_tool(self, value: bool) -> None:
-        self._has_tool = value
+        if value:
+            self._inventory.add(TOOL)
+        else:
+            self._inventory.remove(TOOL)
         
     @property
     def has_crystal(self) -> bool:
-        return self._has_crystal
+        return CRYSTAL in self._inventory
         
     @has_crystal.setter
     def has_crystal(self, value: bool) -> None:
-        self._has_crystal = value
+        if value:
+            self._inventory.add(CRYSTAL)
+        else:
+            self._inventory.remove(CRYSTAL)
         
     @property
     def score(self) -> int:
@@ -63,6 +92,31 @@ class Player:
     @hazard_count.setter
     def hazard_count(self, value: int) -> None:
         self._hazard_count = value
+
+    @property
+    def output(self) -> OutputSink:
+        return self._output
+
+    @output.setter
+    def output(self, value: OutputSink) -> None:
+        self._output = value
+
+    @property
+    def responses(self) -> ResponseCatalog:
+        return self._responses
+
+    @responses.setter
+    def responses(self, value: ResponseCatalog) -> None:
+        self._responses = value
+
+    def _say(self, message: str) -> None:
+        """
+        Send a message to the player's output sink.
+
+        Args:
+            message: The text to show the player
+        """
+        self._output.write(message)
     
     def move(self, direction: str) -> bool:
         """
@@ -77,31 +131,48 @@ class Player:
         # Normalize the direction: trim whitespace and convert to lowercase
         normalized_direction = direction.strip().lower()
         
-        # Check if the direction is valid by looking for a case-insensitive match
-        matching_direction = None
-        for exit_dir in self.current_location.exits:
-            if exit_dir.lower() == normalized_direction:
-                matching_direction = exit_dir
-                break
+        # Look the direction up in the location's index of exits
+        matching_direction = self.current_location.find_exit(normalized_direction)
         
         if matching_direction is None:
-            print(f"There is no exit to the {direction}.")
+            self._say(self._responses.no_exit.format(direction=direction))
             return False
             
-        # Check if the droid is blocking the path (eastward movement only)
-        if (hasattr(self.current_location, 'droid_present') and 
-            self.current_location.droid_present and 
-            hasattr(self.current_location, 'droid') and 
-            self.current_location.droid and 
-            self.current_location.droid.is_blocking() and 
-            normalized_direction == 'east'):
-            print("A maintenance droid blocks your way!")
-            self.hazard_count += 1
+        # Check the exit's gate and any droid guarding it
+        gate = self.current_location.closed_by(self, matching_direction)
+        if gate is not None:
+            self._say(self._responses.droid_blocks if gate is DROID_GATE else gate.message)
+            if gate.hazard:
+                self.hazard_count += 1
             return False
             
         # Move to the new location
         self.current_location = self.current_location.exits[matching_direction]
-        print(f"You move {matching_direction} to {self.current_location.name}.")
+        self._say(self._responses.moved.format(direction=matching_direction,
+                                               room=self.current_location.name))
+        return True
+    
+    def pick_up(self, item_id: int) -> bool:
+        """
+        Attempt to pick up an item from the current location.
+        
+        Args:
+            item_id: The item's id in ITEMS
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        name = ITEMS.display_name(item_id)
+        if item_id in self._inventory:
+            self._say(self._responses.already_have.format(item=name))
+            return False
+        if not self.current_location.has_item(item_id):
+            self._say(self._responses.not_here.format(item=name))
+            return False
+        self.current_location.set_item(item_id, False)
+        self._inventory.add(item_id)
+        self.score += ITEMS.points(item_id)
+        self._say(self._responses.picked_up.format(item=name))
         return True
     
     def pick_up_tool(self) -> bool:
@@ -111,17 +182,7 @@ class Player:
         Returns:
             bool: True if successful, False otherwise
         """
-        if self.current_location.has_tool and not self.has_tool:
-            self.current_location.has_tool = False
-            self.has_tool = True
-            self.score += 10
-            print("You pick up the diagnostic tool.")
-            return True
-        elif self.has_tool:
-            print("You already have the diagnostic tool.")
-        else:
-            print("There is no diagnostic tool here.")
-        return False
+        return self.pick_up(TOOL)
     
     def use_tool_on_droid(self) -> bool:
         """
@@ -131,26 +192,25 @@ class Player:
             bool: True if successful, False otherwise
         """
         if not self.has_tool:
-            print("You don't have a diagnostic tool.")
+            self._say(self._responses.no_tool)
             return False
             
         if not (hasattr(self.current_location, 'droid_present') and self.current_location.droid_present):
-            print("There's no droid here to use the tool on.")
+            self._say(self._responses.no_droid)
             return False
             
         if not hasattr(self.current_location, 'droid') or self.current_location.droid is None:
-            print("There's no droid here to use the tool on.")
+            self._say(self._responses.no_droid)
             return False
             
         if not self.current_location.droid.is_blocking():
-            print("The droid is already repaired.")
+            self._say(self._responses.droid_already_repaired)
             return False
             
         self.current_location.droid.repair()
         self.current_location.droid_present = False  # Droid moves away after repair
         self.score += 20
-        print("You use the diagnostic tool on the droid. It beeps and powers up!")
-        print("The droid thanks you and moves out of the way.")
+        self._say(self._responses.droid_repaired)
         return True
     
     def pick_up_crystal(self) -> bool:
@@ -160,17 +220,7 @@ class Player:
         Returns:
             bool: True if successful, False otherwise
         """
-        if self.current_location.has_crystal and not self.has_crystal:
-            self.current_location.has_crystal = False
-            self.has_crystal = True
-            self.score += 50
-            print("You pick up the energy crystal.")
-            return True
-        elif self.has_crystal:
-            print("You already have the energy crystal.")
-        else:
-            print("There is no energy crystal here.")
-        return False
+        return self.pick_up(CRYSTAL)
     
     def get_status(self) -> Tuple[int, int]:
         """
@@ -180,3 +230,17 @@ class Player:
             tuple: A tuple containing (score, hazard_count)
         """
         return (self.score, self.hazard_count)
+
+    def reset(self, starting_location: 'Location') -> None:
+        """
+        Put the player back at the start with nothing collected.
+
+        The output sink is kept.
+
+        Args:
+            starting_location: The location to start again from
+        """
+        self._current_location = starting_location
+        self._inventory.clear()
+        self._score = 0
+        self._hazard_count = 0
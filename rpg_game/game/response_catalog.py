@@ -0,0 +1,202 @@
+"""
+Module containing the ResponseCatalog class, every message the game sends.
+
+Each response is prepared once, when the catalog is made: fixed texts such
+as the help block are joined into one string, and texts with blanks (e.g.
+'You move {direction} to {room}.') are kept ready for str.format. The
+status and inventory texts are also remembered once built, so bots asking
+for them over and over get the same string back.
+
+Another language only needs a catalog made with different texts, which
+costs nothing per message as the texts are looked up as attributes:
+
+    catalog = ResponseCatalog.load("responses_fr.json")
+    game = GameController(responses=catalog)
+
+A JSON catalog file maps response names (the keys of DEFAULT_RESPONSES)
+to texts; any name it leaves out keeps its English text.
+"""
+
+import json
+from typing import Dict, Optional, Tuple
+from .item_registry import ITEMS
+from .text_catalog import TEXT
+
+HELP_LINES = (
+    "",
+    "Available commands:",
+    "  help           - Show this help message",
+    "  look           - Look around the current location",
+    "  inventory      - Check your inventory",
+    "  go <direction> - Move in the specified direction (e.g., 'go east')",
+    "  get tool       - Pick up the diagnostic tool",
+    "  use tool       - Use the diagnostic tool on the droid",
+    "  get crystal    - Pick up the energy crystal",
+    "  status         - Check your score and hazard count",
+    "  win            - Complete the mission (if all objectives are met)",
+    "  n/e/s/w, l, i  - Shortcuts for go <direction>, look and inventory",
+)
+
+# Response name -> English text. Blanks in braces are filled in with
+# str.format when the response is sent.
+DEFAULT_RESPONSES = {
+    "unknown_command": "I don't understand that command. Type 'help' for a list of commands.",
+    "help": "\n".join(HELP_LINES),
+    "intro": "Welcome to Space Station Repair!\nType 'help' for a list of commands.\n\n",
+    "final": ("\nCongratulations! You've completed your mission!\n"
+              "Final Score: {score} (Hazards: {hazards})"),
+    "status": "\nScore: {score}\nHazards encountered: {hazards}",
+    "inventory_header": "\nInventory:",
+    "inventory_item": "- {name}",
+    "inventory_empty": "You're not carrying anything.",
+    "not_complete": "You haven't completed all the mission objectives yet!",
+    "wrong_room": "You need to be in the {room} to complete your mission!",
+    "need_crystal": "You need to retrieve the energy crystal first!",
+    "no_exit": "There is no exit to the {direction}.",
+    "moved": "You move {direction} to {room}.",
+    "droid_blocks": "A maintenance droid blocks your way!",
+    "already_have": "You already have the {item}.",
+    "not_here": "There is no {item} here.",
+    "picked_up": "You pick up the {item}.",
+    "no_tool": "You don't have a diagnostic tool.",
+    "no_droid": "There's no droid here to use the tool on.",
+    "droid_already_repaired": "The droid is already repaired.",
+    "droid_repaired": ("You use the diagnostic tool on the droid. It beeps and powers up!\n"
+                       "The droid thanks you and moves out of the way."),
+}
+
+# Responses with no blanks, which can be sent exactly as they are
+_FIXED = tuple(name for name, text in DEFAULT_RESPONSES.items() if "{" not in text)
+
+# Most status and inventory texts remembered before starting again
+MAX_REMEMBERED = 4096
+
+
+class ResponseCatalog:
+    """
+    The texts of every response, one attribute per name in DEFAULT_RESPONSES.
+    """
+
+    def __init__(self, texts: Optional[Dict[str, str]] = None):
+        """
+        Prepare every response.
+
+        Args:
+            texts: Texts to use instead of the English ones, by name
+
+        Raises:
+            ValueError: If a name is not a known response
+        """
+        merged = dict(DEFAULT_RESPONSES)
+        for name, text in (texts or {}).items():
+            if name not in DEFAULT_RESPONSES:
+                raise ValueError(f"Unknown response '{name}'")
+            merged[name] = text
+        for name, text in merged.items():
+            setattr(self, name, TEXT.share(text))
+        self._statuses: Dict[Tuple[int, int], str] = {}
+        self._inventories: Dict[int, str] = {}
+        # (terminator, encoding) -> text -> bytes, for encoded()
+        self._encodings: Dict[Tuple[str, str], Dict[str, bytes]] = {}
+
+    @classmethod
+    def load(cls, path: str) -> 'ResponseCatalog':
+        """
+        Make a catalog from a JSON file of response texts.
+
+        Args:
+            path: The file, mapping response names to texts
+
+        Returns:
+            ResponseCatalog: The catalog
+        """
+        with open(path, encoding="utf-8") as catalog_file:
+            return cls(json.load(catalog_file))
+
+    def status_text(self, score: int, hazards: int) -> str:
+        """
+        Get the status text for a score and hazard count.
+
+        Returns:
+            str: The same string every time for the same numbers
+        """
+        key = (score, hazards)
+        text = self._statuses.get(key)
+        if text is None:
+            text = self.status.format(score=score, hazards=hazards)
+            self._remember(self._statuses, key, text)
+        return text
+
+    def inventory_text(self, bits: int) -> str:
+        """
+        Get the inventory text for a set of items.
+
+        Args:
+            bits: The ids of the items carried, as bits
+
+        Returns:
+            str: The same string every time for the same items
+        """
+        text = self._inventories.get(bits)
+        if text is None:
+            lines = [self.inventory_header]
+            item_id = 0
+            remaining = bits
+            while remaining:
+                if remaining & 1:
+                    item = ITEMS.item(item_id)
+                    name = item.name if item is not None else ITEMS.key(item_id)
+                    lines.append(self.inventory_item.format(name=name))
+                remaining >>= 1
+                item_id += 1
+            if not bits:
+                lines.append(self.inventory_empty)
+            text = "\n".join(lines)
+            self._remember(self._inventories, bits, text)
+        return text
+
+    def encoded(self, terminator: str = "\n", encoding: str = "utf-8") -> Dict[str, bytes]:
+        """
+        Get the bytes a SocketSink sends for each prepared response.
+
+        The fixed responses are included from the start, and status and
+        inventory texts are added as they are built.
+
+        Args:
+            terminator: The text the sink adds after each response
+            encoding: How the sink turns text into bytes
+
+        Returns:
+            dict: Response text -> bytes, shared by every caller with the
+            same terminator and encoding
+        """
+        key = (terminator, encoding)
+        encoded = self._encodings.get(key)
+        if encoded is None:
+            encoded = self._encodings[key] = {}
+            self._encode_all(encoded, terminator, encoding)
+        return encoded
+
+    def _remember(self, memo: dict, key, text: str) -> None:
+        """Keep a built text, and its bytes for every encoded() table."""
+        if len(memo) >= MAX_REMEMBERED:
+            memo.clear()
+            for (terminator, encoding), encoded in self._encodings.items():
+                encoded.clear()
+                self._encode_all(encoded, terminator, encoding)
+        memo[key] = text
+        for (terminator, encoding), encoded in self._encodings.items():
+            encoded[text] = (text + terminator).encode(encoding)
+
+    def _encode_all(self, encoded: Dict[str, bytes], terminator: str,
+                    encoding: str) -> None:
+        """Fill an encoded() table with every text built so far."""
+        texts = [getattr(self, name) for name in _FIXED]
+        texts.extend(self._statuses.values())
+        texts.extend(self._inventories.values())
+        for text in texts:
+            encoded[text] = (text + terminator).encode(encoding)
+
+
+# The English catalog, used unless a game is given another
+RESPONSES = ResponseCatalog()
@@ -0,0 +1,287 @@
+"""
+Module containing the SessionLog class, an append-only record of one game.
+
+A log file starts with the magic bytes b'RPGL' and a format version, then
+holds a series of records. Each record is a type byte and a 32-bit payload
+length followed by the payload:
+
+    checkpoint  a snapshot of the whole game (see snapshot.py)
+    command     score change, hazard change, event bits, the player's room
+                afterwards, the keys of any other items taken and the
+                command text
+
+A game is rebuilt by restoring the last checkpoint and replaying only the
+commands logged after it. Records are collected in memory and written and
+fsynced in groups, so a crash loses at most the last unwritten group.
+A record cut short by a crash is cut off when the log is opened again.
+
+Version 1 logs, which stored payload lengths in 16 bits, and version 2
+logs, which had no record of items other than the tool and crystal, can
+still be recovered but not added to.
+"""
+
+import os
+import struct
+from typing import List, Optional, Tuple
+from .command_result import CommandResult
+from .item_registry import CRYSTAL, ITEMS, TOOL
+
+MAGIC = b"RPGL"
+LOG_VERSION = 3
+
+CHECKPOINT = 1
+COMMAND = 2
+
+# Bits describing what a command did
+MOVED = 1
+TOOK_TOOL = 2
+TOOK_CRYSTAL = 4
+REPAIRED_DROID = 8
+WON = 16
+TOOK_ITEM = 32  # took an item other than the tool or crystal
+
+_FILE_HEADER = struct.Struct("<4sB")
+# Record header layout for each log version
+_RECORD_HEADERS = {1: struct.Struct("<BH"), 2: struct.Struct("<BI"), 3: struct.Struct("<BI")}
+_RECORD_HEADER = _RECORD_HEADERS[LOG_VERSION]
+_COMMAND = struct.Struct("<iiBIH")  # ... then item keys and command
+_COMMAND_V2 = struct.Struct("<iiBI")  # ... then the command
+
+
+class SessionLog:
+    """
+    Records every command of one game, with regular checkpoints.
+    """
+
+    def __init__(self, path: str, game, checkpoint_every: int = 100,
+                 sync_every: int = 32):
+        """
+        Open (or create) a log and checkpoint the game's current state.
+
+        Args:
+            path: The log file
+            game: The GameController whose commands will be logged
+            checkpoint_every: Write a checkpoint after this many commands
+            sync_every: Write and fsync once this many records are waiting
+
+        Raises:
+            ValueError: If the file exists but is not a log this version
+                can add to
+        """
+        self._game = game
+        self._checkpoint_every = checkpoint_every
+        self._sync_every = sync_every
+        self._pending = []
+        self._since_checkpoint = 0
+        end = None
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "rb") as log_file:
+                version, _, end = _read_records(log_file.read())
+            if version != LOG_VERSION:
+                raise ValueError(f"Session log is version {version}; start a new log")
+        self._file = open(path, "ab")
+        if end is None:
+            self._file.write(_FILE_HEADER.pack(MAGIC, LOG_VERSION))
+        elif end < self._file.tell():
+            # Drop a record torn by a crash so new records follow whole ones
+            self._file.truncate(end)
+        self.checkpoint()
+        self.flush()
+
+    def process(self, command: str) -> CommandResult:
+        """
+        Run a command in the game and log what it changed.
+
+        Args:
+            command: The command, as it would be passed to process_input
+
+        Returns:
+            CommandResult: The result from the game
+        """
+        player = self._game.player
+        room = player.current_location
+        items_before = player.inventory.bits
+        droid = room.droid
+        droid_was_blocking = bool(droid and droid.is_blocking())
+
+        result = self._game.process_input(command)
+
+        events = 0
+        if player.current_location is not room:
+            events |= MOVED
+        taken_events, item_keys = _taken(items_before, player.inventory.bits)
+        events |= taken_events
+        if droid_was_blocking and not droid.is_blocking():
+            events |= REPAIRED_DROID
+        if result.won:
+            events |= WON
+
+        payload = _COMMAND.pack(
+            result.score_delta, result.hazard_delta, events,
+            player.current_location.index, len(item_keys)
+        ) + item_keys + command.encode("utf-8")
+        self._append(COMMAND, payload)
+
+        self._since_checkpoint += 1
+        if self._since_checkpoint >= self._checkpoint_every:
+            self.checkpoint()
+        return result
+
+    def checkpoint(self) -> None:
+        """Log a snapshot of the whole game."""
+        self._append(CHECKPOINT, self._game.snapshot())
+        self._since_checkpoint = 0
+
+    def _append(self, record_type: int, payload: bytes) -> None:
+        """Queue a record, writing the queue out once it is big enough."""
+        self._pending.append(_RECORD_HEADER.pack(record_type, len(payload)))
+        self._pending.append(payload)
+        if len(self._pending) >= self._sync_every * 2:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write every queued record and fsync the file."""
+        if self._pending:
+            self._file.write(b"".join(self._pending))
+            self._pending = []
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Write any queued records and close the file."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> 'SessionLog':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _taken(before: int, after: int) -> Tuple[int, bytes]:
+    """
+    Describe the items a command added to the inventory.
+
+    Args:
+        before: The inventory bits before the command
+        after: The inventory bits after it
+
+    Returns:
+        tuple: The TOOK_* event bits, and the keys of any items other than
+        the tool and crystal as comma-separated UTF-8
+    """
+    taken = after & ~before
+    events = 0
+    if taken >> TOOL & 1:
+        events |= TOOK_TOOL
+    if taken >> CRYSTAL & 1:
+        events |= TOOK_CRYSTAL
+    taken &= ~(1 << TOOL | 1 << CRYSTAL)
+    keys = []
+    item_id = 0
+    while taken:
+        if taken & 1:
+            keys.append(ITEMS.key(item_id))
+        taken >>= 1
+        item_id += 1
+    if keys:
+        events |= TOOK_ITEM
+    return events, ",".join(keys).encode("utf-8")
+
+
+def _read_records(data: bytes) -> Tuple[int, List[Tuple[int, bytes]], int]:
+    """
+    Split a log file into its complete records.
+
+    Args:
+        data: The whole file
+
+    Returns:
+        tuple: The log version, the (record type, payload) pairs, and the
+        offset just after the last complete record
+
+    Raises:
+        ValueError: If the data is not a session log
+    """
+    try:
+        magic, version = _FILE_HEADER.unpack_from(data)
+    except struct.error:
+        raise ValueError("File is not a session log") from None
+    record_header = _RECORD_HEADERS.get(version)
+    if magic != MAGIC or record_header is None:
+        raise ValueError("File is not a session log")
+
+    records = []
+    offset = _FILE_HEADER.size
+    while offset + record_header.size <= len(data):
+        record_type, length = record_header.unpack_from(data, offset)
+        start = offset + record_header.size
+        if start + length > len(data):
+            break
+        records.append((record_type, data[start:start + length]))
+        offset = start + length
+    return version, records, offset
+
+
+def recover(path: str, game) -> int:
+    """
+    Rebuild a game from its log.
+
+    The last checkpoint is restored, then the commands logged after it are
+    replayed and checked against what was logged. A record cut short by a
+    crash is ignored.
+
+    Args:
+        path: The log file
+        game: A GameController in the same world, ideally headless, to
+            rebuild the game into
+
+    Returns:
+        int: How many commands were replayed after the checkpoint
+
+    Raises:
+        ValueError: If the file is not a session log, has no checkpoint,
+            or a replayed command does not match its record
+    """
+    with open(path, "rb") as log_file:
+        data = log_file.read()
+    version, records, _ = _read_records(data)
+
+    last_checkpoint: Optional[bytes] = None
+    tail = []
+    for record_type, payload in records:
+        if record_type == CHECKPOINT:
+            last_checkpoint = payload
+            tail = []
+        elif record_type == COMMAND:
+            tail.append(payload)
+
+    if last_checkpoint is None:
+        raise ValueError("Session log has no checkpoint")
+    game.restore(last_checkpoint)
+
+    took = TOOK_TOOL | TOOK_CRYSTAL | TOOK_ITEM
+    player = game.player
+    for payload in tail:
+        if version >= 3:
+            score_delta, hazard_delta, events, room, keys_size = _COMMAND.unpack_from(payload)
+            start = _COMMAND.size + keys_size
+            item_keys = payload[_COMMAND.size:start]
+        else:
+            score_delta, hazard_delta, events, room = _COMMAND_V2.unpack_from(payload)
+            start = _COMMAND_V2.size
+            item_keys = None
+        command = payload[start:].decode("utf-8")
+        items_before = player.inventory.bits
+        result = game.process_input(command)
+        taken_events, taken_keys = _taken(items_before, player.inventory.bits)
+        if (result.score_delta != score_delta or
+                result.hazard_delta != hazard_delta or
+                result.won != bool(events & WON) or
+                player.current_location.index != room or
+                (item_keys is not None and
+                 (taken_events != events & took or taken_keys != item_keys))):
+            raise ValueError(f"Replaying '{command}' did not match the log")
+    return len(tail)
@@ -0,0 +1,171 @@
+"""
+Module containing the SessionPool class, which keeps many games by id.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+from .command_result import CommandResult
+from .game_controller import GameController
+from .metrics import Metrics
+from .output_sink import NullSink, OutputSink
+from .world_template import WorldTemplate
+
+# Shared by every pooled game that has nowhere to send its output
+_NO_OUTPUT = NullSink()
+
+
+class SessionPool:
+    """
+    Keeps games by session id, with a bounded number of them live.
+
+    A live session has its own headless GameController. When there are
+    more than max_live sessions, or a session has not been used for
+    idle_seconds and evict_idle() is called, it is saved as a snapshot and
+    its controller is kept as a spare. Opening the session again restores
+    the snapshot into a spare controller. New sessions also reuse spare
+    controllers, reset to the start of the world, so controllers are only
+    made when no spare is left.
+    """
+
+    def __init__(self, world: Optional[WorldTemplate] = None,
+                 max_live: int = 1000, idle_seconds: float = 300.0,
+                 max_spare: int = 64, metrics: Optional[Metrics] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize an empty pool.
+
+        Args:
+            world: The world every session is played in (defaults to the
+                space station)
+            max_live: Most sessions kept as live controllers
+            idle_seconds: How long a session may go unused before
+                evict_idle() saves it
+            max_spare: Most unused controllers kept for reuse
+            metrics: Passed on to every controller the pool makes
+            clock: Returns the current time in seconds
+
+        Raises:
+            ValueError: If max_live is below 1 or max_spare is negative
+        """
+        if max_live < 1:
+            raise ValueError("A session pool needs room for at least one live session")
+        if max_spare < 0:
+            raise ValueError("max_spare cannot be negative")
+        self._world = world
+        self._max_live = max_live
+        self._idle_seconds = idle_seconds
+        self._max_spare = max_spare
+        self._metrics = metrics
+        self._clock = clock
+        self._live = OrderedDict()  # session id -> (controller, last used)
+        self._saved: Dict[str, bytes] = {}  # session id -> snapshot
+        self._spare: List[GameController] = []
+
+    @property
+    def live_count(self) -> int:
+        return len(self._live)
+
+    @property
+    def saved_count(self) -> int:
+        return len(self._saved)
+
+    @property
+    def spare_count(self) -> int:
+        return len(self._spare)
+
+    def __len__(self) -> int:
+        return len(self._live) + len(self._saved)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._live or session_id in self._saved
+
+    def open(self, session_id: str,
+             output: Optional[OutputSink] = None) -> GameController:
+        """
+        Get the game for a session, starting or restoring it if needed.
+
+        Args:
+            session_id: The session's id
+            output: Where the game's messages should go (defaults to nowhere)
+
+        Returns:
+            GameController: The session's live game
+        """
+        entry = self._live.get(session_id)
+        if entry is not None:
+            game = entry[0]
+            self._live.move_to_end(session_id)
+        else:
+            saved = self._saved.pop(session_id, None)
+            game = self._take_controller(new_game=saved is None)
+            if saved is not None:
+                game.restore(saved)
+
+        if output is not None:
+            game.output = output
+        self._live[session_id] = (game, self._clock())
+        while len(self._live) > self._max_live:
+            self._save(next(iter(self._live)))
+        return game
+
+    def process(self, session_id: str, command: str) -> CommandResult:
+        """
+        Run a command in a session, opening it if needed.
+
+        Args:
+            session_id: The session's id
+            command: The command, as passed to process_input
+
+        Returns:
+            CommandResult: The result from the game
+        """
+        return self.open(session_id).process_input(command)
+
+    def close(self, session_id: str) -> None:
+        """
+        End a session for good, keeping its controller for reuse.
+
+        Args:
+            session_id: The session's id
+        """
+        self._saved.pop(session_id, None)
+        entry = self._live.pop(session_id, None)
+        if entry is not None:
+            self._release(entry[0])
+
+    def evict_idle(self) -> int:
+        """
+        Save every session that has been idle for too long.
+
+        Returns:
+            int: How many sessions were saved
+        """
+        cutoff = self._clock() - self._idle_seconds
+        idle = [session_id for session_id, (_, last_used) in self._live.items()
+                if last_used <= cutoff]
+        for session_id in idle:
+            self._save(session_id)
+        return len(idle)
+
+    def _save(self, session_id: str) -> None:
+        """Turn a live session into a snapshot and keep its controller."""
+        game, _ = self._live.pop(session_id)
+        self._saved[session_id] = game.snapshot()
+        self._release(game)
+
+    def _release(self, game: GameController) -> None:
+        """Keep a controller as a spare, if there is room."""
+        if len(self._spare) < self._max_spare:
+            game.output = _NO_OUTPUT
+            self._spare.append(game)
+
+    def _take_controller(self, new_game: bool) -> GameController:
+        """Get a spare controller, or make one if none are left."""
+        if not self._spare:
+            return GameController(headless=True, world=self._world,
+                                  output=_NO_OUTPUT, metrics=self._metrics)
+        game = self._spare.pop()
+        if new_game:
+            game.reset()
+        return game
@@ -0,0 +1,210 @@
+"""
+Functions for saving a game's state to compact bytes and restoring it.
+
+A snapshot is laid out as little-endian binary data:
+
+    header      magic b'RPGS', format version, player flag bits, world
+                fingerprint, player room, score, hazard count, the number
+                of room and droid entries that follow, and the size of
+                the inventory
+    inventory   the player's item bits, in as few bytes as they need
+    rooms       (room number, size, item bits) for each room changed in
+                this session
+    droids      (room number, droid state, size, guarded direction) for
+                each droid used this session; the direction is left empty
+                for droids guarding DEFAULT_GUARDS
+
+Item bits are stored with a size because a world may have thousands of
+item types; with only the built-in items they take one byte. Only the
+differences from the world template are stored, so a snapshot of a typical
+session is a few dozen bytes.
+
+Version 1 snapshots, which kept the tool and crystal in the player flags
+and one byte of flags per room, and version 2 snapshots, which did not
+keep the direction a droid guards, can still be restored.
+"""
+
+import struct
+
+from .droid import DEFAULT_GUARDS, DamagedMaintenanceDroid
+from .world_state import WorldLocation
+
+MAGIC = b"RPGS"
+SNAPSHOT_VERSION = 3
+
+# Bits in the player flags byte (HAS_TOOL and HAS_CRYSTAL are version 1 only)
+HAS_TOOL = 1
+HAS_CRYSTAL = 2
+WIN_BONUS_ADDED = 4
+LAST_COMMAND_WAS_WIN = 8
+
+# Droid states
+NO_DROID = 0
+DROID_BLOCKING = 1
+DROID_REPAIRED = 2
+
+_HEADER = struct.Struct("<4sBBIIiIIIH")
+_ROOM = struct.Struct("<IH")
+_ENTRY = struct.Struct("<IB")  # version 1 rooms, version 1 and 2 droids
+_DROID = struct.Struct("<IBB")
+_HEADER_V1 = struct.Struct("<4sBBIIiIII")
+
+
+def _item_bytes(bits: int) -> bytes:
+    """Encode item bits in as few little-endian bytes as possible."""
+    return bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+
+
+def take_snapshot(game) -> bytes:
+    """
+    Save the state of a game.
+
+    Args:
+        game: The GameController to save
+
+    Returns:
+        bytes: The encoded snapshot
+
+    Raises:
+        ValueError: If the player is not in one of the game's world rooms
+    """
+    player = game.player
+    location = player.current_location
+    if not isinstance(location, WorldLocation):
+        raise ValueError("Only games played in a WorldState can be saved")
+
+    player_flags = 0
+    if hasattr(game, '_win_bonus_added'):
+        player_flags |= WIN_BONUS_ADDED
+    if game.last_command_was_win:
+        player_flags |= LAST_COMMAND_WAS_WIN
+
+    world = game.world_state
+    rooms = world.changed_flags
+    droids = world.droids
+    inventory = _item_bytes(player.inventory.bits)
+    parts = [_HEADER.pack(
+        MAGIC, SNAPSHOT_VERSION, player_flags, game.world.fingerprint,
+        location.index, player.score, player.hazard_count,
+        len(rooms), len(droids), len(inventory)
+    ), inventory]
+    for index, flags in rooms.items():
+        flag_bytes = _item_bytes(flags)
+        parts.append(_ROOM.pack(index, len(flag_bytes)))
+        parts.append(flag_bytes)
+    for index, droid in droids.items():
+        guards = b""
+        if droid is None:
+            state = NO_DROID
+        else:
+            state = DROID_BLOCKING if droid.is_blocking() else DROID_REPAIRED
+            if droid.guards != DEFAULT_GUARDS:
+                guards = droid.guards.encode("utf-8")
+        parts.append(_DROID.pack(index, state, len(guards)))
+        parts.append(guards)
+    return b"".join(parts)
+
+
+def restore_snapshot(game, data: bytes) -> None:
+    """
+    Put a game back into the state saved in a snapshot.
+
+    The game is first reset to the start of its world, reusing its
+    objects, then the saved changes are applied on top.
+
+    Args:
+        game: The GameController to restore, using the same world as the
+            game the snapshot was taken from
+        data: The encoded snapshot
+
+    Raises:
+        ValueError: If the data is not a snapshot, is from an unsupported
+            version, was taken in a different world or is corrupt; the
+            game is then left as it was
+    """
+    # The version byte follows the magic, and decides the header layout
+    header = _HEADER_V1 if data[4:5] == b"\x01" else _HEADER
+    try:
+        (magic, version, player_flags, fingerprint, room, score, hazards,
+         room_count, droid_count, *inventory_size) = header.unpack_from(data)
+    except struct.error:
+        raise ValueError("Snapshot is too short") from None
+    if magic != MAGIC:
+        raise ValueError("Data is not a game snapshot")
+    if version not in (1, 2, SNAPSHOT_VERSION):
+        raise ValueError(f"Unsupported snapshot version {version}")
+    if fingerprint != game.world.fingerprint or room >= len(game.world):
+        raise ValueError("Snapshot was taken in a different world")
+
+    # Read and check every entry before changing the game, so a bad
+    # snapshot leaves it as it was
+    room_total = len(game.world)
+    offset = header.size
+    try:
+        if version == 1:
+            inventory = player_flags & (HAS_TOOL | HAS_CRYSTAL)
+            rooms = [_ENTRY.unpack_from(data, offset + i * _ENTRY.size)
+                     for i in range(room_count)]
+            offset += room_count * _ENTRY.size
+        else:
+            end = offset + inventory_size[0]
+            inventory = int.from_bytes(data[offset:end], "little")
+            offset = end
+            rooms = []
+            for _ in range(room_count):
+                index, size = _ROOM.unpack_from(data, offset)
+                offset += _ROOM.size
+                rooms.append((index, int.from_bytes(data[offset:offset + size], "little")))
+                offset += size
+        if version < 3:
+            if len(data) != offset + droid_count * _ENTRY.size:
+                raise ValueError("Snapshot has the wrong length")
+            droids = [(index, state, DEFAULT_GUARDS)
+                      for index, state in _ENTRY.iter_unpack(data[offset:])]
+        else:
+            droids = []
+            for _ in range(droid_count):
+                index, state, size = _DROID.unpack_from(data, offset)
+                offset += _DROID.size
+                guards = data[offset:offset + size].decode("utf-8") or DEFAULT_GUARDS
+                offset += size
+                droids.append((index, state, guards))
+            if len(data) != offset:
+                raise ValueError("Snapshot has the wrong length")
+    except (struct.error, UnicodeDecodeError):
+        raise ValueError("Snapshot has the wrong length") from None
+    for index, _ in rooms:
+        if index >= room_total:
+            raise ValueError(f"Snapshot names room {index}, which is not in the world")
+    for index, state, _ in droids:
+        if index >= room_total:
+            raise ValueError(f"Snapshot names room {index}, which is not in the world")
+        if state not in (NO_DROID, DROID_BLOCKING, DROID_REPAIRED):
+            raise ValueError(f"Snapshot has unknown droid state {state}")
+
+    game._restart()
+    world = game.world_state
+    for index, flags in rooms:
+        world.set_flags(index, flags)
+    for index, state, guards in droids:
+        if state == NO_DROID:
+            world.set_droid(index, None)
+            continue
+        droid = world.droid(index)
+        if droid is None:
+            droid = DamagedMaintenanceDroid(guards)
+            world.set_droid(index, droid)
+        droid.guards = guards
+        droid.blocking = state == DROID_BLOCKING
+    game.droid = game.maintenance_tunnels.droid
+
+    player = game.player
+    player.current_location = world.location(room)
+    player.inventory.bits = inventory
+    player.score = score
+    player.hazard_count = hazards
+    game.last_command_was_win = bool(player_flags & LAST_COMMAND_WAS_WIN)
+    if player_flags & WIN_BONUS_ADDED:
+        game._win_bonus_added = True
+    elif hasattr(game, '_win_bonus_added'):
+        del game._win_bonus_added
@@ -0,0 +1,293 @@
+"""
+Exhaustive search of every game state reachable in a world.
+
+A state is packed into one integer: the player's room in the high bits,
+then one bit each for carrying the tool, the crystal and each other kind
+of item the world holds, then one bit per item in the world saying
+whether it has been taken (or, for a droid, repaired). Score follows from these bits, so it is not stored, and
+bumping into a droid only raises the hazard count without changing the
+state, so it is never worth exploring.
+
+The search follows the same rules as Player and GameController:
+
+    get tool     takes a tool from the room, if the player has none
+    use tool     repairs a blocking droid in the room, if the player has a tool
+    get crystal  takes a crystal from the room, if the player has none
+    get <key>    takes another registered item, if the player has none of
+                 that kind, scoring its points
+    go <dir>     moves through an exit, unless a blocking droid guards it
+    win          wins in the goal room while carrying the crystal
+"""
+
+from collections import deque
+from typing import List, Optional
+from .droid import DEFAULT_GUARDS
+from .item_registry import ITEMS
+from .world_template import WorldTemplate
+
+HAS_TOOL = 1
+HAS_CRYSTAL = 2
+_FIRST_CARRY_BIT = 2
+
+TOOL_POINTS = 10
+REPAIR_POINTS = 20
+CRYSTAL_POINTS = 50
+WIN_POINTS = 30
+
+# Marks the single end state reached by a successful 'win'
+WON = -1
+
+
+class SolverReport:
+    """
+    The results of exploring a world with solve().
+    """
+
+    def __init__(self, winning_commands: Optional[List[str]], max_score: int,
+                 states: int, dead_ends: int, unreachable_items: List[str],
+                 truncated: bool):
+        """
+        Initialize a report.
+
+        Args:
+            winning_commands: The shortest command list that wins, or None
+            max_score: The highest final score of any winning game, or of
+                any reachable state if the world cannot be won
+            states: How many distinct states were explored
+            dead_ends: How many of them can no longer lead to a win
+            unreachable_items: Items that can never be taken or repaired,
+                as '<item key> in <room id>', e.g. 'tool in hall' or
+                'droid in lab'
+            truncated: True if the search stopped at max_states, in which
+                case the other figures only cover the states explored
+        """
+        self.winning_commands = winning_commands
+        self.max_score = max_score
+        self.states = states
+        self.dead_ends = dead_ends
+        self.unreachable_items = unreachable_items
+        self.truncated = truncated
+
+    @property
+    def winnable(self) -> bool:
+        return self.winning_commands is not None
+
+    def as_dict(self) -> dict:
+        """Return the report as a dict, e.g. for writing out as JSON."""
+        return {
+            "winnable": self.winnable,
+            "winning_commands": self.winning_commands,
+            "max_score": self.max_score,
+            "states": self.states,
+            "dead_ends": self.dead_ends,
+            "unreachable_items": self.unreachable_items,
+            "truncated": self.truncated,
+        }
+
+
+class _Rules:
+    """The world's items and exits laid out for fast state expansion."""
+
+    def __init__(self, template: WorldTemplate):
+        self.template = template
+        built_in = WorldTemplate.TOOL | WorldTemplate.CRYSTAL | WorldTemplate.DROID
+        # Other kinds of item in the world, each with a bit for carrying one
+        extras = 0
+        for room in range(len(template)):
+            extras |= template.flags(room) & ~built_in
+        self.carry_bit = {}  # item id -> bit set while carrying one
+        item_id = 0
+        while extras >> item_id:
+            if extras >> item_id & 1 and ITEMS.takeable(item_id):
+                if ITEMS.get_action(item_id) or ITEMS.use_action(item_id):
+                    raise ValueError(f"The solver has no rules for the item "
+                                     f"'{ITEMS.key(item_id)}'")
+                self.carry_bit[item_id] = 1 << (_FIRST_CARRY_BIT + len(self.carry_bit))
+            item_id += 1
+        self.first_item_bit = _FIRST_CARRY_BIT + len(self.carry_bit)
+        self.carried_points = [(bit, ITEMS.points(item_id))
+                               for item_id, bit in self.carry_bit.items()]
+
+        self.items = []  # (room, kind) for each item bit
+        self.tool_bit = [0] * len(template)
+        self.crystal_bit = [0] * len(template)
+        self.droid_bit = [0] * len(template)
+        # For each room, (command, item bit, carry bit) of its other items
+        self.extra_items = [()] * len(template)
+        for room in range(len(template)):
+            flags = template.flags(room)
+            for kind, flag, bits in (("tool", WorldTemplate.TOOL, self.tool_bit),
+                                     ("crystal", WorldTemplate.CRYSTAL, self.crystal_bit),
+                                     ("droid", WorldTemplate.DROID, self.droid_bit)):
+                if flags & flag:
+                    bits[room] = 1 << (self.first_item_bit + len(self.items))
+                    self.items.append((room, kind))
+            extras = []
+            for item_id, carry in self.carry_bit.items():
+                if flags >> item_id & 1:
+                    key = ITEMS.key(item_id)
+                    extras.append((f"get {key}",
+                                   1 << (self.first_item_bit + len(self.items)), carry))
+                    self.items.append((room, key))
+            if extras:
+                self.extra_items[room] = tuple(extras)
+        self.room_shift = self.first_item_bit + len(self.items)
+        self.item_mask = (1 << self.room_shift) - 1
+        self.repair_mask = sum(self.droid_bit)
+
+        # Exits as (command, target room, guarded by the room's droid)
+        self.exits = [
+            [(f"go {direction}", target, bool(self.droid_bit[room]) and
+              direction.lower() == DEFAULT_GUARDS)
+             for direction, target in template.exits(room)]
+            for room in range(len(template))
+        ]
+
+    def score(self, state: int) -> int:
+        """Work out the score a state is worth, before any win bonus."""
+        bits = state & self.item_mask
+        score = bin(bits & self.repair_mask).count("1") * REPAIR_POINTS
+        if bits & HAS_TOOL:
+            score += TOOL_POINTS
+        if bits & HAS_CRYSTAL:
+            score += CRYSTAL_POINTS
+        for carry, points in self.carried_points:
+            if bits & carry:
+                score += points
+        return score
+
+    def successors(self, state: int):
+        """Yield (command, next state) for every command that changes the state."""
+        room = state >> self.room_shift
+        bits = state & self.item_mask
+
+        tool = self.tool_bit[room]
+        if tool and not bits & tool and not bits & HAS_TOOL:
+            yield "get tool", state | tool | HAS_TOOL
+        droid = self.droid_bit[room]
+        if droid and not bits & droid and bits & HAS_TOOL:
+            yield "use tool", state | droid
+        crystal = self.crystal_bit[room]
+        if crystal and not bits & crystal and not bits & HAS_CRYSTAL:
+            yield "get crystal", state | crystal | HAS_CRYSTAL
+        for command, item, carry in self.extra_items[room]:
+            if not bits & item and not bits & carry:
+                yield command, state | item | carry
+        if room == self.template.goal and bits & HAS_CRYSTAL:
+            yield "win", WON
+        for command, target, guarded in self.exits[room]:
+            if guarded and not bits & droid:
+                continue
+            yield command, (target << self.room_shift) | bits
+
+
+def solve(template: WorldTemplate, max_states: int = 1000000) -> SolverReport:
+    """
+    Explore every state reachable from the start of a world.
+
+    States are explored breadth first, so the first win found is reached
+    by the fewest commands.
+
+    Args:
+        template: The world to explore
+        max_states: Stop after this many distinct states. Every explored
+            state is kept (with how it was reached) until the search ends,
+            so memory grows in step with this limit
+
+    Returns:
+        SolverReport: The shortest win, best score, dead ends and
+        unreachable items
+
+    Raises:
+        ValueError: If the world has exit gates, or an item with its own
+            get or use action, which the search has no rules for
+    """
+    if template.has_gates:
+        raise ValueError("The solver does not support worlds with exit gates")
+    rules = _Rules(template)
+    start = template.start << rules.room_shift
+    parents = {start: None}  # state -> (previous state, command)
+    order = [start]
+    queue = deque([start])
+    truncated = False
+    best_win_state = None
+
+    while queue:
+        state = queue.popleft()
+        for command, next_state in rules.successors(state):
+            if next_state == WON:
+                score = rules.score(state)
+                if best_win_state is None or score > rules.score(best_win_state):
+                    best_win_state = state
+                if WON not in parents:
+                    parents[WON] = (state, command)
+                continue
+            if next_state in parents:
+                continue
+            if len(order) >= max_states:
+                truncated = True
+                continue
+            parents[next_state] = (state, command)
+            order.append(next_state)
+            queue.append(next_state)
+
+    winning_commands = None
+    if WON in parents:
+        winning_commands = []
+        state = WON
+        while parents[state] is not None:
+            state, command = parents[state]
+            winning_commands.append(command)
+        winning_commands.reverse()
+
+    if best_win_state is not None:
+        max_score = rules.score(best_win_state) + WIN_POINTS
+    else:
+        max_score = max(rules.score(state) for state in order)
+
+    return SolverReport(
+        winning_commands=winning_commands,
+        max_score=max_score,
+        states=len(order),
+        dead_ends=_count_dead_ends(rules, order, parents),
+        unreachable_items=_unreachable_items(rules, order),
+        truncated=truncated,
+    )
+
+
+def _count_dead_ends(rules: _Rules, order: List[int], explored) -> int:
+    """
+    Count the explored states from which no win can be reached.
+
+    One breadth-first search runs backwards from the states that can win
+    straight away, over the reversed moves between explored states.
+    """
+    predecessors = {}  # state -> explored states with a move into it
+    can_win = set()
+    queue = deque()
+    for state in order:
+        for _, next_state in rules.successors(state):
+            if next_state == WON:
+                if state not in can_win:
+                    can_win.add(state)
+                    queue.append(state)
+            elif next_state in explored:
+                predecessors.setdefault(next_state, []).append(state)
+    while queue:
+        for previous in predecessors.get(queue.popleft(), ()):
+            if previous not in can_win:
+                can_win.add(previous)
+                queue.append(previous)
+    return len(order) - len(can_win)
+
+
+def _unreachable_items(rules: _Rules, order: List[int]) -> List[str]:
+    """List the items that are never taken or repaired in any explored state."""
+    used = 0
+    for state in order:
+        used |= state
+    return [
+        f"{kind} in {rules.template.room_ids[room]}"
+        for position, (room, kind) in enumerate(rules.items)
+        if not used & (1 << (rules.first_item_bit + position))
+    ]
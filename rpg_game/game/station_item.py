@@ -2,20 +2,42 @@
 Module containing the base StationItem class for all game items.
 """
 
+from typing import Optional
+from .text_catalog import TEXT
+
+
 class StationItem:
     """
     Base class for all items in the game that can be picked up by the player.
+    
+    An item's text is kept in the shared TEXT catalog, so items of the same
+    kind all point to one copy of it, and examine() never builds a string.
     """
-    def __init__(self, name: str, description: str):
+    __slots__ = ('_name', '_description', '_examine_text')
+
+    def __init__(self, name: str, description: str,
+                 examine_text: Optional[str] = None):
         """
         Initialize a new station item.
         
         Args:
             name: The name of the item
             description: A description of the item
+            examine_text: What examine() returns (defaults to the description)
         """
-        self._name = name
-        self._description = description
+        self._name = TEXT.share(name)
+        self._description = TEXT.share(description)
+        self._examine_text = TEXT.share(
+            description if examine_text is None else examine_text
+        )
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return self._description
     
     def examine(self) -> str:
         """
@@ -24,4 +46,4 @@ class StationItem:
         Returns:
             A string describing the item
         """
-        return self._description
+        return self._examine_text
@@ -0,0 +1,73 @@
+"""
+Module containing the TextCatalog class, a pool of the game's fixed text.
+
+Item names and descriptions, examine() texts, the lines look adds for
+items and droids, and room descriptions loaded from world files are all
+added to the one TEXT catalog. Each distinct text is then stored once per
+process however many objects or sessions use it, and can be referred to
+by a small id:
+
+    line = TEXT.intern("You see a diagnostic tool on the ground.")
+    TEXT[line]              # the text again
+    TEXT.share(text)        # the pooled copy of text, to keep instead
+
+The catalog has no size limit, on purpose: an id must keep naming its
+text for as long as the process runs, so nothing is ever dropped. It only
+grows with the fixed text of the items and worlds loaded, so text built
+per session (such as look output or messages with a score in them) must
+not be added to it.
+"""
+
+from typing import Dict, List
+
+
+class TextCatalog:
+    """
+    Gives each distinct text an id, and keeps one copy of it.
+    """
+
+    def __init__(self):
+        """Initialize an empty catalog."""
+        self._texts: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __contains__(self, text: str) -> bool:
+        return text in self._ids
+
+    def __getitem__(self, text_id: int) -> str:
+        return self._texts[text_id]
+
+    def intern(self, text: str) -> int:
+        """
+        Add a text if it is new.
+
+        Args:
+            text: The text
+
+        Returns:
+            int: The text's id, the same for every equal text
+        """
+        text_id = self._ids.get(text)
+        if text_id is None:
+            text_id = self._ids[text] = len(self._texts)
+            self._texts.append(text)
+        return text_id
+
+    def share(self, text: str) -> str:
+        """
+        Get the catalog's copy of a text, adding it if it is new.
+
+        Args:
+            text: The text
+
+        Returns:
+            str: An equal text, the same object for every equal text
+        """
+        return self._texts[self.intern(text)]
+
+
+# The catalog shared by the whole game
+TEXT = TextCatalog()
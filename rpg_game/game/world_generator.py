@@ -0,0 +1,249 @@
+"""
+Functions for generating large random worlds from a seed.
+
+Generated worlds are built around a spine: room i has an 'east' exit to
+room i + 1 and a 'west' exit back, from the start (room 0) to the goal
+(the last room). Extra exits ('north', 'south', 'up', 'down') lead back to
+random earlier rooms, so they never skip past a droid. Droids sit on the
+spine and block its east exits, the tool is placed before the first droid
+and the crystal anywhere, so every generated world can be won by walking
+east, picking everything up and repairing every droid on the way.
+
+The same arguments and seed always give the same world. Rooms are made
+one at a time, so a world can be written to a file without ever being
+held in memory:
+
+    template = generate_world(100000, seed=7, exit_degree=4, droids=50)
+    write_world("big.json", 1000000, seed=7)
+"""
+
+import gc
+import json
+import random
+from typing import Iterator, List, Optional, TextIO, Tuple
+
+from .text_catalog import TEXT
+from .world_template import WorldTemplate
+
+# Directions used for the extra exits, in the order they are added
+EXTRA_DIRECTIONS = ("north", "south", "up", "down")
+
+MIN_EXIT_DEGREE = 2
+MAX_EXIT_DEGREE = MIN_EXIT_DEGREE + len(EXTRA_DIRECTIONS)
+
+# Descriptions are picked from this list, so they are shared between rooms
+DESCRIPTIONS = tuple(map(TEXT.share, (
+    "A narrow corridor lined with humming conduits.",
+    "A storage bay stacked with empty supply crates.",
+    "A junction where flickering panels blink in the dark.",
+    "A cramped crawlspace thick with dust and cables.",
+    "An observation deck looking out over the stars.",
+    "A cold airlock antechamber with frosted walls.",
+    "A hydroponics room overgrown with wilting plants.",
+    "A workshop scattered with half-finished repairs.",
+)))
+
+# (name, description, exits, flags) for one room
+RoomData = Tuple[str, str, Tuple[Tuple[str, int], ...], int]
+
+
+def room_id(index: int) -> str:
+    """Get the id of a generated room from its number."""
+    return f"room_{index}"
+
+
+def iter_rooms(rooms: int, seed: int = 0, exit_degree: int = 2,
+               droids: int = 1, tool_room: Optional[int] = None,
+               crystal_room: Optional[int] = None) -> Iterator[RoomData]:
+    """
+    Generate a world's rooms one at a time.
+
+    Args:
+        rooms: How many rooms (at least 2)
+        seed: Seed for the random choices
+        exit_degree: Exits per room, from 2 (just the spine) to 6. Rooms
+            near the start may get fewer, as there are fewer rooms behind them
+        droids: How many spine exits are guarded by a droid
+        tool_room: Room number of the tool; it must not be past the first
+            droid. Defaults to a random room before the first droid.
+        crystal_room: Room number of the crystal; defaults to a random room
+
+    Yields:
+        tuple: (name, description, exits, flags) for each room in order,
+        where exits are (direction, room number) pairs
+
+    Raises:
+        ValueError: If the arguments cannot make a winnable world. This is
+            raised straight away, before any room is generated.
+    """
+    if rooms < 2:
+        raise ValueError("A generated world needs at least 2 rooms")
+    if not MIN_EXIT_DEGREE <= exit_degree <= MAX_EXIT_DEGREE:
+        raise ValueError(
+            f"exit_degree must be between {MIN_EXIT_DEGREE} and {MAX_EXIT_DEGREE}"
+        )
+    if not 0 <= droids < rooms:
+        raise ValueError(f"droids must be between 0 and {rooms - 1}")
+
+    rng = random.Random(seed)
+    gates = set(rng.sample(range(rooms - 1), droids))
+    first_gate = min(gates) if gates else rooms - 1
+    if tool_room is None:
+        tool_room = rng.randint(0, first_gate)
+    elif not 0 <= tool_room <= first_gate:
+        raise ValueError("The tool must be placed before the first droid")
+    if crystal_room is None:
+        crystal_room = rng.randrange(rooms)
+    elif not 0 <= crystal_room < rooms:
+        raise ValueError(f"crystal_room must be between 0 and {rooms - 1}")
+
+    # Flags of the few rooms that have any, so other rooms cost one lookup
+    room_flags = dict.fromkeys(gates, WorldTemplate.DROID)
+    room_flags[tool_room] = room_flags.get(tool_room, 0) | WorldTemplate.TOOL
+    room_flags[crystal_room] = (room_flags.get(crystal_room, 0) |
+                                WorldTemplate.CRYSTAL)
+
+    extra_directions = EXTRA_DIRECTIONS[:exit_degree - MIN_EXIT_DEGREE]
+    return _rooms(rooms, rng, extra_directions, room_flags)
+
+
+def _rooms(rooms: int, rng: random.Random, extra_directions: Tuple[str, ...],
+           room_flags: dict) -> Iterator[RoomData]:
+    """Make the rooms planned by iter_rooms(), one at a time."""
+    last = rooms - 1
+    choose = rng.random
+    description_count = len(DESCRIPTIONS)
+    for index in range(rooms):
+        if index == 0:
+            exits = (("east", 1),)
+        else:
+            exits = (("west", index - 1),)
+            if index < last:
+                exits = (("east", index + 1),) + exits
+            if extra_directions:
+                exits += tuple([(direction, int(choose() * index))
+                                for direction in extra_directions])
+        yield (f"Section {index}",
+               DESCRIPTIONS[int(choose() * description_count)],
+               exits, room_flags.get(index, 0))
+
+
+def generate_world(rooms: int, seed: int = 0, exit_degree: int = 2,
+                   droids: int = 1, tool_room: Optional[int] = None,
+                   crystal_room: Optional[int] = None) -> WorldTemplate:
+    """
+    Generate a world and compile it straight into a template.
+
+    Takes the same arguments as iter_rooms().
+
+    Returns:
+        WorldTemplate: The generated world, starting in room 0 with the
+        goal in the last room
+    """
+    names: List[str] = []
+    descriptions: List[str] = []
+    exits: List[Tuple[Tuple[str, int], ...]] = []
+    flags = bytearray()
+    add_name = names.append
+    add_description = descriptions.append
+    add_exits = exits.append
+    add_flags = flags.append
+
+    # Millions of new tuples would otherwise set off garbage collections
+    # over and over, none of which can free anything
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        for name, description, room_exits, room_flags in iter_rooms(
+                rooms, seed, exit_degree, droids, tool_room, crystal_room):
+            add_name(name)
+            add_description(description)
+            add_exits(room_exits)
+            add_flags(room_flags)
+
+        return WorldTemplate(
+            map(room_id, range(rooms)), names, descriptions, exits, flags,
+            start=0, goal=rooms - 1,
+            source_hash=f"generated:{rooms}:{seed}:{exit_degree}:{droids}"
+        )
+    finally:
+        if collecting:
+            gc.enable()
+
+
+def write_world(path_or_file, rooms: int, seed: int = 0, **options) -> None:
+    """
+    Write a generated world as a world definition file for load_world().
+
+    Rooms are written as they are generated, so memory use stays flat
+    however big the world is.
+
+    Args:
+        path_or_file: A file name, or a file opened for writing text
+        rooms: How many rooms
+        seed: Seed for the random choices
+        **options: Any other iter_rooms() arguments
+    """
+    generated = iter_rooms(rooms, seed, **options)
+    if isinstance(path_or_file, str):
+        with open(path_or_file, "w") as world_file:
+            _write_rooms(world_file, rooms, generated)
+    else:
+        _write_rooms(path_or_file, rooms, generated)
+
+
+def _write_rooms(world_file: TextIO, rooms: int,
+                 generated: Iterator[RoomData]) -> None:
+    """Stream the JSON for a generated world to an open file."""
+    # Generated text is plain, so only the descriptions need JSON escaping,
+    # and there are only a few of them
+    quoted = {description: json.dumps(description) for description in DESCRIPTIONS}
+    world_file.write('{"start": "%s", "goal": "%s", "rooms": {'
+                     % (room_id(0), room_id(rooms - 1)))
+    separator = "\n"
+    for index, (name, description, exits, flags) in enumerate(generated):
+        exit_text = ", ".join(
+            f'"{direction}": "room_{target}"' for direction, target in exits
+        )
+        items = ""
+        if flags & WorldTemplate.TOOL:
+            items += ', "tool": true'
+        if flags & WorldTemplate.CRYSTAL:
+            items += ', "crystal": true'
+        if flags & WorldTemplate.DROID:
+            items += ', "droid": true'
+        world_file.write(
+            f'{separator}"room_{index}": {{"name": "{name}", '
+            f'"description": {quoted[description]}, '
+            f'"exits": {{{exit_text}}}{items}}}'
+        )
+        separator = ",\n"
+    world_file.write("\n}}\n")
+
+
+def spine_commands(template: WorldTemplate) -> List[str]:
+    """
+    List the commands that win a generated world by walking its spine.
+
+    Only works for worlds made by this module, where every room's 'east'
+    exit leads one step closer to the goal.
+
+    Args:
+        template: A generated world
+
+    Returns:
+        list: The commands, ending with 'win'
+    """
+    commands = []
+    for room in range(len(template)):
+        flags = template.flags(room)
+        if flags & WorldTemplate.TOOL:
+            commands.append("get tool")
+        if flags & WorldTemplate.CRYSTAL:
+            commands.append("get crystal")
+        if flags & WorldTemplate.DROID:
+            commands.append("use tool")
+        if room != template.goal:
+            commands.append("go east")
+    commands.append("win")
+    return commands
@@ -0,0 +1,275 @@
+"""
+Functions for loading world definition files into WorldTemplate objects.
+
+A world file is JSON of the form:
+
+    {
+        "start": "maintenance_tunnels",
+        "goal": "docking_bay",
+        "rooms": {
+            "maintenance_tunnels": {
+                "name": "Maintenance Tunnels",
+                "description": "...",
+                "exits": {"east": "docking_bay"},
+                "tool": true,
+                "droid": true,
+                "items": ["keycard"],
+                "gates": {"north": {"item": "keycard"}}
+            },
+            ...
+        }
+    }
+
+"tool", "crystal" and "droid" place the built-in items; "items" lists
+the keys of any other items registered in ITEMS. "gates" puts a rule on
+some of a room's exits: {"item": key} needs the player to carry an item,
+{"score": n} needs a score of at least n, and {"blocked": true} is always
+closed. Any gate can also give the "message" the player is told.
+
+Compiled templates are cached in memory, and optionally on disk, using the
+SHA-256 hash of the file contents as the key, so each world file is only
+parsed once.
+"""
+
+import hashlib
+import json
+import os
+from typing import Optional
+
+from .item_registry import ITEMS
+from .exit_gate import ExitGate, ItemGate, ScoreGate
+from .text_catalog import TEXT
+from .world_template import WorldTemplate
+
+# The world used when a GameController is created without one
+DEFAULT_WORLD_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "worlds", "space_station.json"
+)
+
+# Environment variable naming a directory for the on-disk template cache
+CACHE_DIR_ENV = "RPG_GAME_CACHE_DIR"
+
+# Bump this whenever WorldTemplate changes so old cache files are ignored
+CACHE_FORMAT_VERSION = 6
+
+_templates = {}  # file hash -> WorldTemplate
+_files = {}  # path -> (modification time, size, WorldTemplate)
+_default_world = None  # the template of DEFAULT_WORLD_PATH, once loaded
+
+
+def compile_gate(spec: dict, where: str) -> ExitGate:
+    """
+    Build an exit gate from its definition in a world file.
+
+    Args:
+        spec: The gate's definition, e.g. {"item": "keycard"}
+        where: Describes the exit, for error messages
+
+    Returns:
+        ExitGate: The gate
+
+    Raises:
+        ValueError: If the definition names an unknown item or no rule
+    """
+    message = spec.get("message")
+    if "item" in spec:
+        key = spec["item"]
+        if key not in ITEMS:
+            raise ValueError(f"Unknown item '{key}' in gate of {where}")
+        return ItemGate(ITEMS.id(key), message)
+    if "score" in spec:
+        return ScoreGate(int(spec["score"]), message)
+    if spec.get("blocked"):
+        return ExitGate(message) if message else ExitGate()
+    raise ValueError(f"Gate of {where} has no rule")
+
+
+def compile_world(data: dict, source_hash: str = "") -> WorldTemplate:
+    """
+    Check a parsed world definition and compile it into a template.
+
+    Args:
+        data: The world definition, as loaded from JSON
+        source_hash: Hash of the file the definition came from, if any
+
+    Returns:
+        WorldTemplate: The compiled world
+
+    Raises:
+        ValueError: If the definition is missing rooms, refers to a room,
+            exit or item that does not exist, or has a gate with no rule
+    """
+    rooms = data.get("rooms")
+    if not rooms:
+        raise ValueError("World definition has no rooms")
+
+    room_ids = list(rooms)
+    index = {room_id: i for i, room_id in enumerate(room_ids)}
+
+    def lookup(room_id, where):
+        if room_id not in index:
+            raise ValueError(f"Unknown room '{room_id}' in {where}")
+        return index[room_id]
+
+    names = []
+    descriptions = []
+    exits = []
+    flags = []
+    gates = {}
+    for room_id in room_ids:
+        room = rooms[room_id]
+        names.append(room.get("name", room_id))
+        # Rooms often share a description, so keep one copy of each
+        descriptions.append(TEXT.share(room.get("description", "")))
+        exits.append(tuple(
+            (direction, lookup(target, f"exits of '{room_id}'"))
+            for direction, target in room.get("exits", {}).items()
+        ))
+        room_flags = 0
+        if room.get("tool"):
+            room_flags |= WorldTemplate.TOOL
+        if room.get("crystal"):
+            room_flags |= WorldTemplate.CRYSTAL
+        if room.get("droid"):
+            room_flags |= WorldTemplate.DROID
+        for key in room.get("items", ()):
+            if key not in ITEMS:
+                raise ValueError(f"Unknown item '{key}' in room '{room_id}'")
+            room_flags |= 1 << ITEMS.id(key)
+        flags.append(room_flags)
+        room_gates = {}
+        for direction, spec in room.get("gates", {}).items():
+            where = f"exit '{direction}' of '{room_id}'"
+            if direction not in room.get("exits", {}):
+                raise ValueError(f"Unknown {where}")
+            room_gates[direction] = compile_gate(spec, where)
+        if room_gates:
+            gates[len(flags) - 1] = room_gates
+
+    return WorldTemplate(
+        room_ids, names, descriptions, exits, flags,
+        start=lookup(data.get("start", room_ids[0]), "start"),
+        goal=lookup(data.get("goal", room_ids[-1]), "goal"),
+        source_hash=source_hash, gates=gates
+    )
+
+
+def load_world(path: str = DEFAULT_WORLD_PATH,
+               cache_dir: Optional[str] = None) -> WorldTemplate:
+    """
+    Load a world file, reusing an already compiled template when possible.
+
+    A file already loaded is only read again if its modification time or
+    size has changed. Otherwise the template is looked up by the file's
+    hash, first in memory, then in the on-disk cache, and only compiled
+    from the JSON if neither has it.
+
+    Args:
+        path: The world definition file to load
+        cache_dir: Directory for the on-disk cache. Defaults to the
+            RPG_GAME_CACHE_DIR environment variable; if neither is set,
+            only the in-memory cache is used
+
+    Returns:
+        WorldTemplate: The compiled world
+    """
+    stat = os.stat(path)
+    loaded = _files.get(path)
+    if loaded is not None and loaded[:2] == (stat.st_mtime_ns, stat.st_size):
+        return loaded[2]
+
+    with open(path, "rb") as world_file:
+        raw = world_file.read()
+    source_hash = hashlib.sha256(raw).hexdigest()
+
+    template = _templates.get(source_hash)
+    if template is not None:
+        _files[path] = (stat.st_mtime_ns, stat.st_size, template)
+        return template
+
+    cache_dir = cache_dir or os.environ.get(CACHE_DIR_ENV)
+    cache_path = None
+    if cache_dir:
+        cache_path = os.path.join(
+            cache_dir, f"{source_hash}-v{CACHE_FORMAT_VERSION}.pickle"
+        )
+        template = _read_cache(cache_path)
+
+    if template is None:
+        template = compile_world(json.loads(raw.decode("utf-8")), source_hash)
+        if cache_path:
+            _write_cache(cache_path, template)
+
+    _templates[source_hash] = template
+    _files[path] = (stat.st_mtime_ns, stat.st_size, template)
+    return template
+
+
+def default_world() -> WorldTemplate:
+    """
+    Get the default world, loading it the first time it is asked for.
+
+    Later calls return the same template without touching the file, so
+    controllers made without a world cost no file system calls.
+
+    Returns:
+        WorldTemplate: The world in DEFAULT_WORLD_PATH
+    """
+    global _default_world
+    if _default_world is None:
+        _default_world = load_world()
+    return _default_world
+
+
+def clear_cache() -> None:
+    """Forget every template held in the in-memory cache."""
+    global _default_world
+    _templates.clear()
+    _files.clear()
+    _default_world = None
+
+
+def _item_keys() -> tuple:
+    """The keys of every registered item, in id order."""
+    return tuple(ITEMS.key(item_id) for item_id in range(len(ITEMS)))
+
+
+def _read_cache(cache_path: str) -> Optional[WorldTemplate]:
+    """
+    Load a template from the disk cache, or return None if unavailable.
+
+    Room flags and item gates hold item ids, which depend on the order
+    items were registered in. A template is only used if the items it was
+    compiled with have the same ids in this process.
+    """
+    # The disk cache is optional, so its modules are only imported when used
+    import pickle
+
+    try:
+        with open(cache_path, "rb") as cache_file:
+            item_keys, template = pickle.load(cache_file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError,
+            TypeError, ValueError):
+        return None
+    if _item_keys()[:len(item_keys)] != item_keys:
+        return None
+    return template
+
+
+def _write_cache(cache_path: str, template: WorldTemplate) -> None:
+    """Save a template to the disk cache, replacing the file atomically."""
+    import pickle
+    import tempfile
+
+    cache_dir = os.path.dirname(cache_path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(handle, "wb") as cache_file:
+            pickle.dump((_item_keys(), template), cache_file,
+                        pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        # The cache is only an optimisation, so carry on without it
+        pass
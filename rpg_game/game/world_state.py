@@ -0,0 +1,329 @@
+"""
+Module containing the WorldState class, one session's changes to a shared world.
+"""
+
+from typing import Dict, Optional
+from .droid import DamagedMaintenanceDroid
+from .exit_gate import ExitGate
+from .location import Location
+from .world_template import WorldTemplate
+
+
+class WorldState:
+    """
+    The parts of a world that one game session has changed.
+
+    Room names, descriptions and exits are read straight from the shared
+    WorldTemplate. Only rooms whose item flags differ from the template are
+    stored, in a small dictionary, and Location objects are created the
+    first time a room is reached. A session therefore costs memory for the
+    rooms it has touched, not for the whole world.
+    """
+    __slots__ = ('_template', '_flags', '_droids', '_locations')
+
+    def __init__(self, template: WorldTemplate):
+        """
+        Initialize a session that starts with the template's items.
+
+        Args:
+            template: The shared world this session is played in
+        """
+        self._template = template
+        self._flags = {}      # room number -> flags, only where changed
+        self._droids = {}     # room number -> droid, once it has been used
+        self._locations = {}  # room number -> WorldLocation, once reached
+
+    @property
+    def template(self) -> WorldTemplate:
+        return self._template
+
+    @property
+    def changed_flags(self) -> Dict[int, int]:
+        """The flags of every room that differs from the template."""
+        return dict(self._flags)
+
+    @property
+    def droids(self) -> Dict[int, Optional[DamagedMaintenanceDroid]]:
+        """The droid of every room whose droid has been used this session."""
+        return dict(self._droids)
+
+    def reset(self) -> None:
+        """
+        Undo every change made in this session.
+
+        Objects already made are kept for reuse: locations stay cached and
+        droids that start the world in a room are set back to blocking.
+        """
+        self._flags.clear()
+        for index, droid in list(self._droids.items()):
+            if droid is not None and self._template.flags(index) & WorldTemplate.DROID:
+                droid.blocking = True
+            else:
+                del self._droids[index]
+        for location in self._locations.values():
+            location.forget_session_exits()
+
+    def location(self, index: int) -> 'WorldLocation':
+        """
+        Get this session's Location for a room, creating it on first use.
+
+        Args:
+            index: The room number
+
+        Returns:
+            WorldLocation: The same object every time for the same room
+        """
+        location = self._locations.get(index)
+        if location is None:
+            location = WorldLocation(self, index)
+            self._locations[index] = location
+        return location
+
+    def flags(self, index: int) -> int:
+        """
+        Get the current item flags of a room (see ItemRegistry).
+
+        Args:
+            index: The room number
+
+        Returns:
+            int: The flags, from this session if changed, else the template
+        """
+        flags = self._flags.get(index)
+        if flags is None:
+            return self._template.flags(index)
+        return flags
+
+    def set_flag(self, index: int, flag: int, value: bool) -> None:
+        """
+        Turn one flag of a room on or off for this session.
+
+        Args:
+            index: The room number
+            flag: The bit of one item, e.g. WorldTemplate.TOOL
+            value: Whether the flag should be set
+        """
+        flags = self.flags(index)
+        self.set_flags(index, flags | flag if value else flags & ~flag)
+
+    def set_flags(self, index: int, flags: int) -> None:
+        """
+        Replace all the flags of a room for this session.
+
+        Args:
+            index: The room number
+            flags: The new item flags
+        """
+        if flags == self._template.flags(index):
+            self._flags.pop(index, None)
+        else:
+            self._flags[index] = flags
+
+    def droid(self, index: int) -> Optional[DamagedMaintenanceDroid]:
+        """
+        Get the droid belonging to a room, if it has one.
+
+        Rooms that start with a droid get their own droid object the first
+        time it is asked for.
+
+        Args:
+            index: The room number
+
+        Returns:
+            DamagedMaintenanceDroid or None
+        """
+        if index in self._droids:
+            return self._droids[index]
+        droid = None
+        if self._template.flags(index) & WorldTemplate.DROID:
+            droid = DamagedMaintenanceDroid()
+            self._droids[index] = droid
+        return droid
+
+    def set_droid(self, index: int, droid: Optional[DamagedMaintenanceDroid]) -> None:
+        """
+        Replace the droid belonging to a room.
+
+        Args:
+            index: The room number
+            droid: The new droid
+        """
+        self._droids[index] = droid
+
+    def place_droid(self, index: int, droid: DamagedMaintenanceDroid) -> None:
+        """
+        Put a droid in a room, replacing any droid already there.
+
+        Args:
+            index: The room number
+            droid: The droid
+        """
+        self._droids[index] = droid
+        self.set_flag(index, WorldTemplate.DROID, True)
+        self._changed(index)
+
+    def move_droid(self, source: int, target: int) -> bool:
+        """
+        Move the droid in one room to another room.
+
+        Args:
+            source: The room the droid is in
+            target: The room to move it to
+
+        Returns:
+            bool: True if it moved, False if the target already has a droid
+        """
+        droid_flag = WorldTemplate.DROID
+        target_flags = self.flags(target)
+        if target_flags & droid_flag:
+            return False
+        droid = self.droid(source)
+        self._droids[source] = None
+        self._droids[target] = droid
+        self.set_flags(source, self.flags(source) & ~droid_flag)
+        self.set_flags(target, target_flags | droid_flag)
+        if self._locations:
+            self._changed(source)
+            self._changed(target)
+        return True
+
+    def _changed(self, index: int) -> None:
+        """Tell a room's location, if it has been made, that it changed."""
+        location = self._locations.get(index)
+        if location is not None:
+            location.mark_changed()
+
+
+class WorldLocation(Location):
+    """
+    A Location whose contents are read from, and written to, a WorldState.
+
+    It behaves exactly like a Location, but holds no text or flags of its
+    own, only the session and room number it stands for.
+    """
+    __slots__ = ('_world', '_index')
+
+    def __init__(self, world: WorldState, index: int):
+        """
+        Initialize a location for one room of a session.
+
+        Args:
+            world: The session this location belongs to
+            index: The room number in the world template
+        """
+        # Location.__init__ is not called: everything it would store is
+        # read through the world instead.
+        self._world = world
+        self._index = index
+        self._exits = None  # built the first time the exits are needed
+        self._directions = None  # only exits added during this session
+        self._gates = None  # only gates set during this session
+        self._reset_describe_cache()
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def name(self) -> str:
+        return self._world.template.name(self._index)
+
+    @property
+    def description(self) -> str:
+        return self._world.template.description(self._index)
+
+    @property
+    def exits(self) -> dict:
+        if self._exits is None:
+            world = self._world
+            self._exits = {
+                direction: world.location(target)
+                for direction, target in world.template.exits(self._index)
+            }
+        return self._exits
+
+    def add_exit(self, direction: str, other_location: 'Location') -> None:
+        """Add an exit for this session only, on top of the template's exits."""
+        if self._directions is None:
+            self._directions = {}
+        super().add_exit(direction, other_location)
+
+    def mark_changed(self) -> None:
+        """Make describe() rebuild its text next time."""
+        self._version += 1
+
+    def forget_session_exits(self) -> None:
+        """
+        Drop exits and gates added this session and mark the location as
+        changed.
+        """
+        if self._directions is not None:
+            self._exits = None
+            self._directions = None
+        self._gates = None
+        self._version += 1
+
+    def describe(self) -> str:
+        """
+        Describe the room, sharing the text with every other session that
+        sees it in the same state.
+        """
+        if self._directions:
+            # Exits added this session are not in the shared text
+            return super().describe()
+        world = self._world
+        index = self._index
+        return world.template.describe(index, world.flags(index), self.blocked_exit())
+
+    def exit_gate(self, direction: str) -> Optional[ExitGate]:
+        """Get an exit's gate, from this session if set, else the template's."""
+        gates = self._gates
+        if gates is not None and direction in gates:
+            return gates[direction]
+        return self._world.template.exit_gate(self._index, direction)
+
+    def set_exit_gate(self, direction: str, gate: Optional[ExitGate]) -> None:
+        """Set or remove an exit's gate for this session only."""
+        if self._gates is None:
+            self._gates = {}
+        # None is kept, so it can hide a gate from the template
+        self._gates[direction] = gate
+
+    def blocked_exit(self) -> Optional[str]:
+        """Find the exit the room's droid is blocking, if any."""
+        world = self._world
+        if not world.flags(self._index) & WorldTemplate.DROID:
+            return None
+        droid = world.droid(self._index)
+        if droid is not None and droid.is_blocking():
+            return droid.guards
+        return None
+
+    def find_exit(self, direction: str) -> Optional[str]:
+        """Find an exit, checking this session's exits then the template's."""
+        if self._directions:
+            matching = self._directions.get(direction)
+            if matching is not None:
+                return matching
+        return self._world.template.find_exit(self._index, direction)
+
+    @property
+    def items(self) -> int:
+        return self._world.flags(self._index)
+
+    def has_item(self, item_id: int) -> bool:
+        return self._world.flags(self._index) >> item_id & 1 == 1
+
+    def set_item(self, item_id: int, present: bool) -> None:
+        """Put an item in the room or take it out, for this session only."""
+        self._world.set_flag(self._index, 1 << item_id, present)
+        self._version += 1
+
+    @property
+    def droid(self):
+        return self._world.droid(self._index)
+
+    @droid.setter
+    def droid(self, value):
+        self._world.set_droid(self._index, value)
+        self._version += 1
@@ -0,0 +1,204 @@
+"""
+Module containing the WorldTemplate class, a compiled and read-only game world.
+"""
+
+import zlib
+from operator import itemgetter
+from typing import Dict, Optional, Sequence, Tuple
+from . import item_registry
+from .exit_gate import ExitGate
+from .location import describe_room, index_direction
+
+_direction_of = itemgetter(0)
+
+
+class WorldTemplate:
+    """
+    A compiled game world that never changes once it has been built.
+
+    Rooms are numbered from 0, and everything about them is stored in
+    tuples indexed by room number. The starting items of each room are
+    packed into one integer of flags, with bit 1 << n set for item id n
+    of ITEMS. While every room's flags fit in a byte they are stored as
+    bytes, one byte per room. The text 'look' shows for a room is built
+    once per state of the room, keeping up to MAX_DESCRIBED of them.
+
+    A template is shared by every game played in it; each game keeps its
+    own changes in a WorldState.
+    """
+
+    # Bits of the built-in items in the per-room flags
+    TOOL = 1 << item_registry.TOOL
+    CRYSTAL = 1 << item_registry.CRYSTAL
+    DROID = 1 << item_registry.DROID
+
+    # Most 'look' texts kept by describe() before it starts again
+    MAX_DESCRIBED = 65536
+
+    def __init__(self, room_ids: Sequence[str], names: Sequence[str],
+                 descriptions: Sequence[str],
+                 exits: Sequence[Tuple[Tuple[str, int], ...]],
+                 flags: Sequence[int], start: int, goal: int,
+                 source_hash: str = "",
+                 gates: Optional[Dict[int, Dict[str, ExitGate]]] = None):
+        """
+        Initialize a new world template.
+
+        Args:
+            room_ids: The id of each room (e.g. 'docking_bay')
+            names: The display name of each room
+            descriptions: The description of each room
+            exits: For each room, its exits as (direction, room number) pairs
+            flags: For each room, the bits of the items it starts with
+            start: The room number the player starts in
+            goal: The room number the player must reach to win
+            source_hash: Hash of the file the world was loaded from, if any
+            gates: For the rooms that have any, their exit gates by
+                direction
+        """
+        self._room_ids = tuple(room_ids)
+        self._names = tuple(names)
+        self._descriptions = tuple(descriptions)
+        self._exits = tuple(tuple(room_exits) for room_exits in exits)
+        if not isinstance(flags, (bytes, bytearray)):
+            flags = tuple(flags)
+        try:
+            self._flags = bytes(flags)
+        except ValueError:
+            # Some room holds an item whose id is 8 or more
+            self._flags = flags
+        self._start = start
+        self._goal = goal
+        self._source_hash = source_hash
+        self._gates = dict(gates) if gates else {}
+        self._index = None  # room id -> number, built on first lookup
+        self._described = {}  # (room, flags, blocked exit) -> look text
+        self._fingerprint = zlib.crc32("\n".join(self._room_ids).encode("utf-8"))
+        # Rooms whose exits have the same directions share one lookup
+        shared = {}
+        directions = []
+        for room_exits in self._exits:
+            key = tuple(map(_direction_of, room_exits))
+            lookup = shared.get(key)
+            if lookup is None:
+                lookup = shared[key] = self._index_directions(room_exits)
+            directions.append(lookup)
+        self._directions = tuple(directions)
+
+    @staticmethod
+    def _index_directions(room_exits: Tuple[Tuple[str, int], ...]) -> dict:
+        """Build the typed-direction lookup for one room's exits."""
+        directions = {}
+        for direction, _ in room_exits:
+            index_direction(directions, direction)
+        return directions
+
+    @property
+    def room_ids(self) -> Tuple[str, ...]:
+        return self._room_ids
+
+    @property
+    def start(self) -> int:
+        return self._start
+
+    @property
+    def goal(self) -> int:
+        return self._goal
+
+    @property
+    def source_hash(self) -> str:
+        return self._source_hash
+
+    @property
+    def fingerprint(self) -> int:
+        """A 32-bit checksum of the room ids, used to match saved games."""
+        return self._fingerprint
+
+    def __len__(self) -> int:
+        return len(self._room_ids)
+
+    def room_index(self, room_id: str) -> int:
+        """
+        Look up a room's number from its id.
+
+        Args:
+            room_id: The id of the room
+
+        Returns:
+            int: The room number
+
+        Raises:
+            KeyError: If there is no room with that id
+        """
+        if self._index is None:
+            self._index = {room_id: i for i, room_id in enumerate(self._room_ids)}
+        return self._index[room_id]
+
+    def name(self, index: int) -> str:
+        return self._names[index]
+
+    def description(self, index: int) -> str:
+        return self._descriptions[index]
+
+    def exits(self, index: int) -> Tuple[Tuple[str, int], ...]:
+        return self._exits[index]
+
+    def flags(self, index: int) -> int:
+        return self._flags[index]
+
+    def describe(self, index: int, flags: int, blocked_exit: Optional[str]) -> str:
+        """
+        Get the text 'look' shows for a room, building it the first time
+        any session sees the room in this state.
+
+        Args:
+            index: The room number
+            flags: The room's current item flags
+            blocked_exit: The exit the room's droid is blocking, if any
+
+        Returns:
+            str: The same text object for every session in this state
+        """
+        key = (index, flags, blocked_exit)
+        text = self._described.get(key)
+        if text is None:
+            if len(self._described) >= self.MAX_DESCRIBED:
+                self._described.clear()
+            text = self._described[key] = describe_room(
+                self._names[index], self._descriptions[index], flags,
+                blocked_exit, map(_direction_of, self._exits[index])
+            )
+        return text
+
+    @property
+    def has_gates(self) -> bool:
+        return bool(self._gates)
+
+    def exit_gate(self, index: int, direction: str) -> Optional[ExitGate]:
+        """
+        Get the gate on one of a room's exits.
+
+        Args:
+            index: The room number
+            direction: The exit's direction as stored in exits
+
+        Returns:
+            The ExitGate, or None if the exit has none
+        """
+        room_gates = self._gates.get(index)
+        if room_gates is None:
+            return None
+        return room_gates.get(direction)
+
+    def find_exit(self, index: int, direction: str) -> Optional[str]:
+        """
+        Find the exit of a room matching a typed direction.
+
+        Args:
+            index: The room number
+            direction: The lowercase direction, in full or short form
+
+        Returns:
+            The exit's direction, or None if the room has no such exit
+        """
+        return self._directions[index].get(direction)
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Write a randomly generated world file, e.g. for load or scaling tests.
+
+    python -m rpg_game.generate_world 1000000 --seed 7 --exits 4 \
+        --droids 100 --output big_station.json
+
+The file can be played or checked like any other world file. The same
+options and seed always write the same world.
+"""
+import argparse
+import sys
+
+from .game.world_generator import MAX_EXIT_DEGREE, MIN_EXIT_DEGREE, write_world
+
+
+def main(argv=None) -> None:
+    """
+    Generate a world file from the command line.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+    """
+    parser = argparse.ArgumentParser(description="Generate a random world file.")
+    parser.add_argument("rooms", type=int, help="how many rooms to generate")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed for the random choices (default: 0)")
+    parser.add_argument("--exits", type=int, default=MIN_EXIT_DEGREE,
+                        help=f"exits per room, {MIN_EXIT_DEGREE} to "
+                             f"{MAX_EXIT_DEGREE} (default: {MIN_EXIT_DEGREE})")
+    parser.add_argument("--droids", type=int, default=1,
+                        help="exits guarded by a droid (default: 1)")
+    parser.add_argument("--output", metavar="FILE",
+                        help="write here instead of to standard output")
+    args = parser.parse_args(argv)
+
+    options = {"exit_degree": args.exits, "droids": args.droids}
+    try:
+        write_world(args.output or sys.stdout, args.rooms, args.seed, **options)
+    except ValueError as error:
+        parser.error(str(error))
+
+
+if __name__ == "__main__":
+    main()
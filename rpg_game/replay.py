@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Replay recorded command transcripts through headless game sessions.
+
+Each line of the input file is a JSON object describing one session:
+
+    {"session": "abc", "commands": ["get tool", "use tool", "go east"]}
+
+Every session gets its own GameController, and sessions are shared out
+across a pool of worker processes. One JSON result is written per session,
+in the same order as the input:
+
+    {"session": "abc", "status": [30, 0], "won": false, "commands": 3}
+
+Input is read and results are written a window at a time, so memory use
+stays the same however long the transcript file is.
+"""
+import argparse
+import json
+import multiprocessing
+import sys
+from itertools import islice
+from typing import Iterable, Iterator, Tuple
+
+from .game.game_controller import GameController
+
+
+def replay_session(numbered_line: Tuple[int, str]) -> dict:
+    """
+    Replay one transcript line in a fresh headless game.
+
+    Args:
+        numbered_line: The line number and the JSON text of the session.
+            The line number is used as the session id if none is given.
+
+    Returns:
+        dict: The session id, final (score, hazards) status, win flag and
+        number of commands that were run
+    """
+    line_number, line = numbered_line
+    session = json.loads(line)
+    game = GameController(headless=True)
+    results = game.run_commands(session.get("commands", []))
+    return {
+        "session": session.get("session", line_number),
+        "status": list(game.player.get_status()),
+        "won": bool(results) and results[-1].won,
+        "commands": len(results),
+    }
+
+
+def _numbered_sessions(lines: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """Pair each non-blank line with its 1-based line number."""
+    for line_number, line in enumerate(lines, start=1):
+        if line.strip():
+            yield line_number, line
+
+
+def replay(lines: Iterable[str], workers: int = 1,
+           chunksize: int = 64) -> Iterator[dict]:
+    """
+    Replay every session in a transcript, yielding results in input order.
+
+    Args:
+        lines: The transcript, one JSON session per line
+        workers: How many processes to use; 1 runs everything in this process
+        chunksize: How many sessions to send to a worker at a time
+
+    Yields:
+        dict: One result per session, as returned by replay_session
+    """
+    sessions = _numbered_sessions(lines)
+    if workers <= 1:
+        for numbered_line in sessions:
+            yield replay_session(numbered_line)
+        return
+
+    # Pool.imap reads its whole input up front, so hand it a bounded
+    # window of sessions at a time to keep memory flat.
+    window_size = workers * chunksize * 4
+    with multiprocessing.Pool(workers) as pool:
+        while True:
+            window = list(islice(sessions, window_size))
+            if not window:
+                break
+            for result in pool.imap(replay_session, window, chunksize):
+                yield result
+
+
+def main(argv=None) -> None:
+    """
+    Replay a transcript file from the command line.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+    """
+    parser = argparse.ArgumentParser(
+        description="Replay recorded game transcripts in headless sessions."
+    )
+    parser.add_argument("transcripts",
+                        help="JSONL file of sessions, or '-' for stdin")
+    parser.add_argument("-o", "--output", default="-",
+                        help="where to write JSONL results (default: stdout)")
+    parser.add_argument("-j", "--workers", type=int,
+                        default=multiprocessing.cpu_count(),
+                        help="number of worker processes")
+    parser.add_argument("--chunksize", type=int, default=64,
+                        help="sessions sent to a worker at a time")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.transcripts == "-" else open(args.transcripts)
+    target = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        for result in replay(source, args.workers, args.chunksize):
+            target.write(json.dumps(result) + "\n")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Serve the game to many players at once over TCP or a Unix socket.
+
+Every connection gets its own game, writing to a SocketSink, and all of
+them run on one asyncio event loop. Games are kept in a SessionPool, so
+controllers are reused between connections and idle players' games are
+saved as snapshots until they type again. The protocol is line based: the client
+sends one command per line, and the server answers each command with its
+messages followed by an empty line. The connection is closed once the
+player wins or sends 'quit'.
+
+    python -m rpg_game.server --port 4000
+    python -m rpg_game.server --unix /tmp/rpg_game.sock
+    python -m rpg_game.server --metrics /var/lib/node_exporter/rpg.prom
+"""
+import argparse
+import asyncio
+from itertools import count
+from typing import Optional
+
+from .game.metrics import Metrics
+from .game.output_sink import SocketSink
+from .game.response_catalog import RESPONSES
+from .game.session_pool import SessionPool
+from .game.world_template import WorldTemplate
+
+# Longest command line accepted from a client, in bytes
+MAX_LINE_LENGTH = 1024
+
+# Seconds between writes of the metrics file
+METRICS_INTERVAL = 15
+
+# Seconds between checks for idle sessions to save
+EVICT_INTERVAL = 60
+
+# Numbers the connections, to use as session ids
+_connection_numbers = count(1)
+
+
+async def handle_session(reader: asyncio.StreamReader,
+                         writer: asyncio.StreamWriter,
+                         world: Optional[WorldTemplate] = None,
+                         metrics: Optional[Metrics] = None,
+                         pool: Optional[SessionPool] = None) -> None:
+    """
+    Play one game with one connected client.
+
+    Args:
+        reader: The stream commands are read from
+        writer: The stream responses are written to
+        world: The world to play in (defaults to the space station)
+        metrics: Where to record command counts and timings, if anywhere
+        pool: The pool to keep the game in; by default the game gets a
+            pool of its own
+    """
+    if pool is None:
+        pool = SessionPool(world, metrics=metrics)
+    session_id = f"connection-{next(_connection_numbers)}"
+    # Everything a command says reaches the socket in one write, and the
+    # fixed responses are sent as bytes encoded once for every connection
+    output = SocketSink(writer, terminator="\n\n",
+                        encoded=RESPONSES.encoded("\n\n"))
+    game = pool.open(session_id, output)
+    try:
+        output.write(game.intro_text())
+        output.flush()
+        await writer.drain()
+
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                # The line was longer than MAX_LINE_LENGTH
+                break
+            if not line:
+                break
+            command = line.decode("utf-8", "replace").strip().lower()
+            if command == "quit":
+                break
+
+            # The pool may have saved this game while the player was idle,
+            # so ask for it again rather than keeping the controller
+            game = pool.open(session_id, output)
+            result = game.process_input(command)
+            if result.won:
+                output.write(game.final_text())
+                output.flush()
+            await writer.drain()
+            if result.won:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        pool.close(session_id)
+        writer.close()
+
+
+async def serve(host: str = "127.0.0.1", port: int = 4000,
+                unix_path: Optional[str] = None,
+                world: Optional[WorldTemplate] = None,
+                metrics: Optional[Metrics] = None,
+                pool: Optional[SessionPool] = None) -> asyncio.AbstractServer:
+    """
+    Start listening for players.
+
+    Args:
+        host: The address to listen on for TCP
+        port: The TCP port to listen on (0 picks a free one)
+        unix_path: If given, listen on this Unix socket instead of TCP
+        world: The world every session is played in
+        metrics: Shared by every session to record commands, if given
+        pool: The pool every session's game is kept in; by default a new
+            one is made
+
+    Returns:
+        The running asyncio server
+    """
+    if pool is None:
+        pool = SessionPool(world, metrics=metrics)
+
+    async def on_connect(reader, writer):
+        await handle_session(reader, writer, world, metrics, pool)
+
+    if unix_path:
+        return await asyncio.start_unix_server(
+            on_connect, unix_path, limit=MAX_LINE_LENGTH
+        )
+    return await asyncio.start_server(
+        on_connect, host, port, limit=MAX_LINE_LENGTH
+    )
+
+
+async def _write_metrics(metrics: Metrics, path: str) -> None:
+    """Write the metrics file every METRICS_INTERVAL seconds."""
+    while True:
+        await asyncio.sleep(METRICS_INTERVAL)
+        metrics.write_prometheus(path)
+
+
+async def _evict_idle(pool: SessionPool) -> None:
+    """Save idle sessions every EVICT_INTERVAL seconds."""
+    while True:
+        await asyncio.sleep(EVICT_INTERVAL)
+        pool.evict_idle()
+
+
+async def _run(args) -> None:
+    """Start the server and keep it running until interrupted."""
+    metrics = Metrics() if args.metrics else None
+    pool = SessionPool(max_live=args.max_live, idle_seconds=args.idle_seconds,
+                       metrics=metrics)
+    server = await serve(args.host, args.port, args.unix, metrics=metrics,
+                         pool=pool)
+    evict_task = asyncio.create_task(_evict_idle(pool))
+    if metrics is not None:
+        writer_task = asyncio.create_task(_write_metrics(metrics, args.metrics))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        evict_task.cancel()
+        if metrics is not None:
+            writer_task.cancel()
+            metrics.write_prometheus(args.metrics)
+
+
+def main(argv=None) -> None:
+    """
+    Run the game server from the command line.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+    """
+    parser = argparse.ArgumentParser(description="Serve the game over a socket.")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=4000,
+                        help="TCP port to listen on (default: 4000)")
+    parser.add_argument("--unix", metavar="PATH",
+                        help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--max-live", type=int, default=1000,
+                        help="most games kept in memory before the least "
+                             "recently used are saved (default: 1000)")
+    parser.add_argument("--idle-seconds", type=float, default=300,
+                        help="save games idle for this long (default: 300)")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="record command metrics and write them to FILE "
+                             "in Prometheus text format")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
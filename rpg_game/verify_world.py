@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Check that a world file can be won, before it is released.
+
+Every reachable game state is explored, and a JSON report is printed with
+the shortest winning commands, the best possible score, the number of dead
+ends and any items that can never be used:
+
+    python -m rpg_game.verify_world rpg_game/worlds/space_station.json
+
+The exit status is 1 if the world cannot be won, or if it was too big to
+explore completely within --max-states.
+"""
+import argparse
+import json
+import sys
+
+from .game.solver import solve
+from .game.world_loader import load_world
+
+
+def main(argv=None) -> int:
+    """
+    Check a world file from the command line.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        int: 0 if the world passed, 1 if not
+    """
+    parser = argparse.ArgumentParser(description="Check that a world can be won.")
+    parser.add_argument("world", help="the world definition file to check")
+    parser.add_argument("--max-states", type=int, default=1000000,
+                        help="stop exploring after this many states")
+    args = parser.parse_args(argv)
+
+    report = solve(load_world(args.world), args.max_states)
+    print(json.dumps(report.as_dict(), indent=2))
+    return 0 if report.winnable and not report.truncated else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
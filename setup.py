@@ -4,14 +4,21 @@ setup(
     name="rpg_game",
     version="0.1.0",
     packages=find_packages(),
+    package_data={'rpg_game': ['worlds/*.json']},
     install_requires=[],
+    extras_require={
+        # Needed only for rpg_game.game.bulk_simulator
+        'sim': ['numpy>=1.20'],
+    },
     author="Your Name",
     author_email="your.email@example.com",
     description="A text-based RPG game",
     entry_points={
         'console_scripts': [
             'rpg-game=rpg_game.main:main',
+            'rpg-replay=rpg_game.replay:main',
+            'rpg-server=rpg_game.server:main',
         ],
     },
-    python_requires='>=3.6',
+    python_requires='>=3.7',
 )
@@ -0,0 +1,99 @@
+"""
+Tests for the benchmark module and the compact game objects it measures.
+"""
+import json
+
+import pytest
+from rpg_game import bench
+from rpg_game.game.diagnostic_tool import DiagnosticTool
+from rpg_game.game.droid import DamagedMaintenanceDroid
+from rpg_game.game.energy_crystal import EnergyCrystal
+from rpg_game.game.game_controller import GameController
+from rpg_game.game.location import Location
+from rpg_game.game.player import Player
+
+
+@pytest.mark.parametrize("obj", [
+    Location("Room", "A room."),
+    DiagnosticTool(),
+    EnergyCrystal(),
+    DamagedMaintenanceDroid(),
+])
+def test_game_objects_have_no_instance_dict(obj):
+    """Test that the compact classes do not carry a __dict__."""
+    assert not hasattr(obj, "__dict__")
+    with pytest.raises(AttributeError):
+        obj.unexpected_attribute = 1
+
+
+def test_player_methods_can_still_be_replaced():
+    """Test that a single player's method can be swapped, e.g. by a mock."""
+    player = Player(Location("Room", "A room."))
+    player.move = lambda direction: True
+    assert player.move("anywhere") is True
+
+
+def test_object_sizes_reports_each_class():
+    """Test that object_sizes measures every game class."""
+    sizes = bench.object_sizes(count=100)
+    assert set(sizes) == {
+        "Location", "Player", "StationItem", "DiagnosticTool",
+        "EnergyCrystal", "DamagedMaintenanceDroid"
+    }
+    assert all(size > 0 for size in sizes.values())
+
+
+def test_session_memory_is_positive():
+    """Test that session_memory returns a per-session byte count."""
+    assert bench.session_memory(sessions=50, commands=bench.GOLDEN_PATH) > 0
+
+
+def test_percentiles_are_in_microseconds():
+    """Test that percentiles summarise nanosecond samples in microseconds."""
+    summary = bench.percentiles([1000 * n for n in range(1, 101)])
+    assert summary["min"] == 1
+    assert summary["p50"] == 51
+    assert summary["p99"] == 99
+    assert summary["max"] == 100
+    assert summary["mean"] == 50.5
+
+
+def test_command_latency_covers_every_verb():
+    """Test that every registered verb is benchmarked."""
+    results = bench.command_latency(repeat=5)
+    assert set(results) == {"help", "look", "inventory", "status",
+                            "go", "get", "use", "win"}
+    assert all(result["p50"] > 0 for result in results.values())
+
+
+def test_verb_cases_do_what_they_say():
+    """Test that each benchmarked command gets past its setup and succeeds."""
+    for setup, command in bench.VERB_CASES.values():
+        game = GameController(headless=True)
+        game.run_commands(setup)
+        result = game.process_input(command)
+        assert result.message != GameController.UNKNOWN_COMMAND
+        assert result.hazard_delta == 0
+
+
+def test_large_world_is_won():
+    """Test that the large world benchmark walks to the goal."""
+    result = bench.large_world(rooms=20, sessions=5)
+    assert result["rooms"] == 20
+    assert set(result["commands"]) == {"min", "p50", "p90", "p99", "max", "mean"}
+
+
+def test_main_writes_json(tmp_path):
+    """Test that a quick run writes every section to a JSON file."""
+    output = tmp_path / "bench.json"
+    bench.main(["--quick", "--output", str(output)])
+    results = json.loads(output.read_text())
+    assert {"commands", "engine", "golden_path", "construction",
+            "memory", "large_world"} <= set(results)
+
+
+def test_npc_ticks_counts_turns():
+    """Test that the NPC benchmark runs droids through the scheduler."""
+    result = bench.npc_ticks(npcs=40, sessions=4, ticks=10, patrol_every=2)
+    assert result["npcs"] == 40
+    assert result["turns_per_tick"] > 0
@@ -0,0 +1,95 @@
+"""
+Tests for the vectorized bulk simulator, checked against the object engine.
+"""
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from rpg_game.game.bulk_simulator import BulkSimulator
+from rpg_game.game.command_table import CommandTable
+from rpg_game.game.game_controller import GameController
+from rpg_game.game.world_generator import generate_world
+from rpg_game.game.world_loader import load_world
+
+# Every kind of command, including aliases, typos and blocked moves
+COMMANDS = [
+    "get tool", "use tool", "get crystal", "win", "go east", "go west",
+    "e", "w", "n", "go north", "go up", "look", "help", "status",
+    "inventory", "get banana", "use crystal", "dance", "  GO EAST  ",
+]
+
+
+def _assert_matches_engine(world, sessions, steps, seed):
+    """Play random commands in both engines and compare every session."""
+    rng = random.Random(seed)
+    scripts = [[rng.choice(COMMANDS) for _ in range(steps)]
+               for _ in range(sessions)]
+
+    simulator = BulkSimulator(world, sessions)
+    for step in range(steps):
+        simulator.step(simulator.encode(script[step] for script in scripts))
+
+    for number, script in enumerate(scripts):
+        game = GameController(headless=True, world=world)
+        results = game.run_commands(script)
+        player = game.player
+        assert simulator.score[number] == player.score
+        assert simulator.hazards[number] == player.hazard_count
+        assert simulator.location[number] == player.current_location.index
+        assert simulator.has_tool[number] == player.has_tool
+        assert simulator.has_crystal[number] == player.has_crystal
+        assert simulator.won[number] == results[-1].won
+
+
+def test_parity_with_space_station():
+    """Test that random sessions end the same in both engines."""
+    _assert_matches_engine(load_world(), sessions=400, steps=25, seed=1)
+
+
+def test_parity_with_generated_world():
+    """Test parity on a bigger world with several droids."""
+    world = generate_world(30, seed=2, exit_degree=6, droids=5)
+    _assert_matches_engine(world, sessions=300, steps=60, seed=2)
+
+
+def test_golden_path_for_every_session():
+    """Test that one command applied to all sessions wins them all."""
+    simulator = BulkSimulator(load_world(), 1000)
+    for command in ["e", "get tool", "use tool", "go east", "get crystal", "win"]:
+        simulator.step(command)
+    assert simulator.won.all()
+    assert (simulator.score == 110).all()
+    assert (simulator.hazards == 1).all()
+    assert simulator.summary()["win_rate"] == 1.0
+
+
+def test_won_sessions_ignore_later_commands():
+    """Test that a session stops after winning, as run_commands does."""
+    simulator = BulkSimulator(load_world(), 2)
+    for command in ["get tool", "use tool", "go east", "get crystal"]:
+        simulator.step(command)
+    simulator.step(np.array([simulator.code("win"), simulator.code("look")]))
+    simulator.step("go west")
+    assert list(simulator.won) == [True, False]
+    assert list(simulator.location) == [1, 0]
+
+
+def test_run_takes_a_table_of_codes():
+    """Test that run() applies one row of codes per step."""
+    simulator = BulkSimulator(load_world(), 3)
+    codes = np.array([[simulator.code("get tool")] * 3,
+                      [simulator.code(c) for c in ("use tool", "look", "e")]])
+    simulator.run(codes)
+    assert list(simulator.score) == [30, 10, 10]
+    assert list(simulator.hazards) == [0, 0, 1]
+
+
+def test_unknown_plugin_verb_is_refused(monkeypatch):
+    """Test that a verb without simulation rules raises ValueError."""
+    table = CommandTable()
+    table.register("dance", lambda game, argument: None)
+    monkeypatch.setattr(GameController, "commands", table)
+    with pytest.raises(ValueError):
+        BulkSimulator(load_world(), 1).code("dance")
@@ -0,0 +1,74 @@
+"""
+Tests for the CommandTable class and command dispatch in the GameController.
+"""
+import pytest
+from rpg_game.game.command_table import CommandTable
+from rpg_game.game.game_controller import GameController
+
+
+def _handler(game, argument):
+    return argument
+
+
+def test_parse_verb_and_argument():
+    """Test that a command is split into its handler and argument."""
+    table = CommandTable()
+    table.register("go", _handler, takes_argument=True)
+    assert table.parse("go  east ") == (_handler, "east")
+    assert table.parse("go") == (None, "")
+
+
+def test_parse_verb_without_argument():
+    """Test that verbs without arguments reject extra words."""
+    table = CommandTable()
+    table.register("look", _handler)
+    assert table.parse("look") == (_handler, "")
+    assert table.parse("look around") == (None, "")
+    assert table.parse("dance") == (None, "")
+
+
+def test_alias_expands_to_command():
+    """Test that an alias is parsed as the command it stands for."""
+    table = CommandTable()
+    table.register("go", _handler, takes_argument=True)
+    table.add_alias("n", "go north")
+    assert table.parse("n") == (_handler, "north")
+
+
+def test_register_replaces_cached_parse():
+    """Test that registering a verb is seen by commands parsed earlier."""
+    table = CommandTable()
+    assert table.parse("dance") == (None, "")
+    table.register("dance", _handler)
+    assert table.parse("dance") == (_handler, "")
+    assert "dance" in table
+
+
+@pytest.mark.parametrize("alias, expected", [
+    ("e", "blocks your way"),
+    ("l", "Maintenance Tunnels"),
+    ("i", "not carrying anything"),
+])
+def test_controller_aliases(alias, expected):
+    """Test the built-in shortcuts in the GameController."""
+    game = GameController(headless=True)
+    assert expected in game.process_input(alias).message
+
+
+def test_controller_unknown_item(game_controller, capsys):
+    """Test that getting or using an unknown item is not understood."""
+    game_controller.process_input("get spanner")
+    game_controller.process_input("use crystal")
+    output = capsys.readouterr().out.lower()
+    assert output.count("don't understand that command") == 2
+
+
+def test_plugin_can_register_verb(monkeypatch):
+    """Test that a new verb can be added without editing the controller."""
+    table = CommandTable()
+    monkeypatch.setattr(GameController, "commands", table)
+    table.register("wave", lambda game, argument: game._say("You wave."))
+
+    game = GameController(headless=True)
+    assert game.process_input("wave").message == "You wave."
+    assert "don't understand" in game.process_input("look").message
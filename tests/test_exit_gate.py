@@ -0,0 +1,130 @@
+"""
+Tests for exit gates and how Player.move uses them.
+"""
+import pickle
+
+import pytest
+from rpg_game.game.exit_gate import DROID_GATE, ExitGate, ItemGate, ScoreGate
+from rpg_game.game.game_controller import GameController
+from rpg_game.game.item_registry import TOOL
+from rpg_game.game.location import Location
+from rpg_game.game.player import Player
+from rpg_game.game.solver import solve
+from rpg_game.game.world_loader import compile_world
+
+WORLD = {
+    "start": "hall",
+    "goal": "vault",
+    "rooms": {
+        "hall": {
+            "exits": {"north": "vault", "east": "shed", "down": "pit"},
+            "gates": {
+                "north": {"score": 10, "message": "The vault stays shut."},
+                "east": {"item": "tool"},
+                "down": {"blocked": True},
+            },
+        },
+        "shed": {"exits": {"west": "hall"}},
+        "vault": {"exits": {"south": "hall"}},
+        "pit": {"exits": {"up": "hall"}},
+    },
+}
+
+
+@pytest.fixture
+def rooms():
+    """Return two connected plain locations."""
+    hall = Location("Hall", "A hall.")
+    shed = Location("Shed", "A shed.")
+    hall.add_exit("north", shed)
+    return hall, shed
+
+
+def test_item_gate_needs_the_item(rooms):
+    """Test that an item gate only opens for a player carrying the item."""
+    hall, shed = rooms
+    hall.set_exit_gate("north", ItemGate(TOOL))
+    player = Player(hall)
+    assert not player.move("north")
+    player.has_tool = True
+    assert player.move("north") and player.current_location is shed
+
+
+def test_score_gate_needs_the_score(rooms):
+    """Test that a score gate opens once the player's score is high enough."""
+    hall, _ = rooms
+    hall.set_exit_gate("north", ScoreGate(20))
+    player = Player(hall)
+    player.score = 19
+    assert hall.closed_by(player, "north") is hall.exit_gate("north")
+    player.score = 20
+    assert hall.closed_by(player, "north") is None
+
+
+def test_removed_gate_opens_the_exit(rooms):
+    """Test that setting a gate to None removes it."""
+    hall, _ = rooms
+    hall.set_exit_gate("north", ExitGate())
+    hall.set_exit_gate("north", None)
+    assert Player(hall).move("north")
+
+
+def test_droid_blocks_through_closed_by(maintenance_tunnels, docking_bay):
+    """Test that a blocking droid is reported as DROID_GATE."""
+    maintenance_tunnels.add_exit("east", docking_bay)
+    player = Player(maintenance_tunnels)
+    assert maintenance_tunnels.closed_by(player, "east") is DROID_GATE
+    assert maintenance_tunnels.closed_by(player, "north") is None
+
+
+def test_world_file_gates():
+    """Test that gates from a world file stop the player with their message."""
+    game = GameController(headless=True, world=compile_world(WORLD))
+    result = game.process_input("go north")
+    assert result.message == "The vault stays shut."
+    assert result.hazard_delta == 0
+    assert game.process_input("go east").message == (
+        "You need the diagnostic tool to go that way."
+    )
+    assert game.process_input("go down").message == "The way is blocked."
+    game.player.score = 10
+    assert game.process_input("go north").message.startswith("You move north")
+
+
+def test_session_gates_do_not_leak():
+    """Test that a gate changed in one session leaves other sessions alone."""
+    template = compile_world(WORLD)
+    first = GameController(headless=True, world=template)
+    second = GameController(headless=True, world=template)
+    first.player.current_location.set_exit_gate("down", None)
+    assert first.process_input("go down").message.startswith("You move down")
+    assert second.process_input("go down").message == "The way is blocked."
+
+    first.reset()
+    assert first.process_input("go down").message == "The way is blocked."
+
+
+def test_gated_templates_can_be_pickled():
+    """Test that gates survive the on-disk template cache."""
+    template = pickle.loads(pickle.dumps(compile_world(WORLD)))
+    gate = template.exit_gate(0, "north")
+    assert isinstance(gate, ScoreGate) and gate.minimum == 10
+    assert template.exit_gate(1, "west") is None
+
+
+@pytest.mark.parametrize("gates", [
+    {"west": {"blocked": True}},
+    {"north": {"item": "banana"}},
+    {"north": {}},
+])
+def test_bad_gates_are_rejected(gates):
+    """Test that gates on missing exits, unknown items or with no rule fail."""
+    world = {"rooms": {"a": {"exits": {"north": "a"}, "gates": gates}}}
+    with pytest.raises(ValueError):
+        compile_world(world)
+
+
+def test_solver_rejects_gated_worlds():
+    """Test that the solver refuses worlds it has no rules for."""
+    with pytest.raises(ValueError):
+        solve(compile_world(WORLD))
@@ -125,3 +125,99 @@ def test_show_help(mock_print, game_controller):
 
     for cmd in expected_commands:
         assert cmd in help_output
+
+
+def test_process_input_returns_result(game_controller, capsys):
+    """
+    Test that process_input returns a CommandResult describing the command.
+
+    Args:
+        game_controller: A GameController instance for testing
+        capsys: Pytest fixture for capturing output
+
+    Asserts:
+        The result holds the message, score change and win flag
+        The message is still printed when not headless
+    """
+    result = game_controller.process_input("get tool")
+
+    assert result.command == "get tool"
+    assert result.message == "You pick up the diagnostic tool."
+    assert result.score_delta == 10
+    assert result.hazard_delta == 0
+    assert result.won is False
+    assert "You pick up the diagnostic tool." in capsys.readouterr().out
+
+
+def test_headless_run_commands_golden_path(capsys):
+    """
+    Test that a headless controller plays the golden path without printing.
+
+    Args:
+        capsys: Pytest fixture for capturing output
+
+    Asserts:
+        Each command reports the expected score and hazard changes
+        The session stops after the winning command
+        Nothing is printed to the terminal
+    """
+    game = GameController(headless=True)
+    results = game.run_commands([
+        "go east", "get tool", "use tool", "GO EAST",
+        "get crystal", "win", "status"
+    ])
+
+    assert [r.score_delta for r in results] == [0, 10, 20, 0, 50, 30]
+    assert [r.hazard_delta for r in results] == [1, 0, 0, 0, 0, 0]
+    assert results[-1].won is True
+    assert "blocks your way" in results[0].message
+    assert game.player.get_status() == (110, 1)
+    assert capsys.readouterr().out == ""
+
+
+def test_headless_win_failure_message(capsys):
+    """
+    Test that a failed win attempt is reported in the result, not printed.
+
+    Args:
+        capsys: Pytest fixture for capturing output
+
+    Asserts:
+        The result is not a win and explains why
+    """
+    game = GameController(headless=True)
+    result = game.process_input("win")
+
+    assert result.won is False
+    assert "Docking Bay" in result.message
+    assert "haven't completed" in result.message
+    assert capsys.readouterr().out == ""
+
+
+def test_reset_reuses_objects():
+    """Test that reset() starts again without making new objects."""
+    game = GameController(headless=True)
+    player = game.player
+    tunnels = game.maintenance_tunnels
+    droid = game.droid
+    game.run_commands(["get tool", "use tool", "go east", "get crystal", "win"])
+
+    game.reset()
+    assert game.player is player and game.maintenance_tunnels is tunnels
+    assert game.droid is droid and droid.is_blocking()
+    assert player.current_location is tunnels
+    assert player.get_status() == (0, 0)
+    assert not player.has_tool and not player.has_crystal
+    assert "diagnostic tool" in tunnels.describe()
+    results = game.run_commands(["get tool", "use tool", "go east",
+                                 "get crystal", "win"])
+    assert results[-1].won and player.score == 110
+
+
+def test_reset_drops_exits_added_during_the_game():
+    """Test that exits added with add_exit() are removed by reset()."""
+    game = GameController(headless=True)
+    game.docking_bay.add_exit("north", game.maintenance_tunnels)
+    game.reset()
+    assert game.docking_bay.find_exit("north") is None
+    assert set(game.docking_bay.exits) == {"west"}
@@ -0,0 +1,99 @@
+"""
+Tests for the GraphIndex route finder.
+"""
+import random
+
+import pytest
+from rpg_game.game.graph_index import GraphIndex, droid_gates, gated_exits
+from rpg_game.game.world_loader import compile_world, load_world
+
+
+@pytest.fixture
+def station():
+    """Return an index of the default space station world."""
+    return GraphIndex(load_world())
+
+
+def _random_world(seed, rooms=60, degree=3):
+    """Build a random directed world with droids in some rooms."""
+    rng = random.Random(seed)
+    directions = ["north", "east", "south", "west", "up", "down"]
+    definition = {}
+    for i in range(rooms):
+        exits = {d: f"r{rng.randrange(rooms)}" for d in rng.sample(directions, degree)}
+        definition[f"r{i}"] = {"exits": exits, "droid": rng.random() < 0.3}
+    return compile_world({"rooms": definition, "start": "r0", "goal": "r1"})
+
+
+def test_droid_gate_blocks_route(station):
+    """Test that the droid's east exit is left out until unblocked."""
+    world = station.template
+    assert droid_gates(world) == {(world.start, "east")}
+    assert station.is_blocked(world.start, "east") is True
+    assert station.distance(world.start, world.goal) is None
+    assert station.can_win(world.start, has_crystal=False) is False
+
+
+def test_unblock_opens_route(station):
+    """Test that repairing the droid makes the goal reachable."""
+    world = station.template
+    station.unblock(world.start, "east")
+    assert station.distance(world.start, world.goal) == 1
+    assert station.next_step(world.start, world.goal) == "east"
+    assert station.path(world.start, world.goal) == ["east"]
+    assert station.path(world.goal, world.start) == ["west"]
+    assert station.can_win(world.start, has_crystal=False) is True
+
+
+def test_block_closes_route(station):
+    """Test that closing an exit again removes the route."""
+    world = station.template
+    station.unblock(world.start, "east")
+    station.block(world.start, "east")
+    assert station.can_reach(world.start, world.goal) is False
+
+
+def test_unknown_exit_raises(station):
+    """Test that naming an exit the room does not have is an error."""
+    with pytest.raises(KeyError):
+        station.unblock(0, "north")
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_unblock_matches_full_rebuild(seed):
+    """Test that updating routes in place gives the same answers as a rebuild."""
+    world = _random_world(seed)
+    gates = sorted(droid_gates(world))
+    index = GraphIndex(world)
+    targets = range(0, len(world), 7)
+    for target in targets:
+        index.distance(0, target)
+
+    for opened, gate in enumerate(gates, start=1):
+        index.unblock(*gate)
+        rebuilt = GraphIndex(world, blocked=gates[opened:])
+        for target in targets:
+            for source in range(len(world)):
+                assert index.distance(source, target) == rebuilt.distance(source, target)
+                path = index.path(source, target)
+                assert (path is None) == (rebuilt.path(source, target) is None)
+                if path is not None:
+                    assert len(path) == index.distance(source, target)
+
+
+def test_gated_exits_are_blocked():
+    """Test that exits with a gate in the world file are left out of routes."""
+    world = compile_world({
+        "start": "hall", "goal": "vault",
+        "rooms": {
+            "hall": {"exits": {"north": "vault", "down": "pit"},
+                     "gates": {"north": {"score": 10}}},
+            "pit": {"exits": {"up": "hall"}},
+            "vault": {"exits": {"south": "hall"}},
+        },
+    })
+    index = GraphIndex(world)
+    assert gated_exits(world) == {(world.start, "north")}
+    assert index.distance(world.start, world.goal) is None
+    index.unblock(world.start, "north")
+    assert index.distance(world.start, world.goal) == 1
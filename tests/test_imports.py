@@ -0,0 +1,51 @@
+"""
+Tests for the lazily imported package contents.
+"""
+import subprocess
+import sys
+
+import pytest
+import rpg_game
+import rpg_game.game
+from rpg_game import bench
+
+
+def _modules_after(statement):
+    """Run an import in a fresh interpreter and list the game modules loaded."""
+    code = (f"{statement}; import sys; "
+            "print(' '.join(m for m in sys.modules if m.startswith('rpg_game')))")
+    output = subprocess.run([sys.executable, "-c", code], check=True,
+                            capture_output=True, text=True).stdout
+    return set(output.split())
+
+
+def test_importing_package_loads_no_game_modules():
+    """Test that importing the package does not import the game itself."""
+    assert _modules_after("import rpg_game") == {"rpg_game"}
+
+
+def test_importing_player_skips_controller():
+    """Test that one class can be imported without GameController."""
+    loaded = _modules_after("from rpg_game import Player")
+    assert "rpg_game.game.player" in loaded
+    assert "rpg_game.game.game_controller" not in loaded
+
+
+@pytest.mark.parametrize("package", [rpg_game, rpg_game.game])
+def test_public_names_still_available(package):
+    """Test that every name in __all__ resolves and is listed by dir()."""
+    for name in package.__all__:
+        assert getattr(package, name).__name__ == name
+        assert name in dir(package)
+
+
+def test_unknown_name_raises_attribute_error():
+    """Test that a missing name still raises AttributeError."""
+    with pytest.raises(AttributeError):
+        rpg_game.NoSuchClass
+
+
+def test_import_time_benchmark():
+    """Test that import_time() reports each module it is given."""
+    results = bench.import_time(["rpg_game"], repeat=2)
+    assert results["rpg_game"]["min"] > 0
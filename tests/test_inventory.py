@@ -0,0 +1,129 @@
+"""
+Tests for inventories, the item registry and worlds with extra items.
+"""
+import struct
+
+import pytest
+from rpg_game.game.game_controller import GameController
+from rpg_game.game.inventory import Inventory
+from rpg_game.game.item_registry import CRYSTAL, DROID, ITEMS, TOOL, ItemRegistry
+from rpg_game.game.station_item import StationItem
+from rpg_game.game.world_loader import compile_world
+from rpg_game.game.world_template import WorldTemplate
+
+# Enough extra item types that the last one's bit does not fit in a byte
+for _number in range(8):
+    if f"filler_{_number}" not in ITEMS:
+        ITEMS.register(f"filler_{_number}")
+if "keycard" not in ITEMS:
+    ITEMS.register("keycard", StationItem("Security Keycard", "A scuffed keycard."),
+                   points=5)
+KEYCARD = ITEMS.id("keycard")
+
+WORLD = {
+    "start": "a",
+    "goal": "b",
+    "rooms": {
+        "a": {"name": "A", "exits": {"east": "b"}, "items": ["keycard"]},
+        "b": {"name": "B", "exits": {"west": "a"}, "crystal": True},
+    },
+}
+
+
+def test_inventory_add_remove_and_contains():
+    """Test that items can be added, checked and removed."""
+    inventory = Inventory()
+    assert not inventory and len(inventory) == 0
+    assert inventory.add(3)
+    assert not inventory.add(3)
+    assert 3 in inventory and 2 not in inventory
+    assert inventory.remove(3)
+    assert not inventory.remove(3)
+    assert inventory.bits == 0
+
+
+def test_inventory_handles_thousands_of_item_types():
+    """Test that ids past the size of a machine word still work."""
+    inventory = Inventory()
+    for item_id in (0, 70, 5000):
+        inventory.add(item_id)
+    assert list(inventory) == [0, 70, 5000]
+    assert len(inventory) == 3
+    assert inventory == Inventory((1 << 5000) | (1 << 70) | 1)
+
+
+def test_builtin_item_ids_match_template_flags():
+    """Test that the built-in items' bits are the WorldTemplate flags."""
+    assert 1 << TOOL == WorldTemplate.TOOL
+    assert 1 << CRYSTAL == WorldTemplate.CRYSTAL
+    assert 1 << DROID == WorldTemplate.DROID
+
+
+def test_registry_interns_keys_and_indexes_names():
+    """Test that keys get ids in order and can be typed by name."""
+    registry = ItemRegistry()
+    first = registry.register("tool", StationItem("Diagnostic Tool", ""))
+    second = registry.register("rope")
+    assert (first, second) == (0, 1)
+    assert registry.lookup("tool") == registry.lookup("diagnostic tool") == first
+    assert registry.lookup("ladder") is None
+    assert registry.display_name(second) == "rope"
+    with pytest.raises(ValueError):
+        registry.register("rope")
+
+
+def test_get_and_use_accept_item_names():
+    """Test that items can be typed by their full name."""
+    game = GameController(headless=True)
+    results = game.run_commands(["get diagnostic tool", "use diagnostic tool"])
+    assert [result.score_delta for result in results] == [10, 20]
+    assert not game.droid.is_blocking()
+    assert game.process_input("get droid").message == GameController.UNKNOWN_COMMAND
+
+
+def test_extra_items_can_be_collected():
+    """Test picking up an item that is not one of the built-in ones."""
+    template = compile_world(WORLD)
+    assert template.flags(0) == 1 << KEYCARD
+    game = GameController(headless=True, world=template)
+    assert "You see a security keycard here." in game.process_input("look").message
+
+    result = game.process_input("get keycard")
+    assert result.message == "You pick up the security keycard."
+    assert result.score_delta == 5
+    assert KEYCARD in game.player.inventory
+    assert "- Security Keycard" in game.process_input("inventory").message
+    assert (game.process_input("get keycard").message ==
+            "You already have the security keycard.")
+
+
+def test_extra_items_survive_snapshots():
+    """Test that wide item bits are saved and restored."""
+    template = compile_world(WORLD)
+    game = GameController(headless=True, world=template)
+    game.run_commands(["get keycard", "go east", "get crystal"])
+
+    restored = GameController(headless=True, world=template)
+    restored.restore(game.snapshot())
+    assert restored.player.inventory == game.player.inventory
+    assert restored.world_state.changed_flags == game.world_state.changed_flags
+
+
+def test_version_1_snapshots_can_be_restored():
+    """Test restoring a snapshot in the old fixed-width layout."""
+    game = GameController(headless=True)
+    start = game.world.start
+    data = struct.pack("<4sBBIIiIII", b"RPGS", 1, 1, game.world.fingerprint,
+                       start, 10, 0, 1, 0)
+    data += struct.pack("<IB", start, WorldTemplate.DROID)
+    game.restore(data)
+    assert game.player.has_tool and not game.player.has_crystal
+    assert game.player.score == 10
+    assert not game.player.current_location.has_tool
+
+
+def test_unknown_items_are_rejected():
+    """Test that a world naming an unregistered item fails to load."""
+    world = {"rooms": {"a": {"items": ["banana"]}}}
+    with pytest.raises(ValueError, match="banana"):
+        compile_world(world)
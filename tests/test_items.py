@@ -44,9 +44,12 @@ def test_diagnostic_tool_initialization(diagnostic_tool):
     Asserts:
         diagnostic_tool._name == "Diagnostic Tool"
         "handheld device" in diagnostic_tool._description.lower()
+        diagnostic_tool.description is the description, not the examine hint
     """
     assert diagnostic_tool._name == "Diagnostic Tool"
     assert "handheld device" in diagnostic_tool._description.lower()
+    assert diagnostic_tool.description == diagnostic_tool._description
+    assert diagnostic_tool.description != diagnostic_tool.examine()
 
 
 def test_diagnostic_tool_examine(diagnostic_tool):
@@ -91,3 +91,39 @@ def test_set_droid_present():
     # Remove the droid
     test_location.droid_present = False
     assert test_location.droid_present is False
+
+def test_describe_is_cached_until_location_changes(docking_bay, maintenance_tunnels):
+    """Test that describe() reuses its text until the location changes."""
+    first = docking_bay.describe()
+    assert docking_bay.describe() is first
+
+    docking_bay.has_crystal = True
+    with_crystal = docking_bay.describe()
+    assert with_crystal is not first
+    assert "energy crystal" in with_crystal.lower()
+
+    docking_bay.add_exit("west", maintenance_tunnels)
+    assert "Exits: west" in docking_bay.describe()
+
+    docking_bay.remove_crystal()
+    assert "energy crystal" not in docking_bay.describe().lower()
+
+def test_describe_notices_droid_repair(maintenance_tunnels):
+    """Test that the droid line disappears once the droid is repaired."""
+    assert "maintenance droid" in maintenance_tunnels.describe().lower()
+    maintenance_tunnels.droid.repair()
+    assert "maintenance droid" not in maintenance_tunnels.describe().lower()
+
+def test_find_exit_by_name_and_alias(maintenance_tunnels, docking_bay):
+    """Test that exits are found by lowercase name or short form."""
+    maintenance_tunnels.add_exit("East", docking_bay)
+    assert maintenance_tunnels.find_exit("east") == "East"
+    assert maintenance_tunnels.find_exit("e") == "East"
+    assert maintenance_tunnels.find_exit("west") is None
+
+def test_find_exit_real_exit_beats_alias(maintenance_tunnels, docking_bay):
+    """Test that an exit literally named like an alias keeps that name."""
+    maintenance_tunnels.add_exit("n", docking_bay)
+    maintenance_tunnels.add_exit("north", maintenance_tunnels)
+    assert maintenance_tunnels.find_exit("n") == "n"
+    assert maintenance_tunnels.find_exit("north") == "north"
@@ -0,0 +1,125 @@
+"""
+Tests for the optional command metrics.
+"""
+from rpg_game.game.game_controller import GameController
+from rpg_game.game.item_registry import ITEMS
+from rpg_game.game.metrics import LATENCY_BUCKETS, UNKNOWN_VERB, Metrics
+from rpg_game.game.player import Player
+from rpg_game.game.station_item import StationItem
+from rpg_game.game.world_loader import compile_world
+
+if "beacon" not in ITEMS:
+    ITEMS.register("beacon", StationItem("Beacon", "A distress beacon."), points=5)
+
+GOLDEN_PATH = ["get tool", "use tool", "go east", "get crystal", "win"]
+
+
+def test_game_without_metrics_is_not_instrumented():
+    """Test that players are left alone when metrics are off."""
+    game = GameController(headless=True)
+    assert game.metrics is None
+    assert "move" not in vars(game.player)
+
+
+def test_commands_are_counted_by_verb():
+    """Test that aliases and unknown commands are counted under their verb."""
+    metrics = Metrics()
+    game = GameController(headless=True, metrics=metrics)
+    game.run_commands(["look", "l", "e", "dance"])
+    commands = metrics.snapshot()["commands"]
+    assert commands["look"]["count"] == 2
+    assert commands["go"]["count"] == 1
+    assert commands["go"]["hazards"] == 1
+    assert commands[UNKNOWN_VERB]["count"] == 1
+
+
+def test_histogram_buckets_are_cumulative():
+    """Test that each bucket counts everything at or below its bound."""
+    metrics = Metrics()
+    metrics.record_command("look", 500)          # 0.5 microseconds
+    metrics.record_command("look", 3000)         # 3 microseconds
+    metrics.record_command("look", 1000000000)   # 1 second
+    buckets = metrics.snapshot()["commands"]["look"]["buckets"]
+    assert buckets[str(LATENCY_BUCKETS[0])] == 1
+    assert buckets[str(LATENCY_BUCKETS[2])] == 2
+    assert buckets[str(LATENCY_BUCKETS[-1])] == 2
+    assert buckets["+Inf"] == 3
+
+
+def test_win_rate_across_games():
+    """Test that wins are counted against the games started."""
+    metrics = Metrics()
+    GameController(headless=True, metrics=metrics).run_commands(GOLDEN_PATH)
+    GameController(headless=True, metrics=metrics).run_commands(["look"])
+    snapshot = metrics.snapshot()
+    assert snapshot["games_started"] == 2
+    assert snapshot["games_won"] == 1
+    assert snapshot["win_rate"] == 0.5
+    assert snapshot["commands"]["win"]["wins"] == 1
+
+
+def test_repeated_win_counts_once():
+    """Test that saying 'win' again after winning does not count more wins."""
+    metrics = Metrics()
+    game = GameController(headless=True, metrics=metrics)
+    game.run_commands(GOLDEN_PATH)
+    assert game.process_input("win").won is True
+    game.process_input("win")
+    snapshot = metrics.snapshot()
+    assert snapshot["games_won"] == 1
+    assert snapshot["win_rate"] == 1.0
+    assert "rpg_games_won_total 1" in metrics.prometheus_text()
+
+
+def test_player_actions_are_timed():
+    """Test that instrumented Player methods are recorded and still work."""
+    metrics = Metrics()
+    game = GameController(headless=True, metrics=metrics)
+    game.run_commands(["get tool", "use tool", "go east"])
+    actions = metrics.snapshot()["actions"]
+    assert set(actions) == {"pick_up", "pick_up_tool", "use_tool_on_droid", "move"}
+    assert game.player.current_location is game.docking_bay
+
+
+def test_registered_item_pickups_are_timed():
+    """Test that taking a registered item is recorded under pick_up."""
+    world = compile_world({"rooms": {"a": {"items": ["beacon"], "tool": True}}})
+    metrics = Metrics()
+    game = GameController(headless=True, world=world, metrics=metrics)
+    game.run_commands(["get beacon", "get tool"])
+    actions = metrics.snapshot()["actions"]
+    assert actions["pick_up"]["count"] == 2
+    assert actions["pick_up_tool"]["count"] == 1
+    assert game.player.score == 15
+
+
+def test_restored_game_stays_instrumented():
+    """Test that restoring a snapshot keeps recording player actions."""
+    metrics = Metrics()
+    game = GameController(headless=True, metrics=metrics)
+    game.restore(game.snapshot())
+    game.process_input("get tool")
+    assert metrics.snapshot()["actions"]["pick_up_tool"]["count"] == 1
+
+
+def test_instrument_single_player(player):
+    """Test that instrument() only affects the player it is given."""
+    Metrics().instrument(player)
+    assert "move" in vars(player)
+    assert "move" not in vars(Player(player.current_location))
+
+
+def test_prometheus_file(tmp_path):
+    """Test that the Prometheus dump has histogram lines and totals."""
+    metrics = Metrics()
+    GameController(headless=True, metrics=metrics).run_commands(GOLDEN_PATH)
+    path = tmp_path / "rpg.prom"
+    metrics.write_prometheus(str(path))
+    text = path.read_text()
+    assert "# TYPE rpg_command_latency_seconds histogram" in text
+    assert 'rpg_command_latency_seconds_bucket{verb="go",le="+Inf"} 1' in text
+    assert 'rpg_command_latency_seconds_count{verb="win"} 1' in text
+    assert 'rpg_player_action_latency_seconds_count{action="move"} 1' in text
+    assert "rpg_games_won_total 1" in text
+    assert "rpg_win_rate 1.0" in text
+    assert list(tmp_path.iterdir()) == [path]
@@ -0,0 +1,133 @@
+"""
+Tests for the NPC scheduler and autonomous droids.
+"""
+import pytest
+from rpg_game.game.autonomous_droid import AutonomousDroid
+from rpg_game.game.game_controller import GameController
+from rpg_game.game.npc_scheduler import NpcScheduler
+from rpg_game.game.world_generator import generate_world
+from rpg_game.game.world_state import WorldState
+
+
+class _Recorder:
+    """An NPC that records its turns and acts again after a fixed delay."""
+
+    def __init__(self, name, turns, every=None):
+        self.name = name
+        self.turns = turns
+        self.every = every
+
+    def act(self, now):
+        self.turns.append((now, self.name))
+        return self.every
+
+
+def test_scheduler_runs_turns_in_due_order():
+    """Test that turns happen by due tick, then in the order added."""
+    scheduler = NpcScheduler()
+    turns = []
+    scheduler.add(_Recorder("late", turns), 3)
+    scheduler.add(_Recorder("first", turns), 1)
+    scheduler.add(_Recorder("second", turns), 1)
+    assert scheduler.advance(2) == 2
+    assert turns == [(1, "first"), (1, "second")]
+    assert scheduler.now == 2 and len(scheduler) == 1
+    scheduler.advance()
+    assert turns[-1] == (3, "late") and len(scheduler) == 0
+
+
+def test_scheduler_repeats_turns():
+    """Test that an NPC returning a delay acts again."""
+    scheduler = NpcScheduler()
+    turns = []
+    scheduler.add(_Recorder("droid", turns, every=2), 2)
+    assert scheduler.advance(7) == 3
+    assert [now for now, _ in turns] == [2, 4, 6]
+
+
+def test_only_due_npcs_act():
+    """Test that NPCs whose turn is far off are not touched by a tick."""
+    scheduler = NpcScheduler()
+    turns = []
+    for number in range(1000):
+        scheduler.add(_Recorder(number, turns), 100)
+    scheduler.add(_Recorder("soon", turns), 1)
+    assert scheduler.advance() == 1
+    assert turns == [(1, "soon")]
+
+
+def _world(rooms=6):
+    return WorldState(generate_world(rooms, droids=0))
+
+
+def test_droid_patrols_its_route():
+    """Test that a patrolling droid moves room to room and loops."""
+    world = _world()
+    scheduler = NpcScheduler()
+    droid = AutonomousDroid(world, scheduler, [1, 2, 3], patrol_every=2)
+    assert world.location(1).droid is droid
+    scheduler.advance(2)
+    assert droid.room == 2
+    assert world.location(2).droid_present and not world.location(1).droid_present
+    scheduler.advance(4)
+    assert droid.room == 1
+
+
+def test_droid_waits_for_an_occupied_room():
+    """Test that a droid does not move into a room that has a droid."""
+    world = _world()
+    scheduler = NpcScheduler()
+    AutonomousDroid(world, scheduler, [2])
+    droid = AutonomousDroid(world, scheduler, [1, 2], patrol_every=1)
+    scheduler.advance(3)
+    assert droid.room == 1
+
+
+def test_droid_breaks_again_after_repair():
+    """Test that a droid with a re-break timer blocks again later."""
+    world = _world()
+    scheduler = NpcScheduler()
+    droid = AutonomousDroid(world, scheduler, [1, 2], patrol_every=5,
+                            rebreak_after=3)
+    droid.repair()
+    world.location(1).droid_present = False
+    scheduler.advance(2)
+    assert not droid.is_blocking()
+    scheduler.advance(1)
+    assert droid.is_blocking() and world.location(1).droid_present
+    # The patrol turn planned before the repair was dropped
+    assert droid.room == 1 and droid.due == 8
+
+
+def test_droid_blocks_the_exit_it_guards():
+    """Test that a droid can block an exit other than east."""
+    game = GameController(headless=True, world=generate_world(3, droids=0))
+    scheduler = NpcScheduler()
+    game.run_commands(["go east"])
+    AutonomousDroid(game.world_state, scheduler, [1], guards="west")
+    assert "blocking the west exit" in game.process_input("look").message
+    result = game.process_input("go west")
+    assert result.hazard_delta == 1
+    assert game.process_input("go east").message.startswith("You move east")
+
+
+def test_game_ticks_the_scheduler_once_per_command():
+    """Test that a controller with a scheduler moves NPCs between commands."""
+    scheduler = NpcScheduler()
+    game = GameController(headless=True, world=generate_world(5, droids=0),
+                          scheduler=scheduler)
+    droid = AutonomousDroid(game.world_state, scheduler, [2, 3], patrol_every=1)
+    game.run_commands(["look", "look", "look"])
+    assert scheduler.now == 3
+    assert droid.room == 3
+
+
+@pytest.mark.parametrize("options", [
+    {"route": []},
+    {"route": [1], "patrol_every": 0},
+    {"route": [1], "rebreak_after": -1},
+])
+def test_bad_droid_settings_are_rejected(options):
+    """Test that impossible routes and timings raise ValueError."""
+    with pytest.raises(ValueError):
+        AutonomousDroid(_world(), NpcScheduler(), **options)
@@ -0,0 +1,101 @@
+"""
+Tests for the output sinks and how the game writes to them.
+"""
+import socket
+from unittest.mock import patch
+
+from rpg_game.game.game_controller import GameController
+from rpg_game.game.output_sink import (
+    BufferedSink, CallbackSink, NullSink, SocketSink, StdoutSink,
+)
+from rpg_game.game.player import Player
+
+
+class _Recorder:
+    """Stands in for a connection and records each write."""
+
+    def __init__(self):
+        self.writes = []
+
+    def write(self, data):
+        self.writes.append(data)
+
+
+def test_buffered_sink_collects_messages():
+    """Test that a BufferedSink keeps messages until cleared."""
+    sink = BufferedSink()
+    sink.write("one")
+    sink.write("two")
+    assert sink.getvalue() == "one\ntwo"
+    sink.clear()
+    assert sink.messages == []
+
+
+def test_stdout_sink_prints(capsys):
+    """Test that a StdoutSink prints each message."""
+    StdoutSink().write("hello")
+    assert capsys.readouterr().out == "hello\n"
+
+
+def test_callback_and_null_sinks():
+    """Test that a CallbackSink forwards messages and a NullSink drops them."""
+    received = []
+    CallbackSink(received.append).write("hi")
+    NullSink().write("ignored")
+    assert received == ["hi"]
+
+
+def test_socket_sink_sends_once_per_flush():
+    """Test that a SocketSink sends everything held in one write."""
+    connection = _Recorder()
+    sink = SocketSink(connection, terminator="\n\n")
+    sink.write("a")
+    sink.write("b")
+    assert connection.writes == []
+    sink.flush()
+    sink.flush()
+    assert connection.writes == [b"a\nb\n\n"]
+
+
+def test_socket_sink_with_real_socket():
+    """Test that a SocketSink uses sendall on a socket."""
+    left, right = socket.socketpair()
+    with left, right:
+        sink = SocketSink(left)
+        sink.write("ping")
+        sink.flush()
+        assert right.recv(100) == b"ping\n"
+
+
+def test_controller_writes_once_per_command():
+    """Test that a command's messages reach the sink in a single write."""
+    connection = _Recorder()
+    game = GameController(output=SocketSink(connection))
+    game.process_input("help")
+    game.process_input("go east")
+    assert len(connection.writes) == 2
+    assert connection.writes[0].count(b"\n") == 12
+    assert b"blocks your way" in connection.writes[1]
+
+
+@patch('builtins.print')
+def test_interactive_command_is_one_print(mock_print):
+    """Test that the terminal gets one print per command."""
+    game = GameController()
+    game.process_input("use tool")
+    mock_print.assert_called_once_with("You don't have a diagnostic tool.")
+
+
+def test_player_writes_to_its_sink(player):
+    """Test that a Player on its own writes to the sink it is given."""
+    sink = BufferedSink()
+    player.output = sink
+    player.pick_up_tool()
+    assert sink.messages == ["There is no diagnostic tool here."]
+
+
+def test_players_share_default_stdout_sink(docking_bay):
+    """Test that new players print through one shared StdoutSink."""
+    first, second = Player(docking_bay), Player(docking_bay)
+    assert isinstance(first.output, StdoutSink)
+    assert first.output is second.output
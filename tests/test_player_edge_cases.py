@@ -109,3 +109,17 @@ def test_move_after_droid_repaired(player, maintenance_tunnels, docking_bay):
     assert player.move("east") is True
     assert player.current_location == docking_bay
     assert player.hazard_count == 1  # No increment after repair
+
+def test_move_with_short_direction(player, maintenance_tunnels, docking_bay):
+    """Test that 'e' moves east, and is still blocked by the droid."""
+    maintenance_tunnels.add_exit("east", docking_bay)
+    docking_bay.add_exit("west", maintenance_tunnels)
+
+    assert player.move("E") is False
+    assert player.hazard_count == 1
+
+    maintenance_tunnels.droid.repair()
+    assert player.move("e") is True
+    assert player.current_location == docking_bay
+    assert player.move("w") is True
+    assert player.current_location == maintenance_tunnels
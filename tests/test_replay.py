@@ -0,0 +1,56 @@
+"""
+Tests for the transcript replay runner.
+"""
+import json
+
+from rpg_game.replay import main, replay, replay_session
+
+GOLDEN_PATH = ["get tool", "use tool", "go east", "get crystal", "win"]
+
+
+def test_replay_session_golden_path():
+    """Test that a winning transcript reports the final status and win."""
+    line = json.dumps({"session": "s1", "commands": GOLDEN_PATH})
+    result = replay_session((1, line))
+    assert result == {
+        "session": "s1", "status": [110, 0], "won": True, "commands": 5
+    }
+
+
+def test_replay_session_defaults_to_line_number():
+    """Test that sessions without an id are named by their line number."""
+    result = replay_session((7, json.dumps({"commands": ["go east"]})))
+    assert result["session"] == 7
+    assert result["status"] == [0, 1]
+    assert result["won"] is False
+
+
+def test_replay_stops_counting_after_win():
+    """Test that commands after a win are not run."""
+    line = json.dumps({"commands": GOLDEN_PATH + ["look", "status"]})
+    assert list(replay([line]))[0]["commands"] == 5
+
+
+def test_replay_with_workers_keeps_order():
+    """Test that a process pool returns results in input order."""
+    lines = [json.dumps({"session": i, "commands": GOLDEN_PATH[:i % 6]})
+             for i in range(20)]
+    lines.insert(3, "\n")
+    sequential = list(replay(lines))
+    parallel = list(replay(lines, workers=2, chunksize=2))
+    assert parallel == sequential
+    assert [r["session"] for r in parallel] == list(range(20))
+
+
+def test_main_writes_jsonl(tmp_path):
+    """Test the command-line entry point reads and writes JSONL files."""
+    transcripts = tmp_path / "in.jsonl"
+    output = tmp_path / "out.jsonl"
+    transcripts.write_text(json.dumps({"commands": GOLDEN_PATH}) + "\n")
+
+    main([str(transcripts), "-o", str(output), "-j", "1"])
+
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+    assert results == [
+        {"session": 1, "status": [110, 0], "won": True, "commands": 5}
+    ]
@@ -0,0 +1,77 @@
+"""
+Tests for the ResponseCatalog class and the games that use it.
+"""
+import json
+
+import pytest
+
+from rpg_game.game.game_controller import GameController
+from rpg_game.game.item_registry import CRYSTAL, TOOL
+from rpg_game.game.output_sink import SocketSink
+from rpg_game.game.response_catalog import RESPONSES, ResponseCatalog
+
+
+class _Recorder:
+    """Stands in for a connection and records each write."""
+
+    def __init__(self):
+        self.writes = []
+
+    def write(self, data):
+        self.writes.append(data)
+
+
+def test_help_is_one_prepared_message():
+    """Test that help sends the catalog's help text as a single message."""
+    game = GameController(headless=True)
+    result = game.process_input("help")
+    assert result.message is RESPONSES.help
+    assert result.message.startswith("\nAvailable commands:")
+
+
+def test_status_and_inventory_texts_are_reused():
+    """Test that the same status or inventory gives back the same string."""
+    catalog = ResponseCatalog()
+    assert catalog.status_text(10, 1) == "\nScore: 10\nHazards encountered: 1"
+    assert catalog.status_text(10, 1) is catalog.status_text(10, 1)
+    assert catalog.inventory_text(0) == "\nInventory:\nYou're not carrying anything."
+    both = catalog.inventory_text(1 << TOOL | 1 << CRYSTAL)
+    assert both == "\nInventory:\n- Diagnostic Tool\n- Energy Crystal"
+    assert catalog.inventory_text(1 << TOOL | 1 << CRYSTAL) is both
+
+
+def test_unknown_response_name_is_rejected():
+    """Test that a catalog refuses texts for responses it does not have."""
+    with pytest.raises(ValueError):
+        ResponseCatalog({"no_such_response": "?"})
+
+
+def test_loaded_catalog_changes_game_text(tmp_path):
+    """Test that a catalog loaded from JSON replaces only the texts it gives."""
+    path = tmp_path / "responses.json"
+    path.write_text(json.dumps({
+        "no_exit": "Pas de sortie vers {direction}.",
+        "droid_blocks": "Un droide bloque le passage !",
+    }), encoding="utf-8")
+    game = GameController(headless=True, responses=ResponseCatalog.load(path))
+    assert game.process_input("go up").message == "Pas de sortie vers up."
+    result = game.process_input("go east")
+    assert result.message == "Un droide bloque le passage !"
+    assert result.hazard_delta == 1
+    assert game.process_input("use tool").message == RESPONSES.no_tool
+
+
+def test_socket_sink_sends_prepared_bytes():
+    """Test that a SocketSink sends the catalog's bytes for a known message."""
+    catalog = ResponseCatalog()
+    encoded = catalog.encoded("\n\n")
+    assert catalog.encoded("\n\n") is encoded
+    connection = _Recorder()
+    game = GameController(output=SocketSink(connection, terminator="\n\n",
+                                            encoded=encoded),
+                          responses=catalog)
+    game.process_input("help")
+    game.process_input("status")
+    assert connection.writes[0] is encoded[catalog.help]
+    assert connection.writes[1] is encoded[catalog.status_text(0, 0)]
+    assert connection.writes[1] == b"\nScore: 0\nHazards encountered: 0\n\n"
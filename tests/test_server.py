@@ -0,0 +1,50 @@
+"""
+Tests for the asyncio game server.
+"""
+import asyncio
+
+from rpg_game.server import serve
+
+GOLDEN_PATH = ["get tool", "use tool", "go east", "get crystal", "win"]
+
+
+async def _play(port, commands):
+    """Connect to the server, send commands and return everything received."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for command in commands:
+        writer.write((command + "\n").encode("utf-8"))
+    await writer.drain()
+    output = await reader.read()
+    writer.close()
+    return output.decode("utf-8")
+
+
+async def _with_server(play):
+    """Run a test coroutine against a server on a free port."""
+    server = await serve(port=0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        return await play(port)
+
+
+def test_server_plays_golden_path():
+    """Test that a client can win a game over the socket."""
+    output = asyncio.run(_with_server(lambda port: _play(port, GOLDEN_PATH)))
+    assert output.startswith("Welcome to Space Station Repair!")
+    assert "You pick up the energy crystal." in output
+    assert "Final Score: 110 (Hazards: 0)" in output
+
+
+def test_server_sessions_are_independent():
+    """Test that many concurrent clients each get their own game."""
+    async def play_many(port):
+        return await asyncio.gather(
+            _play(port, ["go east", "status", "quit"]),
+            *[_play(port, GOLDEN_PATH) for _ in range(20)]
+        )
+
+    blocked, *winners = asyncio.run(_with_server(play_many))
+    assert "blocks your way" in blocked
+    assert "Hazards encountered: 1" in blocked
+    assert "Congratulations" not in blocked
+    assert all("Final Score: 110 (Hazards: 0)" in out for out in winners)
@@ -0,0 +1,217 @@
+"""
+Tests for the SessionLog command log and recovery.
+"""
+import struct
+
+import pytest
+from rpg_game.game.game_controller import GameController
+from rpg_game.game.item_registry import ITEMS, TOOL
+from rpg_game.game.session_log import (
+    CHECKPOINT, COMMAND, MAGIC, MOVED, REPAIRED_DROID, TOOK_CRYSTAL, TOOK_ITEM, TOOK_TOOL,
+    WON, SessionLog,
+    recover,
+    _COMMAND, _FILE_HEADER, _RECORD_HEADER,
+)
+from rpg_game.game.station_item import StationItem
+from rpg_game.game.world_loader import compile_world
+
+if "flare" not in ITEMS:
+    ITEMS.register("flare", StationItem("Flare", "A signal flare."), points=5)
+
+TOOL_BIT = 1 << TOOL
+GOLDEN_PATH = ["get tool", "use tool", "go east", "get crystal", "win"]
+
+
+def _records(path):
+    """Read back (type, payload) pairs from a log file."""
+    data = path.read_bytes()
+    offset = _FILE_HEADER.size
+    records = []
+    while offset < len(data):
+        record_type, length = _RECORD_HEADER.unpack_from(data, offset)
+        offset += _RECORD_HEADER.size
+        records.append((record_type, data[offset:offset + length]))
+        offset += length
+    return records
+
+
+def test_log_records_events(tmp_path):
+    """Test that each command is logged with what it changed."""
+    path = tmp_path / "game.log"
+    game = GameController(headless=True)
+    with SessionLog(str(path), game) as log:
+        for command in GOLDEN_PATH:
+            log.process(command)
+
+    commands = [payload for kind, payload in _records(path) if kind == COMMAND]
+    events = [_COMMAND.unpack_from(payload)[2] for payload in commands]
+    assert events == [TOOK_TOOL, REPAIRED_DROID, MOVED, TOOK_CRYSTAL, WON]
+    assert commands[0].endswith(b"get tool")
+
+
+def test_recover_replays_tail_after_checkpoint(tmp_path):
+    """Test that recovery restores a checkpoint and replays later commands."""
+    path = tmp_path / "game.log"
+    game = GameController(headless=True)
+    with SessionLog(str(path), game, checkpoint_every=2) as log:
+        for command in ["go east"] + GOLDEN_PATH[:4]:
+            log.process(command)
+
+    rebuilt = GameController(headless=True)
+    assert recover(str(path), rebuilt) == 1
+    assert rebuilt.player.get_status() == game.player.get_status() == (80, 1)
+    assert rebuilt.player.has_crystal is True
+    assert rebuilt.process_input("win").won is True
+
+
+def test_writes_are_grouped(tmp_path):
+    """Test that records are only written once a group is full."""
+    path = tmp_path / "game.log"
+    log = SessionLog(str(path), GameController(headless=True), sync_every=3)
+    size_after_open = path.stat().st_size
+
+    log.process("look")
+    log.process("status")
+    assert path.stat().st_size == size_after_open
+    log.process("help")
+    assert path.stat().st_size > size_after_open
+    log.close()
+
+
+def test_recover_ignores_torn_record(tmp_path):
+    """Test that a record cut short by a crash is skipped."""
+    path = tmp_path / "game.log"
+    with SessionLog(str(path), GameController(headless=True)) as log:
+        log.process("get tool")
+        log.process("use tool")
+    path.write_bytes(path.read_bytes()[:-3])
+
+    rebuilt = GameController(headless=True)
+    assert recover(str(path), rebuilt) == 1
+    assert rebuilt.player.score == 10
+
+
+def test_reopened_log_resumes(tmp_path):
+    """Test that a recovered game can keep logging to the same file."""
+    path = tmp_path / "game.log"
+    with SessionLog(str(path), GameController(headless=True)) as log:
+        log.process("get tool")
+
+    game = GameController(headless=True)
+    recover(str(path), game)
+    with SessionLog(str(path), game) as log:
+        log.process("use tool")
+
+    rebuilt = GameController(headless=True)
+    assert recover(str(path), rebuilt) == 1
+    assert rebuilt.player.score == 30
+
+
+def test_recover_rejects_other_files(tmp_path):
+    """Test that a file that is not a session log is rejected."""
+    path = tmp_path / "other.log"
+    path.write_bytes(b"hello")
+    with pytest.raises(ValueError, match="not a session log"):
+        recover(str(path), GameController(headless=True))
+
+
+def test_large_command_is_logged(tmp_path):
+    """Test that a command longer than 64 KiB is logged and replayed."""
+    path = tmp_path / "game.log"
+    command = "x" * 70000
+    with SessionLog(str(path), GameController(headless=True)) as log:
+        log.process(command)
+
+    commands = [payload for kind, payload in _records(path) if kind == COMMAND]
+    assert commands[0].endswith(command.encode())
+    assert recover(str(path), GameController(headless=True)) == 1
+
+
+def test_large_checkpoint_is_logged(tmp_path):
+    """Test that a checkpoint bigger than 64 KiB is logged and restored."""
+    rooms = {f"r{i}": {} for i in range(20000)}
+    world = compile_world({"rooms": rooms, "start": "r0", "goal": "r1"})
+    game = GameController(headless=True, world=world)
+    for index in range(len(world)):
+        game.world_state.set_flags(index, TOOL_BIT)
+    path = tmp_path / "game.log"
+    with SessionLog(str(path), game):
+        pass
+
+    [(kind, payload)] = _records(path)
+    assert len(payload) > 0xFFFF
+    rebuilt = GameController(headless=True, world=world)
+    recover(str(path), rebuilt)
+    assert rebuilt.world_state.changed_flags == game.world_state.changed_flags
+
+
+def test_reopening_drops_torn_record(tmp_path):
+    """Test that new records are written after the last whole record."""
+    path = tmp_path / "game.log"
+    with SessionLog(str(path), GameController(headless=True)) as log:
+        log.process("get tool")
+        log.process("use tool")
+    path.write_bytes(path.read_bytes()[:-3])
+
+    game = GameController(headless=True)
+    recover(str(path), game)
+    with SessionLog(str(path), game) as log:
+        log.process("use tool")
+
+    assert all(kind in (COMMAND, CHECKPOINT) for kind, _ in _records(path))
+    rebuilt = GameController(headless=True)
+    assert recover(str(path), rebuilt) == 1
+    assert rebuilt.player.score == 30
+
+
+def test_old_log_is_not_reopened(tmp_path):
+    """Test that a version 1 log can be recovered but not added to."""
+    path = tmp_path / "old.log"
+    snapshot = GameController(headless=True).snapshot()
+    path.write_bytes(_FILE_HEADER.pack(MAGIC, 1)
+                     + struct.pack("<BH", CHECKPOINT, len(snapshot)) + snapshot)
+    assert recover(str(path), GameController(headless=True)) == 0
+    with pytest.raises(ValueError, match="version 1"):
+        SessionLog(str(path), GameController(headless=True))
+
+
+def test_registered_item_round_trip(tmp_path):
+    """Test that taking a registered item is logged by key and replayed."""
+    world = compile_world({
+        "start": "a", "goal": "b",
+        "rooms": {"a": {"exits": {"east": "b"}, "items": ["flare"]},
+                  "b": {"exits": {"west": "a"}, "crystal": True}},
+    })
+    path = tmp_path / "game.log"
+    game = GameController(headless=True, world=world)
+    with SessionLog(str(path), game) as log:
+        for command in ["get flare", "go east", "get crystal"]:
+            log.process(command)
+
+    commands = [payload for kind, payload in _records(path) if kind == COMMAND]
+    events, _, keys_size = _COMMAND.unpack_from(commands[0])[2:]
+    assert events == TOOK_ITEM
+    assert commands[0][_COMMAND.size:_COMMAND.size + keys_size] == b"flare"
+
+    rebuilt = GameController(headless=True, world=world)
+    assert recover(str(path), rebuilt) == 3
+    assert rebuilt.player.get_status() == game.player.get_status() == (55, 0)
+    assert rebuilt.player.inventory == game.player.inventory
+
+    # A log naming a different item no longer matches the game
+    path.write_bytes(path.read_bytes().replace(b"flare", b"flair", 1))
+    with pytest.raises(ValueError, match="did not match"):
+        recover(str(path), GameController(headless=True, world=world))
+
+
+def test_version_2_log_is_recovered(tmp_path):
+    """Test that commands logged before item keys were kept still replay."""
+    path = tmp_path / "old.log"
+    snapshot = GameController(headless=True).snapshot()
+    command = struct.pack("<iiBI", 10, 0, TOOK_TOOL, 0) + b"get tool"
+    path.write_bytes(_FILE_HEADER.pack(MAGIC, 2)
+                     + _RECORD_HEADER.pack(CHECKPOINT, len(snapshot)) + snapshot
+                     + _RECORD_HEADER.pack(COMMAND, len(command)) + command)
+    rebuilt = GameController(headless=True)
+    assert recover(str(path), rebuilt) == 1
+    assert rebuilt.player.has_tool is True
@@ -0,0 +1,103 @@
+"""
+Tests for the SessionPool class and controller reuse.
+"""
+import pytest
+from rpg_game.game.metrics import Metrics
+from rpg_game.game.output_sink import BufferedSink
+from rpg_game.game.session_pool import SessionPool
+
+
+class _Clock:
+    """A clock the tests can move forward by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_open_returns_same_live_game():
+    """Test that a live session keeps its controller."""
+    pool = SessionPool()
+    game = pool.open("a")
+    assert pool.open("a") is game
+    assert "a" in pool and pool.live_count == 1
+
+
+def test_least_recently_used_session_is_saved():
+    """Test that going over max_live saves the oldest session."""
+    pool = SessionPool(max_live=2)
+    pool.process("a", "get tool")
+    pool.open("b")
+    pool.open("a")
+    pool.open("c")
+    assert pool.live_count == 2 and pool.saved_count == 1
+    assert "b" in pool
+
+
+def test_saved_session_is_restored():
+    """Test that a saved session carries on where it left off."""
+    pool = SessionPool(max_live=1)
+    pool.process("a", "get tool")
+    pool.process("a", "use tool")
+    pool.open("b")
+    assert pool.saved_count == 1
+    game = pool.open("a")
+    assert game.player.get_status() == (30, 0)
+    assert pool.process("a", "go east").hazard_delta == 0
+
+
+def test_idle_sessions_are_saved():
+    """Test that evict_idle() only saves sessions past the idle time."""
+    clock = _Clock()
+    pool = SessionPool(idle_seconds=10, clock=clock)
+    pool.open("old")
+    clock.now = 8
+    pool.open("new")
+    clock.now = 12
+    assert pool.evict_idle() == 1
+    assert pool.saved_count == 1 and pool.live_count == 1
+    assert pool.spare_count == 1
+
+
+def test_controllers_are_reused():
+    """Test that new sessions take spare controllers, reset to the start."""
+    pool = SessionPool()
+    first = pool.open("a")
+    pool.process("a", "get tool")
+    pool.close("a")
+    assert "a" not in pool and pool.spare_count == 1
+    second = pool.open("b")
+    assert second is first
+    assert second.player.get_status() == (0, 0)
+    assert second.maintenance_tunnels.has_tool
+
+
+def test_output_is_given_to_the_game():
+    """Test that open() points the game at the given sink."""
+    pool = SessionPool()
+    sink = BufferedSink()
+    pool.open("a", sink).process_input("look")
+    assert "Maintenance Tunnels" in sink.getvalue()
+    pool.close("a")
+    assert pool.open("b").output is not sink
+
+
+def test_reused_controllers_count_new_games():
+    """Test that metrics count a reset game as a new one, not a restore."""
+    metrics = Metrics()
+    pool = SessionPool(max_live=1, metrics=metrics)
+    pool.open("a")
+    pool.close("a")
+    pool.open("b")
+    pool.open("c")
+    pool.open("b")
+    assert metrics.games_started == 3
+
+
+@pytest.mark.parametrize("sizes", [{"max_live": 0}, {"max_live": -3}, {"max_spare": -1}])
+def test_bad_sizes_are_rejected(sizes):
+    """Test that a pool cannot be made with no room for a live session."""
+    with pytest.raises(ValueError):
+        SessionPool(**sizes)
@@ -0,0 +1,148 @@
+"""
+Tests for saving and restoring game state with snapshots.
+"""
+import pytest
+from rpg_game.game.game_controller import GameController
+from rpg_game.game.snapshot import MAGIC
+from rpg_game.game.world_loader import compile_world
+
+
+def _state(game):
+    """Return everything a snapshot should preserve, for comparing games."""
+    player = game.player
+    return (
+        player.current_location.name, player.has_tool, player.has_crystal,
+        player.get_status(), game.last_command_was_win,
+        hasattr(game, '_win_bonus_added'), game.world_state.changed_flags,
+        game.droid.is_blocking(),
+    )
+
+
+@pytest.mark.parametrize("commands", [
+    [],
+    ["go east"],
+    ["get tool", "use tool", "go east"],
+    ["get tool", "use tool", "go east", "get crystal", "win"],
+])
+def test_snapshot_round_trip(commands):
+    """Test that a restored game matches the one that was saved."""
+    game = GameController(headless=True)
+    game.run_commands(commands)
+
+    restored = GameController(headless=True)
+    restored.restore(game.snapshot())
+    assert _state(restored) == _state(game)
+
+
+def test_snapshot_is_small():
+    """Test that a mid-game snapshot only stores what changed."""
+    game = GameController(headless=True)
+    game.run_commands(["get tool", "use tool", "go east"])
+    data = game.snapshot()
+    assert data.startswith(MAGIC)
+    assert len(data) <= 48
+
+
+def test_restored_game_plays_on():
+    """Test that a restored game can be finished without extra bonuses."""
+    game = GameController(headless=True)
+    game.run_commands(["get tool", "use tool", "go east", "get crystal"])
+
+    restored = GameController(headless=True)
+    restored.restore(game.snapshot())
+    result = restored.process_input("win")
+    assert result.won is True
+    assert restored.player.get_status() == (110, 0)
+
+    # Restoring the finished game must not pay the win bonus again
+    again = GameController(headless=True)
+    again.restore(restored.snapshot())
+    again.process_input("win")
+    assert again.player.score == 110
+
+
+def test_restore_resets_newer_progress():
+    """Test that restoring an early snapshot undoes later changes."""
+    game = GameController(headless=True)
+    early = game.snapshot()
+    game.run_commands(["get tool", "use tool"])
+
+    game.restore(early)
+    assert game.maintenance_tunnels.has_tool is True
+    assert game.droid.is_blocking() is True
+    assert game.player.score == 0
+
+
+@pytest.mark.parametrize("data, message", [
+    (b"RPG", "too short"),
+    (b"XXXX" + bytes(28), "not a game snapshot"),
+])
+def test_restore_rejects_bad_data(data, message):
+    """Test that data which is not a snapshot is rejected."""
+    with pytest.raises(ValueError, match=message):
+        GameController(headless=True).restore(data)
+
+
+@pytest.mark.parametrize("droid_entry, message", [
+    ((999).to_bytes(4, "little") + b"\x01\x00", "not in the world"),
+    ((0).to_bytes(4, "little") + b"\x07\x00", "unknown droid state"),
+])
+def test_restore_rejects_corrupt_entries(droid_entry, message):
+    """Test that a corrupt snapshot is rejected and the game left alone."""
+    saved = GameController(headless=True)
+    saved.run_commands(["get tool", "use tool"])
+    data = saved.snapshot()
+    corrupt = data[:-len(droid_entry)] + droid_entry
+
+    game = GameController(headless=True)
+    game.run_commands(["get tool", "use tool", "go east", "get crystal"])
+    before = _state(game)
+    with pytest.raises(ValueError, match=message):
+        game.restore(corrupt)
+    assert _state(game) == before
+
+
+def test_droid_guards_round_trip():
+    """Test that a droid guarding another exit still guards it after a restore."""
+    game = GameController(headless=True)
+    game.droid.guards = "north"
+    data = game.snapshot()
+
+    restored = GameController(headless=True)
+    restored.restore(data)
+    assert restored.droid.guards == "north"
+    assert restored.droid.is_blocking() is True
+    assert restored.maintenance_tunnels.blocked_exit() == "north"
+
+    # A default droid saved in the same game is restored with the default
+    game.restore(GameController(headless=True).snapshot())
+    assert game.droid.guards == "east"
+
+
+def test_version_2_snapshot_restores():
+    """Test that a snapshot from before droid directions were kept restores."""
+    game = GameController(headless=True)
+    game.run_commands(["get tool", "use tool"])
+    data = bytearray(game.snapshot())
+    data[4] = 2
+    del data[-1]  # version 2 droid entries have no size byte
+
+    restored = GameController(headless=True)
+    restored.restore(bytes(data))
+    assert _state(restored) == _state(game)
+
+
+def test_restore_rejects_other_world():
+    """Test that a snapshot cannot be loaded into a different world."""
+    other = compile_world({"rooms": {"a": {}, "b": {}}})
+    with pytest.raises(ValueError, match="different world"):
+        GameController(headless=True, world=other).restore(
+            GameController(headless=True).snapshot()
+        )
+
+
+def test_snapshot_needs_world_location(game_controller, docking_bay):
+    """Test that a player moved to a stand-alone Location cannot be saved."""
+    game_controller.player.current_location = docking_bay
+    with pytest.raises(ValueError):
+        game_controller.snapshot()
@@ -0,0 +1,171 @@
+"""
+Tests for the world solver.
+"""
+import json
+import random
+
+import pytest
+
+from rpg_game.game.game_controller import GameController
+from rpg_game.game.item_registry import ITEMS
+from rpg_game.game.solver import WON, _Rules, solve
+from rpg_game.game.station_item import StationItem
+from rpg_game.game.world_loader import compile_world, load_world
+from rpg_game.verify_world import main
+
+if "medkit" not in ITEMS:
+    ITEMS.register("medkit", StationItem("Medkit", "A first aid kit."), points=15)
+if "lever" not in ITEMS:
+    ITEMS.register("lever", takeable=True, get_action="pull_lever")
+
+DIRECTIONS = ["north", "east", "south", "west"]
+
+
+def _world(rooms, start, goal):
+    return compile_world({"rooms": rooms, "start": start, "goal": goal})
+
+
+# Two droids in a row; a spare tool sits behind the first droid
+TWO_DROIDS = _world({
+    "a": {"exits": {"east": "b"}, "tool": True, "droid": True},
+    "b": {"exits": {"west": "a", "east": "c"}, "tool": True, "droid": True},
+    "c": {"exits": {"west": "b"}, "crystal": True},
+}, "a", "c")
+
+
+def test_solve_default_world():
+    """Test that the space station is solved by the golden path."""
+    report = solve(load_world())
+    assert report.winnable is True
+    assert report.winning_commands == [
+        "get tool", "use tool", "go east", "get crystal", "win"
+    ]
+    assert report.max_score == 110
+    assert report.dead_ends == 0
+    assert report.unreachable_items == []
+    assert report.truncated is False
+
+
+def test_winning_commands_win_the_real_game():
+    """Test that the solver's answer wins when played in a GameController."""
+    report = solve(TWO_DROIDS)
+    game = GameController(headless=True, world=TWO_DROIDS)
+    results = game.run_commands(report.winning_commands)
+    assert results[-1].won is True
+    assert game.player.score == report.max_score == 130
+
+
+def test_only_one_tool_can_be_carried():
+    """Test that a second tool is reported as never usable."""
+    report = solve(TWO_DROIDS)
+    assert report.unreachable_items == ["tool in b"]
+
+
+def test_unwinnable_world_has_dead_ends():
+    """Test a world where the crystal is behind a droid and there is no tool."""
+    world = _world({
+        "a": {"exits": {"east": "b"}, "droid": True},
+        "b": {"exits": {"west": "a"}, "crystal": True},
+    }, "a", "b")
+    report = solve(world)
+    assert report.winnable is False
+    assert report.winning_commands is None
+    assert report.dead_ends == report.states == 1
+    assert report.unreachable_items == ["droid in a", "crystal in b"]
+
+
+def test_taking_the_wrong_path_is_a_dead_end():
+    """Test that a one-way drop away from the crystal counts as a dead end."""
+    world = _world({
+        "a": {"exits": {"east": "b", "down": "pit"}, "crystal": True},
+        "b": {"exits": {}},
+        "pit": {"exits": {}},
+    }, "a", "b")
+    report = solve(world)
+    assert report.winning_commands == ["get crystal", "go east", "win"]
+    # Falling into the pit, with or without the crystal, and reaching b
+    # without the crystal can never win
+    assert report.dead_ends == 3
+
+
+def test_max_states_truncates():
+    """Test that the search stops at max_states."""
+    report = solve(TWO_DROIDS, max_states=3)
+    assert report.truncated is True
+    assert report.states == 3
+
+
+def test_verify_world_command(tmp_path, capsys):
+    """Test the command-line check on a winnable world."""
+    path = tmp_path / "world.json"
+    path.write_text(json.dumps({"rooms": {"a": {"crystal": True}}}))
+    assert main([str(path)]) == 0
+    assert json.loads(capsys.readouterr().out)["winning_commands"] == [
+        "get crystal", "win"
+    ]
+
+
+def _one_way_world(seed, rooms=10):
+    """Build a random world of one-way exits, which has dead ends."""
+    rng = random.Random(seed)
+    definition = {
+        f"r{i}": {
+            "exits": {d: f"r{rng.randrange(rooms)}" for d in rng.sample(DIRECTIONS, 2)},
+            "tool": rng.random() < 0.2, "droid": rng.random() < 0.3,
+            "crystal": rng.random() < 0.2,
+        }
+        for i in range(rooms)
+    }
+    return _world(definition, "r0", "r1")
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_dead_ends_match_forward_search(seed):
+    """Test that dead ends are exactly the states with no way to a win."""
+    world = _one_way_world(seed)
+    report = solve(world)
+    rules = _Rules(world)
+    start = world.start << rules.room_shift
+    seen, queue = {start}, [start]
+    for state in queue:
+        for _, next_state in rules.successors(state):
+            if next_state != WON and next_state not in seen:
+                seen.add(next_state)
+                queue.append(next_state)
+
+    def can_win(state):
+        reached, todo = {state}, [state]
+        for current in todo:
+            for _, next_state in rules.successors(current):
+                if next_state == WON:
+                    return True
+                if next_state not in reached:
+                    reached.add(next_state)
+                    todo.append(next_state)
+        return False
+
+    assert report.states == len(seen)
+    assert report.dead_ends == sum(1 for state in seen if not can_win(state))
+
+
+def test_registered_items_are_scored():
+    """Test that other registered items can be taken and count their points."""
+    world = _world({
+        "a": {"exits": {"east": "b"}, "items": ["medkit"]},
+        "b": {"exits": {"west": "a"}, "crystal": True},
+        "c": {"exits": {"west": "a"}, "items": ["medkit"]},
+    }, "a", "b")
+    report = solve(world)
+    assert report.max_score == 95
+    assert report.unreachable_items == ["medkit in c"]
+
+    game = GameController(headless=True, world=world)
+    game.run_commands(["get medkit", "go east", "get crystal", "win"])
+    assert game.player.score == report.max_score
+
+
+def test_item_with_own_action_is_rejected():
+    """Test that an item the solver has no rules for raises ValueError."""
+    world = _world({"a": {"items": ["lever"]}}, "a", "a")
+    with pytest.raises(ValueError, match="lever"):
+        solve(world)
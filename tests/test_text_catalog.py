@@ -0,0 +1,72 @@
+"""
+Tests for the shared text catalog and the text built from it.
+"""
+from rpg_game.game.diagnostic_tool import DiagnosticTool
+from rpg_game.game.game_controller import GameController
+from rpg_game.game.location import Location
+from rpg_game.game.text_catalog import TEXT, TextCatalog
+from rpg_game.game.world_loader import compile_world
+from rpg_game.game.world_template import WorldTemplate
+
+
+def test_equal_texts_get_one_id_and_one_copy():
+    """Test that interning the same text twice gives the same id and object."""
+    catalog = TextCatalog()
+    first = catalog.intern("".join(["pooled ", "text"]))
+    second = catalog.intern("pooled text")
+    assert first == second and len(catalog) == 1
+    assert catalog[first] == "pooled text"
+    assert catalog.share("".join(["pooled ", "text"])) is catalog[first]
+    assert "pooled text" in catalog
+
+
+def test_items_share_their_text():
+    """Test that items of one kind point to the same strings."""
+    first, second = DiagnosticTool(), DiagnosticTool()
+    assert first.name is second.name
+    assert first.examine() is second.examine()
+    assert first.examine() in TEXT
+
+
+def test_sessions_share_look_text():
+    """Test that two sessions in the same state get the same look text."""
+    first = GameController(headless=True)
+    second = GameController(headless=True)
+    assert first.maintenance_tunnels.describe() is second.maintenance_tunnels.describe()
+
+    first.run_commands(["get tool", "use tool"])
+    second.run_commands(["get tool", "use tool"])
+    text = first.maintenance_tunnels.describe()
+    assert text is second.maintenance_tunnels.describe()
+    assert "tool" not in text and "droid" not in text
+
+
+def test_shared_text_matches_plain_locations():
+    """Test that world rooms are described exactly like plain locations."""
+    game = GameController(headless=True)
+    room = game.maintenance_tunnels
+    plain = Location(room.name, room.description)
+    plain.add_exit("east", game.docking_bay)
+    plain.has_tool = True
+    plain.droid = room.droid
+    plain.droid_present = True
+    assert room.describe() == plain.describe()
+
+
+def test_session_exits_are_not_shared():
+    """Test that an exit added in one session only shows in that session."""
+    first = GameController(headless=True)
+    second = GameController(headless=True)
+    first.docking_bay.add_exit("north", first.maintenance_tunnels)
+    assert "north" in first.docking_bay.describe()
+    assert "north" not in second.docking_bay.describe()
+
+
+def test_look_cache_is_bounded(monkeypatch):
+    """Test that a template keeps at most MAX_DESCRIBED look texts."""
+    world = compile_world({"rooms": {"a": {}, "b": {}}})
+    monkeypatch.setattr(WorldTemplate, "MAX_DESCRIBED", 2)
+    texts = [world.describe(0, flags, None) for flags in range(5)]
+    assert len(world._described) <= 2
+    assert world.describe(0, 4, None) is texts[4]
+    assert world.describe(0, 0, None) == texts[0]
@@ -0,0 +1,98 @@
+"""
+Tests for the procedural world generator.
+"""
+import io
+import json
+
+import pytest
+from rpg_game.game.game_controller import GameController
+from rpg_game.game.solver import solve
+from rpg_game.game.world_generator import (
+    generate_world, iter_rooms, spine_commands, write_world,
+)
+from rpg_game.game.world_loader import compile_world, load_world
+from rpg_game.game.world_template import WorldTemplate
+
+
+def test_same_seed_gives_same_world():
+    """Test that generation is repeatable and the seed matters."""
+    first = list(iter_rooms(200, seed=5, exit_degree=4, droids=3))
+    assert first == list(iter_rooms(200, seed=5, exit_degree=4, droids=3))
+    assert first != list(iter_rooms(200, seed=6, exit_degree=4, droids=3))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_small_worlds_are_winnable(seed):
+    """Test that the solver can win every small generated world."""
+    world = generate_world(12, seed=seed, exit_degree=seed % 5 + 2,
+                           droids=seed % 4)
+    assert solve(world).winnable
+
+
+def test_spine_commands_win_in_game():
+    """Test that walking the spine wins a generated world."""
+    world = generate_world(500, seed=1, exit_degree=6, droids=20)
+    results = GameController(headless=True, world=world).run_commands(
+        spine_commands(world)
+    )
+    assert results[-1].won
+    assert all(result.hazard_delta == 0 for result in results)
+
+
+def test_room_layout():
+    """Test exit counts, droid placement and the tool's position."""
+    world = generate_world(1000, seed=3, exit_degree=5, droids=10)
+    assert (world.start, world.goal) == (0, 999)
+    assert len(world.exits(500)) == 5
+    droid_rooms = [room for room in range(len(world))
+                   if world.flags(room) & WorldTemplate.DROID]
+    tool_rooms = [room for room in range(len(world))
+                  if world.flags(room) & WorldTemplate.TOOL]
+    assert len(droid_rooms) == 10
+    assert tool_rooms[0] <= droid_rooms[0]
+    for room in droid_rooms:
+        assert world.find_exit(room, "east") == "east"
+
+
+def test_extra_exits_only_lead_back():
+    """Test that no exit except east leads further from the start."""
+    world = generate_world(300, seed=9, exit_degree=6, droids=5)
+    for room in range(len(world)):
+        for direction, target in world.exits(room):
+            if direction != "east":
+                assert target < room
+
+
+def test_written_file_matches_generated_world(tmp_path):
+    """Test that write_world() gives a file that loads as the same world."""
+    path = tmp_path / "generated.json"
+    write_world(str(path), 50, seed=4, exit_degree=3, droids=2)
+    loaded = load_world(str(path))
+    generated = generate_world(50, seed=4, exit_degree=3, droids=2)
+    assert loaded.room_ids == generated.room_ids
+    for room in range(50):
+        assert loaded.exits(room) == generated.exits(room)
+        assert loaded.flags(room) == generated.flags(room)
+        assert loaded.description(room) == generated.description(room)
+
+
+def test_write_to_open_file():
+    """Test that write_world() accepts an open text file."""
+    output = io.StringIO()
+    write_world(output, 3)
+    assert len(compile_world(json.loads(output.getvalue()))) == 3
+
+
+@pytest.mark.parametrize("options", [
+    {"rooms": 1},
+    {"rooms": 10, "exit_degree": 7},
+    {"rooms": 10, "droids": 10},
+    {"rooms": 10, "droids": 1, "tool_room": 9},
+    {"rooms": 10, "crystal_room": 10},
+])
+def test_bad_options_raise_straight_away(options, tmp_path):
+    """Test that impossible worlds are refused before anything is written."""
+    path = tmp_path / "bad.json"
+    with pytest.raises(ValueError):
+        write_world(str(path), **options)
+    assert not path.exists()
@@ -0,0 +1,124 @@
+"""
+Tests for loading and compiling world definition files.
+"""
+import json
+import os
+import pickle
+
+import pytest
+from rpg_game.game import world_loader
+from rpg_game.game.game_controller import GameController
+from rpg_game.game.world_loader import compile_world, load_world
+from rpg_game.game.world_template import WorldTemplate
+
+THREE_ROOMS = {
+    "start": "hall",
+    "goal": "vault",
+    "rooms": {
+        "hall": {"name": "Hall", "exits": {"east": "lab"}, "tool": True},
+        "lab": {"name": "Lab", "exits": {"west": "hall", "east": "vault"},
+                "droid": True},
+        "vault": {"name": "Vault", "exits": {"west": "lab"}, "crystal": True},
+    },
+}
+
+
+@pytest.fixture
+def world_file(tmp_path):
+    """Write the three-room world to a file and return its path."""
+    path = tmp_path / "three_rooms.json"
+    path.write_text(json.dumps(THREE_ROOMS))
+    yield str(path)
+    world_loader.clear_cache()
+
+
+def test_compile_world():
+    """Test that a definition is compiled into numbered rooms and flags."""
+    world = compile_world(THREE_ROOMS)
+    assert len(world) == 3
+    assert world.room_index("lab") == 1
+    assert world.start == 0 and world.goal == 2
+    assert world.exits(1) == (("west", 0), ("east", 2))
+    assert world.flags(0) == WorldTemplate.TOOL
+    assert world.flags(1) == WorldTemplate.DROID
+
+
+@pytest.mark.parametrize("data, message", [
+    ({"rooms": {}}, "no rooms"),
+    ({"rooms": {"a": {"exits": {"east": "b"}}}}, "Unknown room 'b'"),
+    ({"start": "x", "rooms": {"a": {}}}, "Unknown room 'x' in start"),
+])
+def test_compile_world_errors(data, message):
+    """Test that broken definitions raise a clear ValueError."""
+    with pytest.raises(ValueError, match=message):
+        compile_world(data)
+
+
+def test_load_world_uses_memory_cache(world_file):
+    """Test that loading the same file twice returns the same template."""
+    assert load_world(world_file) is load_world(world_file)
+
+
+def test_load_world_uses_disk_cache(world_file, tmp_path):
+    """Test that a compiled template is saved and reused from disk."""
+    cache_dir = str(tmp_path / "cache")
+    world = load_world(world_file, cache_dir=cache_dir)
+    cached = os.listdir(cache_dir)
+    version = world_loader.CACHE_FORMAT_VERSION
+    assert cached == [f"{world.source_hash}-v{version}.pickle"]
+
+    world_loader.clear_cache()
+    reloaded = load_world(world_file, cache_dir=cache_dir)
+    assert reloaded is not world
+    assert reloaded.room_ids == world.room_ids
+
+
+def test_disk_cache_from_other_item_order_is_ignored(world_file, tmp_path):
+    """Test that a cache written with different item ids is compiled again."""
+    cache_dir = str(tmp_path / "cache")
+    world = load_world(world_file, cache_dir=cache_dir)
+    [name] = os.listdir(cache_dir)
+    # As if written by a process that registered the items in another order
+    other = compile_world({"rooms": {"elsewhere": {}}})
+    with open(os.path.join(cache_dir, name), "wb") as cache_file:
+        pickle.dump((("crystal", "tool", "droid"), other), cache_file)
+
+    world_loader.clear_cache()
+    reloaded = load_world(world_file, cache_dir=cache_dir)
+    assert reloaded.room_ids == world.room_ids
+    assert reloaded.flags(0) == WorldTemplate.TOOL
+
+
+def test_game_in_loaded_world(world_file):
+    """Test that a GameController can be played in a loaded world."""
+    game = GameController(headless=True, world=load_world(world_file))
+    results = game.run_commands([
+        "get tool", "go east", "use tool", "go east", "get crystal", "win"
+    ])
+    assert results[-1].won is True
+    assert game.player.get_status() == (110, 0)
+
+
+def test_unchanged_file_is_not_read_again(world_file, monkeypatch):
+    """Test that a loaded file is only read again once it changes."""
+    world = load_world(world_file)
+    reads = []
+    real_open = open
+    monkeypatch.setattr("builtins.open",
+                        lambda *args, **kwargs: reads.append(args) or real_open(*args, **kwargs))
+    assert load_world(world_file) is world
+    assert reads == []
+
+    changed = dict(THREE_ROOMS, start="lab")
+    with real_open(world_file, "w") as changed_file:
+        json.dump(changed, changed_file)
+    assert load_world(world_file).start == 1
+    assert len(reads) == 1
+
+
+def test_default_world_is_loaded_once(monkeypatch):
+    """Test that the default world is kept without checking the file again."""
+    world = world_loader.default_world()
+    monkeypatch.setattr(os, "stat", lambda *args, **kwargs: pytest.fail("stat called"))
+    assert world_loader.default_world() is world
+    assert GameController(headless=True).world is world
@@ -0,0 +1,102 @@
+"""
+Tests for the WorldState class and the locations it hands out.
+"""
+import pytest
+from rpg_game.game.game_controller import GameController
+from rpg_game.game.world_loader import compile_world
+from rpg_game.game.world_state import WorldState
+from rpg_game.game.world_template import WorldTemplate
+
+
+@pytest.fixture
+def corridor():
+    """Return a template of 1000 rooms in a line, with a tool in each."""
+    rooms = {}
+    for i in range(1000):
+        exits = {}
+        if i > 0:
+            exits["west"] = f"room{i - 1}"
+        if i < 999:
+            exits["east"] = f"room{i + 1}"
+        rooms[f"room{i}"] = {"name": f"Room {i}", "exits": exits, "tool": True}
+    rooms["room0"]["droid"] = True
+    return compile_world({"rooms": rooms})
+
+
+def test_location_is_created_once(corridor):
+    """Test that a room always maps to the same Location in a session."""
+    world = WorldState(corridor)
+    assert world.location(5) is world.location(5)
+    assert world.location(5).exits["east"] is world.location(6)
+
+
+def test_unchanged_rooms_are_not_stored(corridor):
+    """Test that only changed rooms are kept in the session."""
+    world = WorldState(corridor)
+    room = world.location(3)
+    assert room.name == "Room 3"
+    assert room.has_tool is True
+    assert world.changed_flags == {}
+
+    room.remove_tool()
+    assert world.changed_flags == {3: 0}
+
+    room.has_tool = True
+    assert world.changed_flags == {}
+
+
+def test_sessions_share_template_but_not_changes(corridor):
+    """Test that two sessions on one template do not see each other."""
+    first = WorldState(corridor)
+    second = WorldState(corridor)
+
+    first.location(0).remove_tool()
+    first.location(0).droid.repair()
+    first.location(0).droid_present = False
+
+    assert second.location(0).has_tool is True
+    assert second.location(0).droid_present is True
+    assert second.location(0).droid.is_blocking() is True
+    assert first.template is second.template
+
+
+def test_droid_only_in_rooms_that_start_with_one(corridor):
+    """Test that rooms without a droid have none until one is placed."""
+    world = WorldState(corridor)
+    assert world.location(0).droid is not None
+    assert world.location(1).droid is None
+    assert world.flags(0) == WorldTemplate.TOOL | WorldTemplate.DROID
+
+
+def test_controller_sessions_are_independent():
+    """Test that two games on the default world keep separate items."""
+    first = GameController(headless=True)
+    second = GameController(headless=True)
+    first.run_commands(["get tool", "use tool"])
+
+    assert first.world is second.world
+    assert first.maintenance_tunnels.has_tool is False
+    assert second.maintenance_tunnels.has_tool is True
+    assert second.droid.is_blocking() is True
+
+
+def test_world_location_describe_follows_changes(corridor):
+    """Test that a cached description is rebuilt when the room changes."""
+    room = WorldState(corridor).location(0)
+    assert "diagnostic tool" in room.describe()
+    room.remove_tool()
+    assert "diagnostic tool" not in room.describe()
+    assert "maintenance droid" in room.describe()
+    room.droid.repair()
+    assert "maintenance droid" not in room.describe()
+
+
+def test_world_location_session_exit(corridor):
+    """Test that an exit added in one session is found only there."""
+    first = WorldState(corridor)
+    second = WorldState(corridor)
+    first.location(1).add_exit("up", first.location(500))
+
+    assert first.location(1).find_exit("u") == "up"
+    assert first.location(1).find_exit("east") == "east"
+    assert second.location(1).find_exit("up") is None